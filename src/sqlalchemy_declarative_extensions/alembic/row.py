@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import os
+from weakref import WeakKeyDictionary
+
 from alembic.autogenerate.api import AutogenContext
 from alembic.operations import Operations
-from alembic.operations.ops import UpgradeOps
+from alembic.operations.ops import ExecuteSQLOp, UpgradeOps
+from alembic.runtime.migration import MigrationContext
 from sqlalchemy import MetaData
 
 from sqlalchemy_declarative_extensions import row
@@ -13,10 +17,21 @@ from sqlalchemy_declarative_extensions.alembic.base import (
     register_rewriter_dispatcher,
 )
 from sqlalchemy_declarative_extensions.row.base import Rows
+from sqlalchemy_declarative_extensions.row.cache import ReflectionCache
 from sqlalchemy_declarative_extensions.row.compare import (
     DeleteRowOp,
     InsertRowOp,
     UpdateRowOp,
+    UpsertRowOp,
+)
+from sqlalchemy_declarative_extensions.row.data import RowDataFile
+
+# The directory (relative to the versions directory) into which data files are written.
+DATA_DIRECTORY = "data"
+
+# The reflection cache shared by the row operations of each migration run.
+_migration_caches: WeakKeyDictionary[MigrationContext, ReflectionCache] = (
+    WeakKeyDictionary()
 )
 
 
@@ -27,21 +42,29 @@ def compare_rows(autogen_context: AutogenContext, upgrade_ops: UpgradeOps, _):
 
     rows, metadata = optional_rows
 
-    assert autogen_context.connection
-    result = row.compare.compare_rows(autogen_context.connection, metadata, rows)
+    connection = autogen_context.connection
+    assert connection
+    result = row.compare.compare_rows(connection, metadata, rows)
+    if result and row.compare.should_defer_constraints(connection.dialect, rows):
+        upgrade_ops.ops.append(ExecuteSQLOp(row.compare.DEFER_CONSTRAINTS))
     upgrade_ops.ops.extend(result)  # type: ignore
 
 
 def render_row(
-    autogen_context: AutogenContext, op: InsertRowOp | UpdateRowOp | DeleteRowOp
+    autogen_context: AutogenContext,
+    op: InsertRowOp | UpdateRowOp | DeleteRowOp | UpsertRowOp,
 ):
-    metadata = autogen_context.metadata
     conn = autogen_context.connection
-    assert metadata
     assert conn
 
+    metadata = _get_metadata(autogen_context)
+
+    rendered_data = render_row_data(autogen_context, metadata, op)
+    if rendered_data is not None:
+        return rendered_data
+
     result = []
-    for query in op.render(metadata):
+    for query in op.render(metadata, dialect=conn.dialect):
         query_str = query.compile(
             dialect=conn.dialect,
             compile_kwargs={"literal_binds": True},
@@ -50,20 +73,108 @@ def render_row(
     return result
 
 
+def _get_metadata(autogen_context: AutogenContext) -> MetaData:
+    """Narrow the autogenerate metadata to the `MetaData` on which `Rows` is declared."""
+    optional_rows = Rows.extract(autogen_context.metadata)  # type: ignore
+    if optional_rows:
+        return optional_rows[1]
+
+    metadata = autogen_context.metadata
+    assert isinstance(metadata, MetaData)
+    return metadata
+
+
+def render_row_data(
+    autogen_context: AutogenContext,
+    metadata: MetaData,
+    op: InsertRowOp | UpdateRowOp | DeleteRowOp | UpsertRowOp,
+) -> list[str] | None:
+    """Render `op` as referencing data files of its rows, when so configured.
+
+    Returns `None` when the op should instead be rendered as literal SQL; including
+    when its values cannot be represented in a data file.
+    """
+    if not isinstance(op, (InsertRowOp, UpdateRowOp)):
+        return None
+
+    optional_rows = Rows.extract(autogen_context.metadata)
+    script = autogen_context.migration_context.script
+    if not optional_rows or script is None:
+        return None
+
+    rows, _ = optional_rows
+    if rows.migration_data is None:
+        return None
+
+    if isinstance(op, InsertRowOp):
+        values = {"values": op.values}
+        op_name = "insert_table_row"
+    else:
+        values = {"from_values": op.from_values, "to_values": op.to_values}
+        op_name = "update_table_row"
+
+    assert metadata.tables is not None
+    table = metadata.tables[op.table]
+
+    directory = os.path.join(script.versions, DATA_DIRECTORY)
+    filenames = {}
+    for arg, value in values.items():
+        assert not isinstance(value, RowDataFile)
+        row_values = [value] if isinstance(value, dict) else value
+        try:
+            try:
+                filename = RowDataFile.write(
+                    directory,
+                    op.table,
+                    row_values,
+                    format=rows.migration_data,
+                    table=table,
+                )
+            except ValueError:
+                # Rows with differing sets of columns can only be written as JSON.
+                filename = RowDataFile.write(
+                    directory, op.table, row_values, format="json", table=table
+                )
+        except TypeError:
+            return None
+
+        filenames[arg] = filename
+
+    autogen_context.imports.add(
+        "from sqlalchemy_declarative_extensions.row import RowDataFile"
+    )
+    args = "".join(
+        f", {arg}=RowDataFile.relative_to(__file__, {f'{DATA_DIRECTORY}/{filename}'!r})"
+        for arg, filename in filenames.items()
+    )
+    return [f"op.{op_name}({op.table!r}{args}, chunk_size={op.chunk_size})"]
+
+
 def execute_row(
     operations: Operations,
-    operation: InsertRowOp | UpdateRowOp | DeleteRowOp,
+    operation: InsertRowOp | UpdateRowOp | DeleteRowOp | UpsertRowOp,
 ):
     conn = operations.get_bind()
-    operation.execute(conn)
+
+    migration_context = operations.migration_context
+    cache = _migration_caches.get(migration_context)
+    if cache is None:
+        cache = _migration_caches[migration_context] = ReflectionCache()
+        cache.watch(conn)
+
+    with ReflectionCache.scope(conn, cache):
+        operation.execute(conn)
 
 
 register_comparator_dispatcher(compare_rows, target="schema")
-register_renderer_dispatcher(InsertRowOp, UpdateRowOp, DeleteRowOp, fn=render_row)
-register_rewriter_dispatcher(InsertRowOp, UpdateRowOp, DeleteRowOp)
+register_renderer_dispatcher(
+    InsertRowOp, UpdateRowOp, DeleteRowOp, UpsertRowOp, fn=render_row
+)
+register_rewriter_dispatcher(InsertRowOp, UpdateRowOp, DeleteRowOp, UpsertRowOp)
 register_operation_dispatcher(
     insert_table_row=InsertRowOp,
     update_table_row=UpdateRowOp,
     delete_table_row=DeleteRowOp,
+    upsert_table_row=UpsertRowOp,
     fn=execute_row,
 )
@@ -5,6 +5,7 @@ from sqlalchemy_declarative_extensions.dialects.query import (
     get_current_schema,
     get_databases,
     get_default_grants,
+    get_existing_tables,
     get_function_cls,
     get_functions,
     get_grants,
@@ -14,11 +15,14 @@ from sqlalchemy_declarative_extensions.dialects.query import (
     get_role_cls,
     get_roles,
     get_schema_cls,
+    get_schema_relations,
     get_schemas,
     get_triggers,
     get_view,
     get_view_cls,
+    get_view_definitions,
     get_views,
+    get_views_by_name,
 )
 
 __all__ = [
@@ -27,6 +31,7 @@ __all__ = [
     "get_current_schema",
     "get_databases",
     "get_default_grants",
+    "get_existing_tables",
     "get_function_cls",
     "get_functions",
     "get_grants",
@@ -36,11 +41,14 @@ __all__ = [
     "get_role_cls",
     "get_roles",
     "get_schema_cls",
+    "get_schema_relations",
     "get_schemas",
     "get_triggers",
     "get_view",
     "get_view_cls",
+    "get_view_definitions",
     "get_views",
+    "get_views_by_name",
     "mysql",
     "postgresql",
     "sqlite",
@@ -6,6 +6,7 @@ from sqlalchemy_declarative_extensions.dialects.postgresql.function import (
     FunctionVolatility,
 )
 from sqlalchemy_declarative_extensions.dialects.postgresql.grant import (
+    BulkGrantStatement,
     DefaultGrant,
     DefaultGrantStatement,
     Grant,
@@ -38,6 +39,7 @@ from sqlalchemy_declarative_extensions.dialects.postgresql.view import (
 from sqlalchemy_declarative_extensions.view.base import ViewIndex
 
 __all__ = [
+    "BulkGrantStatement",
     "DefaultGrant",
     "DefaultGrant",
     "DefaultGrantStatement",
@@ -1,3 +1,4 @@
+import functools
 from typing import List, Optional, Tuple, TypeVar
 
 from sqlalchemy_declarative_extensions.dialects.postgresql import (
@@ -8,6 +9,9 @@ from sqlalchemy_declarative_extensions.dialects.postgresql import (
     GrantStatement,
     GrantTypes,
 )
+from sqlalchemy_declarative_extensions.dialects.postgresql.schema import (
+    acl_privilege_types,
+)
 
 GT = TypeVar("GT", DefaultGrantTypes, GrantTypes)
 
@@ -103,6 +107,66 @@ def _parse_acl(
         grantee = owner
         grants_no_grant_option.extend(list(variants))
 
+    grants = _group_grants(
+        grantee, grants_no_grant_option, grants_with_grant_option, expanded
+    )
+
+    if priv:
+        assert len(grants) > 0
+
+    return grantor, grants
+
+
+def exploded_acl_grants(
+    type: GT,
+    grantee: str,
+    privileges: int,
+    grantable_privileges: int = 0,
+    expanded: bool = False,
+) -> List[Grant]:
+    """Produce the grants of a single acl item, from its ``aclexplode()`` privileges.
+
+    `privileges` and `grantable_privileges` (those with the grant option) are
+    bitmasks of `acl_privilege_types`. As with `parse_acl`, privileges which do not
+    apply to `type` are ignored.
+    """
+    return list(
+        _exploded_acl_grants(type, grantee, privileges, grantable_privileges, expanded)
+    )
+
+
+# The same few acl items tend to repeat across every object, and `Grant`s are
+# immutable, so they can be shared.
+@functools.lru_cache(maxsize=4096)
+def _exploded_acl_grants(
+    type, grantee: str, privileges: int, grantable_privileges: int, expanded: bool
+) -> Tuple[Grant, ...]:
+    variants = type.to_variants()
+    grants = _group_grants(
+        grantee,
+        list(_privileges_from_mask(variants, privileges)),
+        list(_privileges_from_mask(variants, grantable_privileges)),
+        expanded,
+    )
+    return tuple(grants)
+
+
+@functools.lru_cache(maxsize=None)
+def _privileges_from_mask(variants, mask: int) -> tuple:
+    known = {variant.value: variant for variant in variants}
+    return tuple(
+        known[privilege_type]
+        for bit, privilege_type in enumerate(acl_privilege_types)
+        if mask & (1 << bit) and privilege_type in known
+    )
+
+
+def _group_grants(
+    grantee: str,
+    grants_no_grant_option: List[Grant],
+    grants_with_grant_option: List[Grant],
+    expanded: bool,
+) -> List[Grant]:
     grants = []
     for grant_option, grant_privileges in (
         (False, grants_no_grant_option),
@@ -125,11 +189,7 @@ def _parse_acl(
                 grant_option=grant_option,
             )
             grants.append(grant)
-
-    if priv:
-        assert len(grants) > 0
-
-    return grantor, grants
+    return grants
 
 
 def get_acl_username(acl: str):
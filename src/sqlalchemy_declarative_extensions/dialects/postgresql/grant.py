@@ -335,6 +335,51 @@ class GrantStatement(Generic[G]):
         return result
 
 
+@dataclass(frozen=True)
+class BulkGrantStatement(Generic[G]):
+    """Grant the same privileges to any number of roles, on any number of objects.
+
+    Objects are either named individually (`targets`), or by schema (`in_schemas`),
+    which renders `ON ALL TABLES IN SCHEMA` (or `SEQUENCES`), and so affects every
+    such object in the schema at the time the statement is executed.
+    """
+
+    grants: tuple[G, ...]
+    grant_type: GrantTypes
+    target_roles: tuple[str, ...]
+    targets: tuple[str, ...] = ()
+    in_schemas: tuple[str, ...] = ()
+    grant_option: bool = False
+    revoke_: bool = False
+
+    def invert(self) -> BulkGrantStatement:
+        return replace(self, revoke_=not self.revoke_)
+
+    def to_sql(self) -> TextClause:
+        grant: Grant = Grant(self.grants, target_role="", revoke_=self.revoke_)
+
+        result = []
+        result.append(_render_grant_or_revoke(grant))
+        result.append(_render_privilege(grant, self.grant_type))
+
+        if self.in_schemas:
+            schemas_str = ", ".join([f'"{s}"' for s in self.in_schemas])
+            result.append(f"ON ALL {self.grant_type.value}S IN SCHEMA {schemas_str}")
+        else:
+            result.append(f"ON {self.grant_type.value}")
+            result.append(", ".join([_quote_table_name(t) for t in self.targets]))
+
+        roles_str = ", ".join([f'"{r}"' for r in self.target_roles])
+        result.append(f"FROM {roles_str}" if self.revoke_ else f"TO {roles_str}")
+
+        # Revoking a privilege also revokes its grant option.
+        if self.grant_option and not self.revoke_:
+            result.append("WITH GRANT OPTION")
+
+        text_result = " ".join(result)
+        return text(text_result + ";")
+
+
 def _render_grant_or_revoke(grant: Grant) -> str:
     if grant.revoke_:
         return "REVOKE"
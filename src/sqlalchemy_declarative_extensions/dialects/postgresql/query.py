@@ -1,16 +1,25 @@
 from __future__ import annotations
 
+from collections import defaultdict
 from collections.abc import Sequence
 from itertools import zip_longest
-from typing import Container, List, cast
+from typing import Collection, List, cast
 
 from sqlalchemy import Index, UniqueConstraint
 from sqlalchemy.engine import Connection
 
-from sqlalchemy_declarative_extensions.dialects.postgresql import View, ViewIndex
+from sqlalchemy_declarative_extensions.dialects.postgresql import (
+    DefaultGrant,
+    DefaultGrantStatement,
+    DefaultGrantTypes,
+    GrantStatement,
+    GrantTypes,
+    View,
+    ViewIndex,
+)
 from sqlalchemy_declarative_extensions.dialects.postgresql.acl import (
+    exploded_acl_grants,
     parse_acl,
-    parse_default_acl,
 )
 from sqlalchemy_declarative_extensions.dialects.postgresql.function import (
     Function,
@@ -25,17 +34,22 @@ from sqlalchemy_declarative_extensions.dialects.postgresql.procedure import (
 from sqlalchemy_declarative_extensions.dialects.postgresql.role import Role
 from sqlalchemy_declarative_extensions.dialects.postgresql.schema import (
     databases_query,
-    default_acl_query,
     extensions_query,
+    get_default_acl_query,
     get_functions_query,
+    get_object_acl_query,
     get_procedures_query,
-    object_acl_query,
+    get_view_indexes_query,
     objects_query,
     roles_query,
     schema_exists_query,
+    schema_relations_query,
     schemas_query,
+    tables_by_name_query,
     triggers_query,
+    view_definitions_query,
     view_query,
+    views_by_name_query,
     views_query,
 )
 from sqlalchemy_declarative_extensions.dialects.postgresql.trigger import (
@@ -49,7 +63,7 @@ from sqlalchemy_declarative_extensions.dialects.postgresql.view import (
 )
 from sqlalchemy_declarative_extensions.function import Function as BaseFunction
 from sqlalchemy_declarative_extensions.procedure import Procedure as BaseProcedure
-from sqlalchemy_declarative_extensions.sql import qualify_name
+from sqlalchemy_declarative_extensions.sql import qualify_name, split_schema
 
 EXTENSION_SCHEMAS = {
     "postgis_topology": ["topology"],
@@ -86,6 +100,30 @@ def check_schema_exists_postgresql(connection: Connection, name: str) -> bool:
     return bool(row)
 
 
+def get_existing_tables_postgresql(
+    connection: Connection, names: Sequence[str]
+) -> set[str]:
+    """Return those of the (optionally schema qualified) table `names` which exist.
+
+    Unqualified names exist if they're visible on the search path, as with `has_table`.
+    """
+    requested = {split_schema(name): name for name in names}
+
+    result = set()
+    rows = connection.execute(
+        tables_by_name_query, {"names": list({name for _, name in requested})}
+    ).fetchall()
+    for row in rows:
+        qualified_key = (row.schema, row.name)
+        if qualified_key in requested:
+            result.add(requested[qualified_key])
+
+        unqualified_key = (None, row.name)
+        if row.visible and unqualified_key in requested:
+            result.add(requested[unqualified_key])
+    return result
+
+
 def get_objects_postgresql(connection: Connection):
     return sorted(
         [
@@ -95,61 +133,124 @@ def get_objects_postgresql(connection: Connection):
     )
 
 
+def get_schema_relations_postgresql(connection: Connection, schemas: Collection[str]):
+    """Reflect the relations affected by `GRANT ... ON ALL TABLES IN SCHEMA`.
+
+    Or `ALL SEQUENCES`, in `schemas`. Unlike `get_objects_postgresql`, this includes
+    every kind of relation (such as materialized views and partitioned tables), as
+    well as those belonging to extensions.
+    """
+    records = connection.execute(schema_relations_query, {"schemas": list(schemas)})
+    return sorted(
+        [(r.schema, qualify_name(r.schema, r.object_name), r.relkind) for r in records]
+    )
+
+
 def get_default_grants_postgresql(
     connection: Connection,
-    roles: Container[str] | None = None,
+    roles: Collection[str] | None = None,
     expanded: bool = False,
+    schemas: Collection[str] | None = None,
 ):
-    default_permissions = connection.execute(default_acl_query).fetchall()
+    """Reflect the default grants to `roles` (or all roles), in `schemas` (or all).
+
+    The acl is decomposed by ``aclexplode()`` and filtered in the catalog query,
+    such that only the matching privileges are returned.
+    """
+    query = get_default_acl_query(roles=roles is not None, schemas=schemas is not None)
+    records = connection.execute(query, _acl_filter_params(roles, schemas))
 
     assert connection.engine.url.username
     current_role: str = connection.engine.url.username
 
     result = []
-    for permission in default_permissions:
-        for acl_item in permission.acl:
-            default_grants = parse_default_acl(
-                acl_item,
-                permission.object_type,
-                permission.schema_name,
-                current_role=current_role,
-                expanded=expanded,
+    for record in records:
+        grant_type = DefaultGrantTypes.from_relkind(record.object_type)
+        for grantor, grantee, privileges, grantable_privileges in zip(
+            record.grantors,
+            record.grantees,
+            record.privileges,
+            record.grantable_privileges,
+        ):
+            default_grant = DefaultGrant(
+                grant_type=grant_type,
+                in_schemas=(record.schema_name,),
+                target_role=None if grantor == current_role else grantor,
             )
-            for default_grant in default_grants:
-                if roles is None or default_grant.grant.target_role in roles:
-                    result.append(default_grant)
+            for grant in exploded_acl_grants(
+                grant_type,
+                grantee,
+                privileges,
+                grantable_privileges,
+                expanded=expanded,
+            ):
+                result.append(
+                    DefaultGrantStatement(grant=grant, default_grant=default_grant)
+                )
 
     return result
 
 
 def get_grants_postgresql(
     connection: Connection,
-    roles: Container[str] | None = None,
+    roles: Collection[str] | None = None,
     expanded=False,
+    schemas: Collection[str] | None = None,
 ):
-    existing_permissions = connection.execute(object_acl_query).fetchall()
+    """Reflect the grants to `roles` (or all roles), on objects in `schemas` (or all).
+
+    The acl is decomposed by ``aclexplode()`` and filtered in the catalog query,
+    such that only the matching privileges are returned. Objects with a `NULL` acl
+    produce the implicit grants of their owner.
+    """
+    query = get_object_acl_query(roles=roles is not None, schemas=schemas is not None)
+    records = connection.execute(query, _acl_filter_params(roles, schemas))
 
     result = []
-    for permission in existing_permissions:
-        acl = permission.acl
-        if acl is None:
-            acl = [acl]
-
-        for acl_item in acl:
-            grants = parse_acl(
-                acl_item,
-                permission.relkind,
-                qualify_name(permission.schema, permission.name),
-                owner=permission.owner,
-                expanded=expanded,
+    for record in records:
+        target = qualify_name(record.schema, record.name)
+        if record.implicit:
+            result.extend(
+                parse_acl(
+                    None, record.relkind, target, owner=record.owner, expanded=expanded
+                )
             )
-            for grant in grants:
-                if roles is None or grant.grant.target_role in roles:
-                    result.append(grant)
+            continue
+
+        if record.grantees is None:
+            continue
+
+        grant_type = GrantTypes.from_relkind(record.relkind)
+        for grantee, privileges, grantable_privileges in zip(
+            record.grantees, record.privileges, record.grantable_privileges
+        ):
+            for grant in exploded_acl_grants(
+                grant_type,
+                grantee,
+                privileges,
+                grantable_privileges,
+                expanded=expanded,
+            ):
+                result.append(
+                    GrantStatement(
+                        grant=grant, grant_type=grant_type, targets=(target,)
+                    )
+                )
 
     return result
 
 
+def _acl_filter_params(
+    roles: Collection[str] | None, schemas: Collection[str] | None
+) -> dict[str, list[str]]:
+    params = {}
+    if roles is not None:
+        params["roles"] = list(roles)
+    if schemas is not None:
+        params["schemas"] = list(schemas)
+    return params
+
+
 def get_roles_postgresql(connection: Connection, exclude=None):
     raw_roles = connection.execute(roles_query).fetchall()
 
@@ -160,18 +261,55 @@ def get_roles_postgresql(connection: Connection, exclude=None):
 
 
 def get_views_postgresql(connection: Connection):
+    return _views_from_rows(connection, connection.execute(views_query).fetchall())
+
+
+def get_views_by_name_postgresql(connection: Connection, names: Sequence[str]):
+    """Fetch only the views with the given (schema qualified) names."""
+    schemas, view_names = [], []
+    for name in names:
+        schema, view_name = split_schema(name)
+        schemas.append(schema or "public")
+        view_names.append(view_name)
+
+    rows = connection.execute(
+        views_by_name_query, {"schemas": schemas, "names": view_names}
+    ).fetchall()
+    return _views_from_rows(connection, rows, by_name=True)
+
+
+def _views_from_rows(connection: Connection, rows, by_name=False) -> list[View]:
+    # Only materialized views can have indexes, so (all of) their indexes are fetched
+    # in one query, rather than reflecting the indexes of each view individually.
+    # When the views were looked up by name, so are their indexes.
+    indexes_by_view: dict[
+        tuple[str, str], list[ViewIndex | Index | UniqueConstraint]
+    ] = defaultdict(list)
+    materialized = [v for v in rows if v.materialized]
+    if materialized:
+        view_indexes_query = get_view_indexes_query(
+            connection.dialect.server_version_info, by_name=by_name
+        )
+        params = {}
+        if by_name:
+            params = {
+                "schemas": [v.schema for v in materialized],
+                "names": [v.name for v in materialized],
+            }
+        for raw in connection.execute(view_indexes_query, params).fetchall():
+            indexes_by_view[(raw.schema, raw.view_name)].append(
+                ViewIndex(
+                    name=raw.name,
+                    unique=raw.unique,
+                    columns=cast(List[str], raw.column_names),
+                )
+            )
+
     views = []
-    for v in connection.execute(views_query).fetchall():
+    for v in rows:
         schema = v.schema if v.schema != "public" else None
 
-        indexes: list[ViewIndex | Index | UniqueConstraint] = [
-            ViewIndex(
-                name=raw["name"],
-                unique=raw["unique"],
-                columns=cast(List[str], raw["column_names"]),
-            )
-            for raw in connection.dialect.get_indexes(connection, v.name, schema=schema)
-        ]
+        indexes = indexes_by_view.get((v.schema, v.name))
         view = View(
             v.name,
             v.definition,
@@ -193,6 +331,14 @@ def get_view_postgresql(connection: Connection, name: str, schema: str = "public
     )
 
 
+def get_view_definitions_postgresql(
+    connection: Connection, names: Sequence[str]
+) -> dict[str, str]:
+    """Fetch the definitions of all the given (search-path resolvable) views at once."""
+    rows = connection.execute(view_definitions_query, {"names": list(names)})
+    return {row.name: row.definition for row in rows.fetchall()}
+
+
 def get_procedures_postgresql(connection: Connection) -> Sequence[BaseProcedure]:
     procedures = []
     procedures_query = get_procedures_query(connection.dialect.server_version_info)
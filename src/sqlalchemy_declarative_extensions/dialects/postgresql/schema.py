@@ -3,20 +3,29 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Collection
 
 from sqlalchemy import (
+    Integer,
     String,
     Text,
     and_,
     bindparam,
+    case,
     cast,
     column,
     exists,
     func,
     literal,
+    or_,
     table,
     text,
-    union,
+    true,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import (
+    ARRAY,
+    CHAR,
+    REGCLASS,
+    aggregate_order_by,
 )
-from sqlalchemy.dialects.postgresql import ARRAY, CHAR, REGCLASS, aggregate_order_by
 from sqlalchemy.sql.functions import coalesce
 
 from sqlalchemy_declarative_extensions.sqlalchemy import select
@@ -49,6 +58,24 @@ pg_class = table(
     column("relowner"),
 )
 
+pg_index = table(
+    "pg_index",
+    column("indexrelid"),
+    column("indrelid"),
+    column("indisunique"),
+    column("indisprimary"),
+    column("indkey"),
+    column("indnatts"),
+    column("indnkeyatts"),
+)
+
+pg_attribute = table(
+    "pg_attribute",
+    column("attrelid"),
+    column("attnum"),
+    column("attname"),
+)
+
 pg_database = table(
     "pg_database",
     column("oid"),
@@ -222,46 +249,215 @@ schema_exists_query = text(
 )
 
 
-default_acl_query = select(
-    pg_roles.c.rolname.label("role_name"),
-    pg_namespace.c.nspname.label("schema_name"),
-    pg_default_acl.c.defaclobjtype.label("object_type"),
-    pg_default_acl.c.defaclacl.cast(ARRAY(String)).label("acl"),
-).select_from(
-    pg_default_acl.join(pg_roles, pg_default_acl.c.defaclrole == pg_roles.c.oid).join(
-        pg_namespace, pg_default_acl.c.defaclnamespace == pg_namespace.c.oid
-    )
-)
-
 object_acl_relkinds = char_literals("r", "S", "f", "n", "T", "v")
 namespace_acl_relkind = literal("n", char)
-object_acl_query = union(
-    select(
-        pg_namespace.c.nspname.label("schema"),
-        pg_class.c.relname.label("name"),
-        pg_class.c.relkind.cast(char).label("relkind"),
-        pg_roles.c.rolname.label("owner"),
-        pg_class.c.relacl.cast(ARRAY(String)).label("acl"),
+
+
+# The `aclexplode()` privilege types, by their bit in the privilege masks of
+# `exploded_acl`. Unlisted privilege types are omitted from the masks.
+acl_privilege_types = (
+    "SELECT",
+    "INSERT",
+    "UPDATE",
+    "DELETE",
+    "TRUNCATE",
+    "REFERENCES",
+    "TRIGGER",
+    "USAGE",
+    "CREATE",
+    "EXECUTE",
+    "TEMPORARY",
+    "CONNECT",
+)
+
+
+def exploded_acl(acl, relation, roles: bool = False):
+    """Join `relation` with the `aclexplode()`-decomposed items of its `acl`.
+
+    `aclexplode()` produces a row per privilege, which are aggregated back into one
+    row of `relation`, with one array element per acl item: the `grantors` and
+    `grantees` role names (`PUBLIC` for the grantee 0), and the `privileges` and
+    `grantable_privileges` (those with the grant option), each as a bitmask of
+    `acl_privilege_types`. The arrays are `NULL` for a `NULL` (or empty) acl.
+
+    With `roles`, only the items granted to one of the `roles` parameter are included.
+    """
+    exploded = func.aclexplode(acl).table_valued(
+        "grantor", "grantee", "privilege_type", "is_grantable"
     )
-    .select_from(
+    privilege_bit = literal(1).op("<<")(
+        func.array_position(
+            literal(list(acl_privilege_types), ARRAY(String)),
+            exploded.c.privilege_type,
+        )
+        - 1
+    )
+    items = select(
+        exploded.c.grantor,
+        exploded.c.grantee,
+        coalesce(
+            func.bit_or(privilege_bit).filter(exploded.c.is_grantable.is_(False)), 0
+        ).label("privileges"),
+        coalesce(
+            func.bit_or(privilege_bit).filter(exploded.c.is_grantable.is_(True)), 0
+        ).label("grantable_privileges"),
+    ).group_by(exploded.c.grantor, exploded.c.grantee)
+
+    if roles:
+        role_names: BindParameter = bindparam("roles", expanding=True)
+        items = items.where(
+            or_(
+                exploded.c.grantee.in_(
+                    select(pg_roles.c.oid).where(pg_roles.c.rolname.in_(role_names))
+                ),
+                and_(exploded.c.grantee == 0, literal("PUBLIC").in_(role_names)),
+            )
+        )
+
+    item = items.subquery("acl_item")
+    grantor = pg_roles.alias("grantor_role")
+    grantee = pg_roles.alias("grantee_role")
+    acl_items = (
+        select(
+            func.array_agg(grantor.c.rolname).label("grantors"),
+            func.array_agg(
+                case(
+                    (item.c.grantee == 0, literal("PUBLIC", String)),
+                    else_=grantee.c.rolname,
+                )
+            ).label("grantees"),
+            func.array_agg(item.c.privileges).label("privileges"),
+            func.array_agg(item.c.grantable_privileges).label("grantable_privileges"),
+        )
+        .select_from(
+            item.outerjoin(grantor, grantor.c.oid == item.c.grantor).outerjoin(
+                grantee, grantee.c.oid == item.c.grantee
+            )
+        )
+        .lateral("acl")
+    )
+    columns = [
+        acl_items.c.grantors,
+        acl_items.c.grantees,
+        acl_items.c.privileges,
+        acl_items.c.grantable_privileges,
+    ]
+    return relation.outerjoin(acl_items, true()), columns
+
+
+def get_object_acl_query(roles: bool = False, schemas: bool = False):
+    """Produce the query of the acl items of each table, view, sequence and schema.
+
+    There is one row per object, with its acl items (see `exploded_acl`). An object
+    with a `NULL` acl is `implicit`: it has only the implicit grants of its owner.
+
+    With `roles`, only the items granted to one of the `roles` parameter are
+    included, along with the objects with a `NULL` acl owned by one of the `roles`.
+    With `schemas`, only the objects in (and the schemas themselves named by) the
+    `schemas` parameter are included.
+    """
+    relations, relation_acl = exploded_acl(
+        pg_class.c.relacl,
         pg_class.join(pg_namespace, pg_class.c.relnamespace == pg_namespace.c.oid).join(
             pg_roles, pg_class.c.relowner == pg_roles.c.oid
+        ),
+        roles=roles,
+    )
+    relation_query = (
+        select(
+            pg_namespace.c.nspname.label("schema"),
+            pg_class.c.relname.label("name"),
+            pg_class.c.relkind.cast(char).label("relkind"),
+            pg_roles.c.rolname.label("owner"),
+            pg_class.c.relacl.is_(None).label("implicit"),
+            *relation_acl,
         )
+        .select_from(relations)
+        .where(pg_class.c.relkind.cast(char).in_(object_acl_relkinds))
+        .where(_table_not_pg)
+        .where(_schema_not_pg())
     )
-    .where(pg_class.c.relkind.cast(char).in_(object_acl_relkinds))
-    .where(_table_not_pg)
-    .where(_schema_not_pg()),
-    select(
-        literal(None).label("schema"),
-        pg_namespace.c.nspname.label("name"),
-        namespace_acl_relkind.label("relkind"),
-        pg_roles.c.rolname.label("owner"),
-        pg_namespace.c.nspacl.cast(ARRAY(String)),
+
+    namespaces, namespace_acl = exploded_acl(
+        pg_namespace.c.nspacl,
+        pg_namespace.join(pg_roles, pg_namespace.c.nspowner == pg_roles.c.oid),
+        roles=roles,
     )
-    .select_from(pg_namespace.join(pg_roles, pg_namespace.c.nspowner == pg_roles.c.oid))
-    .where(_schema_not_pg())
-    .where(_schema_not_public),
-)
+    namespace_query = (
+        select(
+            literal(None, String).label("schema"),
+            pg_namespace.c.nspname.label("name"),
+            namespace_acl_relkind.label("relkind"),
+            pg_roles.c.rolname.label("owner"),
+            pg_namespace.c.nspacl.is_(None),
+            *namespace_acl,
+        )
+        .select_from(namespaces)
+        .where(_schema_not_pg())
+        .where(_schema_not_public)
+    )
+
+    if roles:
+        role_names: BindParameter = bindparam("roles", expanding=True)
+        relation_query = relation_query.where(
+            or_(
+                relation_acl[1].isnot(None),
+                and_(pg_class.c.relacl.is_(None), pg_roles.c.rolname.in_(role_names)),
+            )
+        )
+        namespace_query = namespace_query.where(
+            or_(
+                namespace_acl[1].isnot(None),
+                and_(
+                    pg_namespace.c.nspacl.is_(None),
+                    pg_roles.c.rolname.in_(role_names),
+                ),
+            )
+        )
+
+    if schemas:
+        in_schemas = pg_namespace.c.nspname.in_(bindparam("schemas", expanding=True))
+        relation_query = relation_query.where(in_schemas)
+        namespace_query = namespace_query.where(in_schemas)
+
+    return relation_query.union_all(namespace_query)
+
+
+def get_default_acl_query(roles: bool = False, schemas: bool = False):
+    """Produce the query of the default acl items of each role and schema.
+
+    There is one row per role, schema and object type, with its acl items (see
+    `exploded_acl`). With `roles`, only the items granted to one of the `roles`
+    parameter are included. With `schemas`, only the default grants in the
+    `schemas` parameter.
+    """
+    default_acls, acl = exploded_acl(
+        pg_default_acl.c.defaclacl,
+        pg_default_acl.join(
+            pg_roles, pg_default_acl.c.defaclrole == pg_roles.c.oid
+        ).join(pg_namespace, pg_default_acl.c.defaclnamespace == pg_namespace.c.oid),
+        roles=roles,
+    )
+    query = (
+        select(
+            pg_roles.c.rolname.label("role_name"),
+            pg_namespace.c.nspname.label("schema_name"),
+            pg_default_acl.c.defaclobjtype.label("object_type"),
+            *acl,
+        )
+        .select_from(default_acls)
+        .where(acl[1].isnot(None))
+    )
+
+    if schemas:
+        query = query.where(
+            pg_namespace.c.nspname.in_(bindparam("schemas", expanding=True))
+        )
+    return query
+
+
+object_acl_query = get_object_acl_query()
+default_acl_query = get_default_acl_query()
 
 objects_query = (
     select(
@@ -278,6 +474,21 @@ objects_query = (
     .where(_schema_not_from_extension())
 )
 
+# The relations affected by `GRANT ... ON ALL {TABLES,SEQUENCES} IN SCHEMA`.
+schema_relation_relkinds = char_literals("r", "p", "v", "m", "f", "S")
+schema_relations_query = (
+    select(
+        pg_namespace.c.nspname.label("schema"),
+        pg_class.c.relname.label("object_name"),
+        pg_class.c.relkind.cast(char).label("relkind"),
+    )
+    .select_from(
+        pg_class.join(pg_namespace, pg_class.c.relnamespace == pg_namespace.c.oid)
+    )
+    .where(pg_class.c.relkind.cast(char).in_(schema_relation_relkinds))
+    .where(pg_namespace.c.nspname.in_(bindparam("schemas", expanding=True)))
+)
+
 view_relkinds = char_literals("v", "m")
 materialized_relkind = literal("m", char)
 views_query = (
@@ -296,11 +507,134 @@ views_query = (
     .where(_not_from_extension(pg_class.c.oid, "pg_class"))
 )
 
-views_subquery = views_query.cte()
-view_query = (
-    select(views_subquery)
-    .where(views_subquery.c.schema == bindparam("schema"))
-    .where(views_subquery.c.name == bindparam("name"))
+
+def get_view_indexes_query(version_info, by_name: bool = False):
+    """Produce the indexes of all materialized views, in one query.
+
+    Mirrors the subset of `dialect.get_indexes` used to produce `ViewIndex`es, except
+    that expression index elements are represented by their expression, rather than
+    `None`.
+
+    With `by_name`, only the indexes of the views given by the "schemas" and "names"
+    (array) parameters are produced, as with `views_by_name_query`.
+    """
+    if version_info >= (11, 0):
+        key_count = pg_index.c.indnkeyatts
+    else:
+        key_count = pg_index.c.indnatts
+
+    index_key = (
+        func.unnest(pg_index.c.indkey)
+        .table_valued("attnum", with_ordinality="ordinality")
+        .render_derived(name="index_key")
+    )
+    column_names = (
+        select(
+            func.array_agg(
+                aggregate_order_by(
+                    case(
+                        (
+                            index_key.c.attnum == 0,
+                            func.pg_get_indexdef(
+                                pg_index.c.indexrelid,
+                                cast(index_key.c.ordinality, Integer),
+                                True,
+                            ),
+                        ),
+                        else_=cast(pg_attribute.c.attname, Text),
+                    ),
+                    index_key.c.ordinality,
+                )
+            )
+        )
+        .select_from(
+            index_key.outerjoin(
+                pg_attribute,
+                and_(
+                    pg_attribute.c.attrelid == pg_index.c.indrelid,
+                    pg_attribute.c.attnum == index_key.c.attnum,
+                ),
+            )
+        )
+        .where(index_key.c.ordinality <= key_count)
+        .scalar_subquery()
+    )
+
+    index_class = pg_class.alias("index_class")
+    query = (
+        select(
+            pg_namespace.c.nspname.label("schema"),
+            pg_class.c.relname.label("view_name"),
+            index_class.c.relname.label("name"),
+            pg_index.c.indisunique.label("unique"),
+            column_names.label("column_names"),
+        )
+        .select_from(
+            pg_index.join(pg_class, pg_index.c.indrelid == pg_class.c.oid)
+            .join(index_class, pg_index.c.indexrelid == index_class.c.oid)
+            .join(pg_namespace, pg_class.c.relnamespace == pg_namespace.c.oid)
+        )
+        .where(pg_class.c.relkind.cast(char) == materialized_relkind)
+        .where(pg_index.c.indisprimary.is_(False))
+        .where(_schema_not_pg(pg_namespace.c.nspname))
+        .order_by(pg_namespace.c.nspname, pg_class.c.relname, index_class.c.relname)
+    )
+    if by_name:
+        query = query.where(_requested_view_filter())
+    return query
+
+
+# Filter directly on the catalog columns (rather than on a subquery of `views_query`)
+# so that the lookup only ever touches the requested relation(s).
+view_query = views_query.where(pg_namespace.c.nspname == bindparam("schema")).where(
+    pg_class.c.relname == bindparam("name")
+)
+
+
+def _requested_view_filter():
+    requested_views = (
+        func.unnest(
+            bindparam("schemas", type_=ARRAY(Text)),
+            bindparam("names", type_=ARRAY(Text)),
+        )
+        .table_valued("schema", "name")
+        .render_derived(name="requested_views")
+    )
+    return tuple_(pg_namespace.c.nspname, pg_class.c.relname).in_(
+        select(requested_views.c.schema, requested_views.c.name)
+    )
+
+
+views_by_name_query = views_query.where(_requested_view_filter())
+
+# The same relkinds as are considered by `has_table`.
+table_relkinds = char_literals("r", "p", "f", "v", "m")
+requested_tables = (
+    func.unnest(bindparam("names", type_=ARRAY(Text)))
+    .table_valued("name")
+    .render_derived(name="requested_tables")
+)
+tables_by_name_query = (
+    select(
+        pg_namespace.c.nspname.label("schema"),
+        pg_class.c.relname.label("name"),
+        func.pg_table_is_visible(pg_class.c.oid).label("visible"),
+    )
+    .select_from(
+        pg_class.join(pg_namespace, pg_class.c.relnamespace == pg_namespace.c.oid)
+    )
+    .where(pg_class.c.relkind.cast(char).in_(table_relkinds))
+    .where(pg_class.c.relname.in_(select(requested_tables.c.name)))
+)
+
+view_names = (
+    func.unnest(bindparam("names", type_=ARRAY(Text)))
+    .table_valued("name")
+    .alias("view_names")
+)
+view_definitions_query = select(
+    view_names.c.name,
+    func.pg_get_viewdef(view_names.c.name.cast(REGCLASS)).label("definition"),
 )
 
 
@@ -124,8 +124,11 @@ class View(base.View):
         conn: Connection,
         naming_convention: base.NamingConvention | None,
         using_connection: bool = True,
+        definition: str | None = None,
     ) -> View:
-        instance = super().normalize(conn, naming_convention, using_connection)
+        instance = super().normalize(
+            conn, naming_convention, using_connection, definition=definition
+        )
         return replace(
             instance,
             materialized=MaterializedOptions.from_value(self.materialized),
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from typing import Type, TypeVar, cast
 
-from sqlalchemy import func
+from sqlalchemy import func, inspect
 from sqlalchemy.engine import Connection
 
 from sqlalchemy_declarative_extensions.dialects import mysql, postgresql, snowflake
@@ -18,14 +18,18 @@ from sqlalchemy_declarative_extensions.dialects.postgresql.query import (
     check_schema_exists_postgresql,
     get_databases_postgresql,
     get_default_grants_postgresql,
+    get_existing_tables_postgresql,
     get_functions_postgresql,
     get_grants_postgresql,
     get_objects_postgresql,
     get_procedures_postgresql,
     get_roles_postgresql,
+    get_schema_relations_postgresql,
     get_schemas_postgresql,
     get_triggers_postgresql,
+    get_view_definitions_postgresql,
     get_view_postgresql,
+    get_views_by_name_postgresql,
     get_views_postgresql,
 )
 from sqlalchemy_declarative_extensions.dialects.snowflake.query import (
@@ -44,6 +48,7 @@ from sqlalchemy_declarative_extensions.function.base import Function
 from sqlalchemy_declarative_extensions.procedure import Procedure
 from sqlalchemy_declarative_extensions.role import Role
 from sqlalchemy_declarative_extensions.schema.base import Schema
+from sqlalchemy_declarative_extensions.sql import split_schema
 from sqlalchemy_declarative_extensions.sqlalchemy import dialect_dispatch, select
 from sqlalchemy_declarative_extensions.view import View
 
@@ -80,6 +85,10 @@ get_objects = dialect_dispatch(
     postgresql=get_objects_postgresql,
 )
 
+get_schema_relations = dialect_dispatch(
+    postgresql=get_schema_relations_postgresql,
+)
+
 get_databases = dialect_dispatch(
     postgresql=get_databases_postgresql,
     snowflake=get_databases_snowflake,
@@ -125,6 +134,14 @@ get_view = dialect_dispatch(
     postgresql=get_view_postgresql,
 )
 
+get_views_by_name = dialect_dispatch(
+    postgresql=get_views_by_name_postgresql,
+)
+
+get_view_definitions = dialect_dispatch(
+    postgresql=get_view_definitions_postgresql,
+)
+
 get_procedures = dialect_dispatch(
     postgresql=get_procedures_postgresql,
     mysql=get_procedures_mysql,
@@ -157,6 +174,42 @@ def check_table_exists(
     return connection.dialect.has_table(connection, tablename, schema=schema)
 
 
+def get_existing_tables_default(
+    connection: Connection, names: Sequence[str]
+) -> set[str]:
+    """Return those of the (optionally schema qualified) table `names` which exist.
+
+    Rather than checking each table individually, the tables (and views) of each
+    referenced schema are listed once.
+    """
+    inspector = inspect(connection)
+
+    names_by_schema: dict[str | None, dict[str, str]] = {}
+    for name in names:
+        schema, tablename = split_schema(name)
+        names_by_schema.setdefault(schema, {})[tablename] = name
+
+    result: set[str] = set()
+    for schema, schema_names in names_by_schema.items():
+        existing = {
+            *inspector.get_table_names(schema=schema),
+            *inspector.get_view_names(schema=schema),
+        }
+        if schema is None and "sqlite" in connection.dialect.name:
+            existing.update(inspector.get_temp_table_names())
+
+        result.update(
+            name for tablename, name in schema_names.items() if tablename in existing
+        )
+    return result
+
+
+get_existing_tables = dialect_dispatch(
+    postgresql=get_existing_tables_postgresql,
+    default=get_existing_tables_default,
+)
+
+
 def get_current_schema(connection: Connection) -> str | None:
     if connection.dialect.name == "mysql":
         return None
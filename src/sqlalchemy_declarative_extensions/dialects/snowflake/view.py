@@ -55,8 +55,11 @@ class View(base.View):
         conn: Connection,
         naming_convention: base.NamingConvention | None,
         using_connection: bool = True,
+        definition: str | None = None,
     ) -> View:
-        result = super().normalize(conn, naming_convention, using_connection)
+        result = super().normalize(
+            conn, naming_convention, using_connection, definition=definition
+        )
         return replace(
             result,
             schema=self.schema.upper() if self.schema else None,
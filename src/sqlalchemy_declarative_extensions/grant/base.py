@@ -30,6 +30,11 @@ class Grants:
             also imply the set of expected actual grants. This allows one to specify
             only default grants, and per-object grants will be made to match the
             default set.
+        schema_wide_grants: Defaults to `False`. When `True`, privileges granted to
+            (or revoked from) a role on every table (or sequence) of a schema are
+            rendered as a single `ON ALL TABLES IN SCHEMA` statement. Note, unlike
+            per-object statements, such a statement affects every such object which
+            exists when it is executed, rather than when it was generated.
 
     Examples:
         - No grants
@@ -52,6 +57,7 @@ class Grants:
     ignore_self_grants: bool = True
     only_defined_roles: bool = True
     default_grants_imply_grants: bool = True
+    schema_wide_grants: bool = False
 
     @classmethod
     def coerce_from_unknown(cls, unknown: None | Iterable[G] | Grants) -> Grants | None:
@@ -85,11 +91,13 @@ class Grants:
             and x.only_defined_roles == instances[0].only_defined_roles
             and x.default_grants_imply_grants
             == instances[0].default_grants_imply_grants
+            and x.schema_wide_grants == instances[0].schema_wide_grants
             for x in instances
         ):
             raise ValueError(
                 "All combined `Grants` instances must agree on the set of settings: "
-                "ignore_unspecified, ignore_self_grants, only_defined_roles, default_grants_imply_grants"
+                "ignore_unspecified, ignore_self_grants, only_defined_roles, default_grants_imply_grants, "
+                "schema_wide_grants"
             )
 
         grants = [s for instance in instances for s in instance.grants]
@@ -98,12 +106,14 @@ class Grants:
         ignore_self_grants = instances[0].ignore_self_grants
         only_defined_roles = instances[0].only_defined_roles
         default_grants_imply_grants = instances[0].default_grants_imply_grants
+        schema_wide_grants = instances[0].schema_wide_grants
         return cls(
             grants=grants,
             ignore_unspecified=ignore_unspecified,
             ignore_self_grants=ignore_self_grants,
             only_defined_roles=only_defined_roles,
             default_grants_imply_grants=default_grants_imply_grants,
+            schema_wide_grants=schema_wide_grants,
         )
 
     def __iter__(self):
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from itertools import groupby
-from typing import Container, Union
+from typing import Collection, Union
 
 from sqlalchemy.engine import Connection
 
@@ -10,20 +10,33 @@ from sqlalchemy_declarative_extensions.dialects import (
     get_default_grants,
     get_grants,
     get_objects,
+    get_schema_relations,
 )
 from sqlalchemy_declarative_extensions.dialects.postgresql import (
+    BulkGrantStatement,
     DefaultGrantStatement,
     GrantStatement,
     GrantTypes,
 )
 from sqlalchemy_declarative_extensions.grant.base import Grants
+from sqlalchemy_declarative_extensions.grant.privileges import (
+    PrivilegeMasks,
+    add_default_grants,
+    add_grants,
+    bulk_default_grant_statements,
+    bulk_grant_statements,
+    privilege_mask,
+    revokes_and_grants,
+    schema_wide_grant_types,
+)
 from sqlalchemy_declarative_extensions.op import ExecuteOp
 from sqlalchemy_declarative_extensions.role.base import Roles
+from sqlalchemy_declarative_extensions.sql import split_schema
 
 
 @dataclass
 class GrantPrivilegesOp(ExecuteOp):
-    grant: DefaultGrantStatement | GrantStatement
+    grant: BulkGrantStatement | DefaultGrantStatement | GrantStatement
 
     def reverse(self):
         return RevokePrivilegesOp(self.grant)
@@ -34,7 +47,7 @@ class GrantPrivilegesOp(ExecuteOp):
 
 @dataclass
 class RevokePrivilegesOp(ExecuteOp):
-    grant: DefaultGrantStatement | GrantStatement
+    grant: BulkGrantStatement | DefaultGrantStatement | GrantStatement
 
     def reverse(self):
         return GrantPrivilegesOp(self.grant)
@@ -73,27 +86,31 @@ def compare_grants(
 def compare_default_grants(
     connection: Connection,
     grants: Grants,
-    roles: Container[str] | None = None,
+    roles: Collection[str] | None = None,
 ):
     result: list[Operation] = []
 
-    existing_default_grants = get_default_grants(connection, roles=roles, expanded=True)
-
-    expected_grants = []
-    for grant in grants:
-        if not isinstance(grant, DefaultGrantStatement):
-            continue
+    existing_default_grants = get_default_grants(
+        connection, roles=roles, schemas=declared_schemas(grants)
+    )
 
-        expected_grants.extend(grant.explode())
+    # Inverted grants declare privileges which must not be held, rather than granted.
+    declared = [g for g in grants if isinstance(g, DefaultGrantStatement)]
+    expected = PrivilegeMasks()
+    add_default_grants(expected, [g for g in declared if not g.grant.revoke_])
+    revoked = PrivilegeMasks()
+    add_default_grants(revoked, [g for g in declared if g.grant.revoke_])
 
-    missing_grants = set(expected_grants) - set(existing_default_grants)
-    extra_grants = set(existing_default_grants) - set(expected_grants)
+    existing = PrivilegeMasks()
+    add_default_grants(existing, existing_default_grants)
 
-    if not grants.ignore_unspecified:
-        for grant in DefaultGrantStatement.combine(list(extra_grants)):
-            result.append(RevokePrivilegesOp(grant))
+    revokes, missing = revokes_and_grants(
+        expected, existing, revoke=not grants.ignore_unspecified, revoked=revoked
+    )
+    for grant in bulk_default_grant_statements(revokes):
+        result.append(RevokePrivilegesOp(grant))
 
-    for grant in DefaultGrantStatement.combine(list(missing_grants)):
+    for grant in bulk_default_grant_statements(missing):
         result.append(GrantPrivilegesOp(grant))
 
     return result
@@ -103,16 +120,15 @@ def compare_object_grants(
     connection: Connection,
     grants: Grants,
     username: str,
-    roles: Container[str] | None = None,
+    roles: Collection[str] | None = None,
 ):
     result: list[Operation] = []
 
-    expected_grants = [
-        sub_g
-        for grant in grants
-        for sub_g in grant.explode()
-        if isinstance(sub_g, GrantStatement)
-    ]
+    declared = [g for g in grants if isinstance(g, GrantStatement)]
+    expected = PrivilegeMasks()
+    add_grants(expected, [g for g in declared if not g.grant.revoke_])
+    revoked = PrivilegeMasks()
+    add_grants(revoked, [g for g in declared if g.grant.revoke_])
 
     existing_tables = get_objects(connection)
     existing_tables_by_schema = {
@@ -123,6 +139,10 @@ def compare_object_grants(
             continue
 
         grant_type = grant.default_grant.grant_type.to_grant_type()
+        grant_mask = privilege_mask(
+            grant.grant.on_objects(object_type=grant_type).grant.grants
+        )
+        implied = revoked if grant.grant.revoke_ else expected
 
         for schema in grant.default_grant.in_schemas:
             existing_tables_in_schema = existing_tables_by_schema.get(schema)
@@ -133,25 +153,98 @@ def compare_object_grants(
                 object_type = GrantTypes.from_relkind(relkind)
 
                 if object_type == grant_type:
-                    expected_grants.extend(
-                        grant.grant.on_objects(table, object_type=object_type).explode()
+                    implied.add(
+                        (
+                            object_type,
+                            table,
+                            grant.grant.target_role,
+                            grant.grant.grant_option,
+                        ),
+                        grant_mask,
                     )
 
-    existing_grants = get_grants(connection, roles=roles, expanded=True)
+    existing_grants = get_grants(
+        connection, roles=roles, schemas=declared_schemas(grants)
+    )
 
     if grants.ignore_self_grants:
         existing_grants = [
             g for g in existing_grants if g.grant.target_role != username
         ]
 
-    missing_grants = set(expected_grants) - set(existing_grants)
-    extra_grants = set(existing_grants) - set(expected_grants)
+    existing = PrivilegeMasks()
+    add_grants(existing, existing_grants)
 
-    if not grants.ignore_unspecified:
-        for grant in GrantStatement.combine(list(extra_grants)):
-            result.append(RevokePrivilegesOp(grant))
+    revokes, missing = revokes_and_grants(
+        expected, existing, revoke=not grants.ignore_unspecified, revoked=revoked
+    )
+    relations = None
+    if grants.schema_wide_grants:
+        relations = get_schema_wide_relations(connection, revokes, missing)
+
+    for grant in bulk_grant_statements(revokes, relations):
+        result.append(RevokePrivilegesOp(grant))
 
-    for grant in GrantStatement.combine(list(missing_grants)):
+    for grant in bulk_grant_statements(missing, relations):
         result.append(GrantPrivilegesOp(grant))
 
     return result
+
+
+def declared_schemas(grants: Grants) -> set[str] | None:
+    """Collect the schemas of the objects targeted by `grants`.
+
+    Existing grants outside of these schemas can only ever be extra grants, so they
+    need not be reflected when unspecified grants are ignored. Otherwise, returns
+    `None`, such that all existing grants are reflected (to be revoked).
+    """
+    if not grants.ignore_unspecified:
+        return None
+
+    result: set[str] = set()
+    for grant in grants:
+        if isinstance(grant, DefaultGrantStatement):
+            result.update(grant.default_grant.in_schemas)
+        elif grant.grant_type == GrantTypes.schema:
+            result.update(grant.targets)
+        else:
+            for target in grant.targets:
+                schema, _ = split_schema(target)
+                result.add(schema or "public")
+    return result
+
+
+def get_schema_wide_relations(
+    connection: Connection, *masks: PrivilegeMasks
+) -> dict[tuple[GrantTypes, str], set[str]]:
+    """Reflect every relation of the schemas of the tables/sequences in `masks`.
+
+    Keyed by the grant type whose `ON ALL ... IN SCHEMA` form affects the relation,
+    and its schema. Schemas containing relations whose privileges are not reflected
+    (such as materialized views) are omitted, because the effect of a schema-wide
+    statement upon those relations cannot be known.
+    """
+    schemas = {
+        split_schema(target)[0] or "public"
+        for m in masks
+        for grant_type, target, *_ in m.masks
+        if grant_type in schema_wide_grant_types
+    }
+    if not schemas:
+        return {}
+
+    result: dict[tuple[GrantTypes, str], set[str]] = {}
+    unreflected = set()
+    for schema, name, relkind in get_schema_relations(connection, schemas):
+        grant_type = GrantTypes.sequence if relkind == "S" else GrantTypes.table
+        if relkind not in reflected_relkinds:
+            unreflected.add((grant_type, schema))
+        result.setdefault((grant_type, schema), set()).add(name)
+
+    for key in unreflected:
+        del result[key]
+    return result
+
+
+# The relations affected by `ON ALL ... IN SCHEMA` whose privileges `get_grants` reflects.
+reflected_relkinds = {"r", "v", "S"}
@@ -0,0 +1,364 @@
+from __future__ import annotations
+
+import functools
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator, Mapping, Sequence
+
+from sqlalchemy_declarative_extensions.dialects.postgresql import (
+    BulkGrantStatement,
+    DefaultGrant,
+    DefaultGrantStatement,
+    Grant,
+    GrantStatement,
+    GrantTypes,
+)
+from sqlalchemy_declarative_extensions.sql import split_schema
+
+# The most objects (or roles) named by any one synthesized statement.
+MAX_STATEMENT_TARGETS = 1000
+
+# The grant types which have an `ON ALL ... IN SCHEMA` form.
+schema_wide_grant_types = (GrantTypes.table, GrantTypes.sequence)
+
+# Every distinct privilege (i.e. enum member, such that `TableGrants.select` and
+# `SequenceGrants.select` are distinct) is assigned the next free bit, when first seen.
+_bits: dict[Any, int] = {}
+_privileges: list[Any] = []
+
+
+def privilege_mask(privileges: Iterable[Any]) -> int:
+    """Produce the bitmask of `privileges`."""
+    mask = 0
+    for privilege in privileges:
+        bit = _bits.get(privilege)
+        if bit is None:
+            bit = _bits[privilege] = 1 << len(_privileges)
+            _privileges.append(privilege)
+        mask |= bit
+    return mask
+
+
+@functools.lru_cache(maxsize=None)
+def mask_privileges(mask: int) -> tuple:
+    """Produce the (sorted) privileges of the bitmask `mask`."""
+    return tuple(
+        sorted(privilege for i, privilege in enumerate(_privileges) if mask >> i & 1)
+    )
+
+
+@dataclass
+class PrivilegeMasks:
+    """A set of privileges, stored as one bitmask per key.
+
+    The key is everything about a grant but its privileges, so the set of (exploded)
+    grants is the set of keys and privileges whose bits are set. Set differences are
+    then bitwise operations per key, rather than comparisons of one `GrantStatement`
+    per role, object and privilege.
+    """
+
+    masks: dict[tuple, int] = field(default_factory=dict)
+
+    def add(self, key: tuple, mask: int) -> None:
+        if mask:
+            self.masks[key] = self.masks.get(key, 0) | mask
+
+    def __sub__(self, other: PrivilegeMasks) -> PrivilegeMasks:
+        result = PrivilegeMasks()
+        for key, mask in self.masks.items():
+            result.add(key, mask & ~other.masks.get(key, 0))
+        return result
+
+    def __iter__(self) -> Iterator[tuple[tuple, tuple]]:
+        for key in sorted(self.masks, key=_sort_key):
+            yield key, mask_privileges(self.masks[key])
+
+    def __len__(self) -> int:
+        return len(self.masks)
+
+
+def revokes_and_grants(
+    expected: PrivilegeMasks,
+    existing: PrivilegeMasks,
+    revoke: bool = True,
+    revoked: PrivilegeMasks | None = None,
+) -> tuple[PrivilegeMasks, PrivilegeMasks]:
+    """Produce the privileges to revoke, and then to grant, to turn `existing` into `expected`.
+
+    Keys are expected to end in the grant option. Revoking a privilege removes it
+    regardless of grant option, so revoked privileges which are still expected (with
+    or without grant option) are granted again.
+
+    Privileges in `revoked` (i.e. those of inverted grants) are revoked wherever
+    they are held, even when unspecified privileges are otherwise left alone.
+    """
+    revokes = existing - expected if revoke else PrivilegeMasks()
+
+    if revoked:
+        declared_revokes = _without_grant_option(revoked)
+        for key, mask in existing.masks.items():
+            revokes.add(key, mask & declared_revokes.get(key[:-1], 0))
+
+    return revokes, expected - after_revokes(existing, revokes)
+
+
+def after_revokes(existing: PrivilegeMasks, revokes: PrivilegeMasks) -> PrivilegeMasks:
+    """Produce the privileges which remain of `existing`, once `revokes` are revoked."""
+    revoked = _without_grant_option(revokes)
+
+    result = PrivilegeMasks()
+    for key, mask in existing.masks.items():
+        result.add(key, mask & ~revoked.get(key[:-1], 0))
+    return result
+
+
+def _without_grant_option(masks: PrivilegeMasks) -> dict[tuple, int]:
+    result: dict[tuple, int] = {}
+    for key, mask in masks.masks.items():
+        result[key[:-1]] = result.get(key[:-1], 0) | mask
+    return result
+
+
+def grant_key(grant: GrantStatement, target: str) -> tuple:
+    """Produce the `PrivilegeMasks` key of `grant`, on `target`.
+
+    That is, its grant type, target, target role and grant option.
+    """
+    return (grant.grant_type, target, grant.grant.target_role, grant.grant.grant_option)
+
+
+def add_grants(masks: PrivilegeMasks, grants: Iterable[GrantStatement]) -> None:
+    """Add the privileges of each of `grants` to `masks`, per target."""
+    for grant in grants:
+        mask = privilege_mask(grant.grant.grants)
+        for target in grant.targets:
+            masks.add(grant_key(grant, target), mask)
+
+
+def grant_statements(masks: PrivilegeMasks) -> list[GrantStatement]:
+    """Produce one `GrantStatement` per key of `masks`, with all of its privileges."""
+    return [
+        GrantStatement(
+            grant=Grant(
+                grants=privileges,
+                target_role=target_role,
+                grant_option=grant_option,
+            ),
+            grant_type=grant_type,
+            targets=(target,),
+        )
+        for (grant_type, target, target_role, grant_option), privileges in masks
+    ]
+
+
+def bulk_grant_statements(
+    masks: PrivilegeMasks,
+    schema_relations: Mapping[tuple[GrantTypes, str], set[str]] | None = None,
+    max_targets: int = MAX_STATEMENT_TARGETS,
+) -> list[BulkGrantStatement]:
+    """Produce (close to) as few statements as possible, granting exactly `masks`.
+
+    * Privileges granted to a role on every relation of a type in a schema (per
+      `schema_relations`, by grant type and schema) are granted `ON ALL TABLES IN
+      SCHEMA` (or `SEQUENCES`). Every such relation must actually be changed, so
+      that the inverse statement (i.e. the revoke) only undoes the changes of this
+      one, rather than also revoking privileges which were already held.
+    * Objects granted the same privileges, to the same role, are granted together.
+    * Roles granted the same privileges, on the same objects, are granted together.
+    * Statements naming more than `max_targets` objects (or roles) are split.
+    """
+    masks = PrivilegeMasks(dict(masks.masks))
+
+    schemas_by_grant: dict[tuple, list[str]] = {}
+    if schema_relations:
+        for grant_type, schema, role, grant_option in _schema_wide_candidates(masks):
+            relations = schema_relations.get((grant_type, schema))
+            if not relations:
+                continue
+
+            keys = [(grant_type, r, role, grant_option) for r in relations]
+            mask = _schema_wide_mask(masks, keys)
+            if not mask:
+                continue
+
+            grant = (grant_type, grant_option, mask, role)
+            schemas_by_grant.setdefault(grant, []).append(schema)
+            for key in keys:
+                remainder = masks.masks.pop(key, 0) & ~mask
+                masks.add(key, remainder)
+
+    targets_by_grant: dict[tuple, list[str]] = {}
+    for (grant_type, target, role, grant_option), mask in masks.masks.items():
+        grant = (grant_type, grant_option, mask, role)
+        targets_by_grant.setdefault(grant, []).append(target)
+
+    roles_by_objects: dict[tuple, list[str]] = {}
+    for (grant_type, grant_option, mask, role), schemas in schemas_by_grant.items():
+        in_schemas = tuple(sorted(schemas))
+        roles_by_objects.setdefault(
+            (grant_type, grant_option, mask, (), in_schemas), []
+        ).append(role)
+
+    for (grant_type, grant_option, mask, role), targets in targets_by_grant.items():
+        objects = tuple(sorted(targets))
+        roles_by_objects.setdefault(
+            (grant_type, grant_option, mask, objects, ()), []
+        ).append(role)
+
+    result = [
+        BulkGrantStatement(
+            grants=mask_privileges(mask),
+            grant_type=grant_type,
+            target_roles=roles_chunk,
+            targets=targets_chunk,
+            in_schemas=schemas_chunk,
+            grant_option=grant_option,
+        )
+        for (
+            grant_type,
+            grant_option,
+            mask,
+            targets,
+            in_schemas,
+        ), roles in roles_by_objects.items()
+        for roles_chunk in _chunks(sorted(roles), max_targets)
+        for targets_chunk in _chunks(targets, max_targets)
+        for schemas_chunk in _chunks(in_schemas, max_targets)
+    ]
+    return sorted(result, key=_statement_sort_key)
+
+
+def _schema_wide_candidates(masks: PrivilegeMasks) -> list[tuple]:
+    result = {
+        (grant_type, split_schema(target)[0] or "public", role, grant_option)
+        for grant_type, target, role, grant_option in masks.masks
+        if grant_type in schema_wide_grant_types
+    }
+    return sorted(result, key=_sort_key)
+
+
+def _schema_wide_mask(masks: PrivilegeMasks, keys: list[tuple]) -> int:
+    """Produce the privileges which are to be granted to every one of `keys`.
+
+    A single object is no shorter to grant by schema, so there must be at least two.
+    """
+    if len(keys) < 2:
+        return 0
+
+    mask = -1
+    for key in keys:
+        mask &= masks.masks.get(key, 0)
+    return mask
+
+
+def add_default_grants(
+    masks: PrivilegeMasks, grants: Iterable[DefaultGrantStatement]
+) -> None:
+    """Add the privileges of each of `grants` to `masks`, per schema.
+
+    Keyed by grant type, schema, "for" role, target role and grant option.
+    """
+    for grant in grants:
+        default_grant = grant.default_grant
+        mask = privilege_mask(grant.grant.grants)
+        for schema in default_grant.in_schemas:
+            key = (
+                default_grant.grant_type,
+                schema,
+                default_grant.target_role or "",
+                grant.grant.target_role,
+                grant.grant.grant_option,
+            )
+            masks.add(key, mask)
+
+
+def default_grant_statements(masks: PrivilegeMasks) -> list[DefaultGrantStatement]:
+    """Produce one `DefaultGrantStatement` per key of `masks`."""
+    return [
+        DefaultGrantStatement(
+            default_grant=DefaultGrant(
+                grant_type=grant_type,
+                in_schemas=(schema,),
+                target_role=for_role or None,
+            ),
+            grant=Grant(
+                grants=privileges,
+                target_role=target_role,
+                grant_option=grant_option,
+            ),
+        )
+        for (
+            grant_type,
+            schema,
+            for_role,
+            target_role,
+            grant_option,
+        ), privileges in masks
+    ]
+
+
+def bulk_default_grant_statements(
+    masks: PrivilegeMasks, max_schemas: int = MAX_STATEMENT_TARGETS
+) -> list[DefaultGrantStatement]:
+    """Produce one `DefaultGrantStatement` per distinct grant, across all its schemas."""
+    schemas_by_grant: dict[tuple, list[str]] = {}
+    for (grant_type, schema, for_role, role, grant_option), mask in masks.masks.items():
+        key = (grant_type, for_role, role, grant_option, mask)
+        schemas_by_grant.setdefault(key, []).append(schema)
+
+    result = [
+        DefaultGrantStatement(
+            default_grant=DefaultGrant(
+                grant_type=grant_type,
+                in_schemas=schemas_chunk,
+                target_role=for_role or None,
+            ),
+            grant=Grant(
+                grants=mask_privileges(mask),
+                target_role=role,
+                grant_option=grant_option,
+            ),
+        )
+        for (
+            grant_type,
+            for_role,
+            role,
+            grant_option,
+            mask,
+        ), schemas in schemas_by_grant.items()
+        for schemas_chunk in _chunks(sorted(schemas), max_schemas)
+    ]
+    return sorted(result, key=_default_statement_sort_key)
+
+
+def _chunks(items: Sequence[str], size: int) -> list[tuple[str, ...]]:
+    if not items:
+        return [()]
+    return [tuple(items[i : i + size]) for i in range(0, len(items), size)]
+
+
+def _statement_sort_key(statement: BulkGrantStatement):
+    return (
+        statement.grant_type.value,
+        not statement.in_schemas,
+        statement.in_schemas,
+        statement.targets,
+        statement.target_roles,
+        statement.grant_option,
+        _sort_key(statement.grants),
+    )
+
+
+def _default_statement_sort_key(statement: DefaultGrantStatement):
+    return (
+        statement.default_grant.grant_type.value,
+        statement.default_grant.in_schemas,
+        statement.default_grant.target_role or "",
+        statement.grant.target_role,
+        statement.grant.grant_option,
+        _sort_key(statement.grant.grants),
+    )
+
+
+def _sort_key(key: tuple):
+    # Grant types are enums, which sort by value; the rest are str/bool.
+    return tuple(getattr(k, "value", k) for k in key)
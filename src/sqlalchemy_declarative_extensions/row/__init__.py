@@ -1,9 +1,18 @@
 from sqlalchemy_declarative_extensions.row import compare
-from sqlalchemy_declarative_extensions.row.base import Row, Rows, Table
+from sqlalchemy_declarative_extensions.row.base import Row, Rows, Table, TableRows
+from sqlalchemy_declarative_extensions.row.data import RowDataFile
+from sqlalchemy_declarative_extensions.row.reference import RowLookup, TableLookup
+from sqlalchemy_declarative_extensions.row.source import CsvSource, JsonlSource
 
 __all__ = [
     "compare",
+    "CsvSource",
+    "JsonlSource",
     "Rows",
     "Row",
+    "RowDataFile",
+    "RowLookup",
     "Table",
+    "TableLookup",
+    "TableRows",
 ]
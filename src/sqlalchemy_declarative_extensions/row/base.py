@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass, field, replace
-from typing import Any, Iterable, Sequence
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Literal, Sequence
 
 from sqlalchemy import MetaData
 from typing_extensions import Self
 
 from sqlalchemy_declarative_extensions.sql import split_schema
 
+if TYPE_CHECKING:
+    from sqlalchemy_declarative_extensions.row.reference import RowLookup
+    from sqlalchemy_declarative_extensions.row.source import RowSource
+
 
 @dataclass
 class Rows:
@@ -15,6 +20,36 @@ class Rows:
     included_tables: list[str] = field(default_factory=list)
     ignore_unspecified: bool = False
 
+    # The maximum number of rows sent to the database in a single statement.
+    chunk_size: int = 1000
+
+    # Sources of rows, such as from `Rows.from_csv` or `TableRows`.
+    sources: list[RowSource | TableRows] = field(default_factory=list)
+
+    # How rows are applied by `register_sqlalchemy_events(rows=True)`. "compare" diffs
+    # the declared rows against the existing ones, whereas "upsert" skips that
+    # comparison and idempotently writes every declared row.
+    strategy: Literal["compare", "upsert"] = "compare"
+
+    # Where declared rows are compared against existing ones. "python" fetches the
+    # existing records to compare locally, whereas "sql" (on postgresql) has the
+    # server compare them, returning only the rows and columns which differ.
+    comparison: Literal["python", "sql"] = "python"
+
+    # On postgresql, issue `SET CONSTRAINTS ALL DEFERRED` before applying rows, such
+    # that (deferrable) foreign keys are only checked once all rows are written.
+    defer_constraints: bool = False
+
+    # When set, autogenerated migrations write the values of inserted and updated rows
+    # to "json" (lines) or (gzipped) "csv" data files alongside the revision, rather
+    # than inlining them as literal SQL.
+    migration_data: Literal["json", "csv"] | None = None
+
+    # Memoized `RowLookup`s, by `MetaData`.
+    _lookups: dict[MetaData, RowLookup] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
     @classmethod
     def coerce_from_unknown(cls, unknown: None | Iterable[Row] | Rows) -> Rows | None:
         if isinstance(unknown, Rows):
@@ -49,15 +84,116 @@ class Rows:
             "Rows is currently only supported on a single instance of MetaData. File an issue if this affects you!"
         )
 
+    @classmethod
+    def from_csv(
+        cls,
+        tablename: str,
+        path: str | os.PathLike,
+        *,
+        schema: str | None = None,
+        converters: dict[str, Callable[[str], Any]] | None = None,
+        null: str | None = "",
+        **kwargs,
+    ) -> Rows:
+        """Declare the rows of `tablename` from a CSV file.
+
+        The file is not read until the rows are compared against the database,
+        at which point it is streamed through the comparison.
+
+        Examples:
+            >>> rows = Rows.from_csv("users", "users.csv", converters={"id": int})
+            >>> rows.sources
+            [CsvSource(tablename='users', path='users.csv', schema=None, converters={'id': <class 'int'>}, null='')]
+        """
+        from sqlalchemy_declarative_extensions.row.source import CsvSource
+
+        source = CsvSource(
+            tablename, path, schema=schema, converters=converters or {}, null=null
+        )
+        return cls(sources=[source], **kwargs)
+
+    @classmethod
+    def from_jsonl(
+        cls,
+        tablename: str,
+        path: str | os.PathLike,
+        *,
+        schema: str | None = None,
+        **kwargs,
+    ) -> Rows:
+        """Declare the rows of `tablename` from a JSON lines file.
+
+        The file is not read until the rows are compared against the database,
+        at which point it is streamed through the comparison.
+        """
+        from sqlalchemy_declarative_extensions.row.source import JsonlSource
+
+        return cls(sources=[JsonlSource(tablename, path, schema=schema)], **kwargs)
+
     def __iter__(self):
         yield from self.rows
+        for source in self.sources:
+            yield from source
+
+    def are(self, *rows: Row | RowSource | TableRows):
+        """Declare the set of rows, which may include (lazy) row sources.
+
+        Examples:
+            >>> from sqlalchemy_declarative_extensions.row.source import JsonlSource
+            >>> rows = Rows().are(Row("users", id=1), JsonlSource("users", "users.jsonl"))
+            >>> len(rows.rows), len(rows.sources)
+            (1, 1)
+        """
+        return replace(
+            self,
+            rows=[r for r in rows if isinstance(r, Row)],
+            sources=[r for r in rows if not isinstance(r, Row)],
+        )
+
+    def lookup(self, metadata: MetaData) -> RowLookup:
+        """Return read-only, in-memory lookups of the declared rows, by table.
+
+        Each table's rows are indexed by primary key, and by any unique column of
+        its `metadata` table. The lookup is built (reading any row sources) on first
+        use, and memoized thereafter.
+
+        Examples:
+            >>> from sqlalchemy import Column, Integer, MetaData, String, Table
+            >>> metadata = MetaData()
+            >>> _ = Table(
+            ...     "currency",
+            ...     metadata,
+            ...     Column("id", Integer, primary_key=True),
+            ...     Column("code", String, unique=True),
+            ... )
+            >>> rows = Rows().are(Row("currency", id=1, code="USD"))
+            >>> rows.lookup(metadata)["currency"].by("code")["USD"]["id"]
+            1
+            >>> rows.lookup(metadata) is rows.lookup(metadata)
+            True
+        """
+        lookup = self._lookups.get(metadata)
+        if lookup is None:
+            from sqlalchemy_declarative_extensions.row.reference import RowLookup
+
+            lookup = self._lookups[metadata] = RowLookup(self, metadata)
+        return lookup
+
+    @property
+    def tablenames(self) -> list[str]:
+        """Return the (qualified) names of all tables referenced by declared rows.
 
-    def are(self, *rows: Row):
-        return replace(self, rows=list(rows))
+        Unlike iterating over the rows, this does not read any row sources.
+        """
+        result = {row.qualified_name: None for row in self.rows}
+        result.update({source.qualified_name: None for source in self.sources})
+        return list(result)
 
 
 @dataclass
 class Row:
+    __slots__ = ("schema", "tablename", "column_values")
+
     schema: str | None
     tablename: str
     column_values: dict[str, Any]
@@ -70,6 +206,16 @@ class Row:
 
         self.column_values = column_values
 
+    @classmethod
+    def _create(
+        cls, schema: str | None, tablename: str, column_values: dict[str, Any]
+    ) -> Row:
+        row = cls.__new__(cls)
+        row.schema = schema
+        row.tablename = tablename
+        row.column_values = column_values
+        return row
+
     @property
     def qualified_name(self):
         if self.schema:
@@ -87,7 +233,76 @@ class Row:
         if self.schema is not None:
             return self
 
-        return self.__class__(self.tablename, schema=schema, **self.column_values)
+        return self._create(schema, self.tablename, self.column_values)
+
+
+class TableRows:
+    """A compact, columnar set of rows for a single table.
+
+    The column names are stored once, and each row as a tuple of its values, in
+    the same order. `Row` instances are only produced as the `TableRows` is
+    iterated (i.e. a chunk at a time, while being compared), rather than being
+    held for the lifetime of the declared `Rows`.
+
+    Examples:
+        >>> users = TableRows("users", ["id", "name"], [(1, "John"), (2, "Bob")])
+        >>> list(users)
+        [Row(schema=None, tablename='users', column_values={'id': 1, 'name': 'John'}), Row(schema=None, tablename='users', column_values={'id': 2, 'name': 'Bob'})]
+
+        A `TableRows` can be declared alongside any other rows.
+
+        >>> rows = Rows().are(users, Row("users", id=3, name="Alice"))
+    """
+
+    __slots__ = ("schema", "tablename", "columns", "values")
+
+    def __init__(
+        self,
+        tablename: str,
+        columns: Sequence[str],
+        values: Iterable[Sequence[Any]],
+        *,
+        schema: str | None = None,
+    ):
+        self.schema, self.tablename = split_schema(tablename, schema=schema)
+        self.columns = tuple(columns)
+
+        self.values = []
+        for row_values in values:
+            row_values = tuple(row_values)
+            if len(row_values) != len(self.columns):
+                raise ValueError(
+                    f"Expected {len(self.columns)} values for columns {self.columns}, got: {row_values}"
+                )
+            self.values.append(row_values)
+
+    @property
+    def qualified_name(self):
+        if self.schema:
+            return f"{self.schema}.{self.tablename}"
+        return self.tablename
+
+    def __iter__(self) -> Iterator[Row]:
+        for row_values in self.values:
+            yield Row._create(
+                self.schema, self.tablename, dict(zip(self.columns, row_values))
+            )
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TableRows):
+            return NotImplemented
+
+        return (
+            self.qualified_name == other.qualified_name
+            and self.columns == other.columns
+            and self.values == other.values
+        )
+
+    def __repr__(self) -> str:
+        return f"TableRows({self.qualified_name!r}, columns={self.columns!r}, rows={len(self)})"
 
 
 @dataclass
@@ -111,15 +326,33 @@ class Table:
         ...     users.row(id=2, name="Bob"),
         ... ]
         [Row(schema=None, tablename='users', column_values={'active': True, 'id': 1, 'name': 'John'}), Row(schema=None, tablename='users', column_values={'active': True, 'id': 2, 'name': 'Bob'})]
+
+        Or, for large numbers of rows, `Table.rows` produces a compact `TableRows`.
+
+        >>> list(users.rows(["id", "name"], (1, "John"), (2, "Bob")))
+        [Row(schema=None, tablename='users', column_values={'active': True, 'id': 1, 'name': 'John'}), Row(schema=None, tablename='users', column_values={'active': True, 'id': 2, 'name': 'Bob'})]
     """
 
+    __slots__ = ("name", "column_values")
+
     name: str
     column_values: dict[str, Any]
 
-    def __init__(self, name, **column_values):
+    def __init__(self, name: str, **column_values: Any):
         self.name = name
         self.column_values = column_values
 
     def row(self, **column_values) -> Row:
         final_values = {**self.column_values, **column_values}
-        return Row(self.name, **final_values)
+        schema, tablename = split_schema(self.name)
+        return Row._create(schema, tablename, final_values)
+
+    def rows(self, columns: Sequence[str], *values: Sequence[Any]) -> TableRows:
+        """Produce a compact `TableRows`, including this table's default column values."""
+        defaults = {c: v for c, v in self.column_values.items() if c not in columns}
+        default_values = tuple(defaults.values())
+        return TableRows(
+            self.name,
+            [*defaults, *columns],
+            [(*default_values, *row_values) for row_values in values],
+        )
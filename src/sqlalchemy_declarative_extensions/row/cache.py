@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import DDLElement
+from sqlalchemy.sql.elements import TextClause
+from sqlalchemy.sql.schema import MetaData, Table
+
+from sqlalchemy_declarative_extensions.dialects import get_existing_tables
+from sqlalchemy_declarative_extensions.row.normalize import (
+    Normalizer,
+    table_normalizers,
+)
+from sqlalchemy_declarative_extensions.sql import split_schema
+
+_info_key = "sqlalchemy_declarative_extensions.row.reflection_cache"
+
+
+@dataclass
+class ReflectionCache:
+    """A cache of reflected tables, shared by the row operations of a single run.
+
+    Row operations (and `compare_rows`) need the reflected (i.e. existing) state of
+    the tables they operate upon. Rather than reflecting each table once per
+    operation, tables are reflected once and shared for the duration of a
+    `ReflectionCache.scope`.
+
+    The cache only lives as long as its scope: `compare_rows` (and the
+    `declarative_database` `create_all` hook, which also executes the resulting
+    operations) each open their own, and alembic migrations share one between all
+    of their row operations. Outside of any scope, every operation reflects its
+    table anew.
+
+    DDL executed on the connection while the cache is in use invalidates the
+    tables it affects (or every table, for DDL which does not name its table, and
+    for textual SQL).
+
+    Examples:
+        >>> from sqlalchemy import create_engine
+        >>> engine = create_engine("sqlite://")
+        >>> with engine.connect() as conn:
+        ...     with ReflectionCache.scope(conn) as cache:
+        ...         ReflectionCache.for_connection(conn) is cache
+        True
+    """
+
+    metadata: MetaData = field(default_factory=MetaData)
+    hits: int = 0
+    misses: int = 0
+
+    # Whether (qualified) table names exist, as of the last time they were checked.
+    existing_tables: dict[str, bool] = field(default_factory=dict)
+
+    # The value normalizers of each reflected table's columns.
+    normalizers: dict[str, dict[str, Normalizer]] = field(default_factory=dict)
+
+    @classmethod
+    def for_connection(cls, conn: Connection) -> ReflectionCache:
+        """Return the cache of the connection's active scope, or else a new one."""
+        cache = cls.active(conn)
+        if cache is None:
+            return cls()
+        return cache
+
+    @classmethod
+    def active(cls, conn: Connection) -> ReflectionCache | None:
+        """Return the cache of the connection's active scope, if there is one."""
+        return conn.info.get(_info_key)
+
+    @classmethod
+    @contextmanager
+    def scope(
+        cls, conn: Connection, cache: ReflectionCache | None = None
+    ) -> Iterator[ReflectionCache]:
+        """Share a single cache between all row operations within the block.
+
+        Nested scopes share the cache of the outermost one. A given `cache` is
+        expected to already be watching the connection for DDL (see `watch`).
+        """
+        active = cls.active(conn)
+        if active is not None:
+            yield active
+            return
+
+        unwatch = None
+        if cache is None:
+            cache = cls()
+            unwatch = cache.watch(conn)
+
+        conn.info[_info_key] = cache
+        try:
+            yield cache
+        finally:
+            conn.info.pop(_info_key, None)
+            if unwatch:
+                unwatch()
+
+    def watch(self, conn: Connection) -> Callable[[], None]:
+        """Invalidate the tables affected by any DDL executed on `conn`.
+
+        Returns a function which stops watching the connection.
+        """
+
+        def receive_before_execute(conn, element, *_):
+            if isinstance(element, DDLElement):
+                tablenames = _ddl_tablenames(element)
+                if tablenames:
+                    for tablename in tablenames:
+                        self.invalidate(tablename)
+                    return
+
+                self.invalidate()
+                return
+
+            # Textual SQL cannot be told apart from DDL.
+            if isinstance(element, (str, TextClause)):
+                self.invalidate()
+
+        event.listen(conn, "before_execute", receive_before_execute)
+        return lambda: event.remove(conn, "before_execute", receive_before_execute)
+
+    def get_table(self, conn: Connection, tablename: str) -> Table:
+        """Return the reflected table `tablename`, reflecting it if not yet cached."""
+        assert self.metadata.tables is not None
+
+        table = self.metadata.tables.get(tablename)
+        if table is not None:
+            self.hits += 1
+            return table
+
+        self.misses += 1
+        schema, name = split_schema(tablename)
+        self.metadata.reflect(conn, schema=schema, only=[name])
+        return self.metadata.tables[tablename]
+
+    def get_normalizers(
+        self, conn: Connection, tablename: str, declared: Table | None = None
+    ) -> dict[str, Normalizer]:
+        """Return the value normalizers for the columns of the reflected `tablename`.
+
+        The `declared` table supplies any enum labels lost to reflection.
+        """
+        normalizers = self.normalizers.get(tablename)
+        if normalizers is None:
+            table = self.get_table(conn, tablename)
+            normalizers = self.normalizers[tablename] = table_normalizers(
+                table, declared
+            )
+        return normalizers
+
+    def tables_exist(
+        self, conn: Connection, tablenames: Iterable[str]
+    ) -> dict[str, bool]:
+        """Return whether each of `tablenames` exists.
+
+        Any tables not yet known to (not) exist are checked together.
+        """
+        tablenames = list(dict.fromkeys(tablenames))
+
+        unknown = [t for t in tablenames if t not in self.existing_tables]
+        if unknown:
+            existing = get_existing_tables(conn, unknown)
+            for tablename in unknown:
+                self.existing_tables[tablename] = tablename in existing
+
+        return {t: self.existing_tables[t] for t in tablenames}
+
+    def invalidate(self, tablename: str | None = None) -> None:
+        """Drop `tablename` from the cache, or every table if omitted."""
+        if tablename is None:
+            self.metadata.clear()
+            self.existing_tables.clear()
+            self.normalizers.clear()
+            return
+
+        self.existing_tables.pop(tablename, None)
+        self.normalizers.pop(tablename, None)
+
+        assert self.metadata.tables is not None
+        table = self.metadata.tables.get(tablename)
+        if table is not None:
+            self.metadata.remove(table)
+
+
+def _ddl_tablenames(element: DDLElement) -> list[str]:
+    """Collect the names of the tables affected by a DDL element, where known.
+
+    Handles both SQLAlchemy's DDL (`CreateTable`, `CreateIndex`, etc), which wrap
+    a schema item, and alembic's (`AddColumn`, `RenameTable`, etc), which name the
+    affected table directly.
+    """
+    target = getattr(element, "element", None)
+    if isinstance(target, Table):
+        return [target.fullname]
+
+    table = getattr(target, "table", None)
+    if isinstance(table, Table):
+        return [table.fullname]
+
+    schema = getattr(element, "schema", None)
+    result = []
+    for attr in ("table_name", "new_table_name"):
+        name = getattr(element, attr, None)
+        if isinstance(name, str):
+            result.append(f"{schema}.{name}" if schema else name)
+    return result
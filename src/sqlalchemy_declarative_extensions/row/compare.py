@@ -1,156 +1,698 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Union
-
+import logging
+import time
+from dataclasses import dataclass, replace
+from itertools import chain, groupby
+from typing import Any, Iterable, Iterator, Mapping, Sequence, Union
+
+from sqlalchemy import cast, column
+from sqlalchemy.engine import Dialect
 from sqlalchemy.engine.base import Connection
-from sqlalchemy.sql.expression import and_, not_, null, or_, text
+from sqlalchemy.sql.ddl import sort_tables_and_constraints
+from sqlalchemy.sql.elements import ClauseElement, Null
+from sqlalchemy.sql.expression import and_, null, or_, text
 from sqlalchemy.sql.schema import MetaData, Table
 
-from sqlalchemy_declarative_extensions.dialects import (
-    check_table_exists,
-)
 from sqlalchemy_declarative_extensions.op import MigrateOp
 from sqlalchemy_declarative_extensions.row.base import Row, Rows
-from sqlalchemy_declarative_extensions.sql import match_name, split_schema
-from sqlalchemy_declarative_extensions.sqlalchemy import row_to_dict, select
+from sqlalchemy_declarative_extensions.row.cache import ReflectionCache
+from sqlalchemy_declarative_extensions.row.data import RowDataFile
+from sqlalchemy_declarative_extensions.row.digest import find_unchanged_tables
+from sqlalchemy_declarative_extensions.row.drift import (
+    find_drifted_rows,
+    is_distinct_from,
+    supports_sql_comparison,
+)
+from sqlalchemy_declarative_extensions.row.lookup import chunked, primary_key_filter
+from sqlalchemy_declarative_extensions.row.normalize import compare_row_values
+from sqlalchemy_declarative_extensions.sql import match_name
+from sqlalchemy_declarative_extensions.sqlalchemy import row_to_dict, select, version
+
+logger = logging.getLogger(__name__)
+
+# The number of declared rows whose primary keys are sent to the database per query.
+LOOKUP_CHUNK_SIZE = 1000
+
+# The default number of rows inserted or updated per statement.
+DEFAULT_CHUNK_SIZE = 1000
+
+# Postpones checking (deferrable) constraints until the end of the transaction.
+DEFER_CONSTRAINTS = "SET CONSTRAINTS ALL DEFERRED"
+
+# SQLite limits the number of terms in a compound (i.e. UNION ALL) select.
+SQLITE_MAX_COMPOUND_SELECT = 500
 
 
 @dataclass
 class InsertRowOp(MigrateOp):
     table: str
-    values: dict[str, Any] | list[dict[str, Any]]
+    values: dict[str, Any] | list[dict[str, Any]] | RowDataFile
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+    commit_chunks: bool = False
 
     @classmethod
-    def insert_table_row(cls, operations, table, values):
-        op = cls(table, values)
+    def insert_table_row(
+        cls,
+        operations,
+        table,
+        values,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        commit_chunks=False,
+    ):
+        op = cls(table, values, chunk_size=chunk_size, commit_chunks=commit_chunks)
         return operations.invoke(op)
 
-    def render(self, metadata: MetaData):
+    @property
+    def rows(self) -> list[dict[str, Any]]:
+        assert not isinstance(self.values, RowDataFile)
+        if isinstance(self.values, dict):
+            return [self.values]
+        return self.values
+
+    def render(self, metadata: MetaData, dialect: Dialect | None = None):
         assert metadata.tables is not None
         table = metadata.tables[self.table]
-        return [table.insert().values(self.values)]
+
+        if isinstance(self.values, dict):
+            return [table.insert().values(self.values)]
+
+        return [
+            table.insert().values(chunk)
+            for chunk in chunked(iter_row_values(self.values, table), self.chunk_size)
+        ]
 
     def execute(self, conn: Connection):
+        """Insert the rows in chunks of `chunk_size`.
+
+        Rows are sent with `COPY ... FROM STDIN` when using psycopg (3), and
+        otherwise through `executemany`. Rows which contain SQL expressions fall
+        back to a multi-row `INSERT ... VALUES` statement. With `commit_chunks`,
+        the transaction is committed after each chunk.
+        """
         metadata = get_metadata(conn, self.table)
+        assert metadata.tables is not None
+        table = metadata.tables[self.table]
+
+        rows = iter_row_values(self.values, table)
+        total = len(rows) if isinstance(rows, list) else "?"
+        inserted = 0
+        for chunk in chunked(rows, self.chunk_size):
+            start = time.perf_counter()
+            for (columns, literal), group in groupby(chunk, key=_insert_group):
+                group_rows = list(group)
+                if not literal:
+                    conn.execute(table.insert().values(group_rows))
+                elif conn.dialect.driver == "psycopg":
+                    copy_rows(conn, table, columns, group_rows)
+                else:
+                    conn.execute(
+                        table.insert(),
+                        [_literal_values(row) for row in group_rows],
+                    )
 
-        for query in self.render(metadata):
-            conn.execute(query)
+            if self.commit_chunks:
+                commit_chunk(conn)
+
+            inserted += len(chunk)
+            logger.info(
+                "Inserted %s/%s rows into %s in %.3fs",
+                inserted,
+                total,
+                self.table,
+                time.perf_counter() - start,
+            )
 
     def reverse(self):
-        return DeleteRowOp(self.table, self.values)
+        return DeleteRowOp(
+            self.table,
+            self.values,
+            chunk_size=self.chunk_size,
+            commit_chunks=self.commit_chunks,
+        )
 
     def to_diff_tuple(self) -> tuple[Any, ...]:
         return "insert_table_row", self.table, self.values
 
 
+def iter_row_values(
+    values: dict[str, Any] | list[dict[str, Any]] | RowDataFile, table: Table
+) -> Iterable[dict[str, Any]]:
+    """Produce an op's rows, streaming them from its data file, if it has one."""
+    if isinstance(values, RowDataFile):
+        return values.read(table)
+
+    if isinstance(values, dict):
+        return [values]
+    return values
+
+
+def copy_rows(
+    conn: Connection,
+    table: Table,
+    columns: tuple[str, ...],
+    rows: list[dict[str, Any]],
+):
+    """Insert `rows` with postgresql's `COPY ... FROM STDIN`, through psycopg.
+
+    Values are processed by their column types' bind processors, the same as they
+    would be when bound as parameters to an `INSERT` statement.
+    """
+    preparer = conn.dialect.identifier_preparer
+    processors = [table.c[c].type.bind_processor(conn.dialect) for c in columns]
+
+    statement = "COPY {} ({}) FROM STDIN".format(
+        preparer.format_table(table),
+        ", ".join(preparer.quote(c) for c in columns),
+    )
+
+    cursor = conn.connection.cursor()
+    try:
+        with cursor.copy(statement) as copy:  # type: ignore
+            for row in rows:
+                values = _literal_values(row)
+                copy.write_row(
+                    [
+                        processor(values[c]) if processor else values[c]
+                        for c, processor in zip(columns, processors)
+                    ]
+                )
+    finally:
+        cursor.close()
+
+
+def _insert_group(row: dict[str, Any]) -> tuple[tuple[str, ...], bool]:
+    """Group rows which can be inserted together.
+
+    Rows can only be batched together if they include the same set of columns, and
+    are only directly insertable (i.e. through `executemany` or `COPY`) when they
+    do not contain SQL expressions.
+    """
+    return tuple(row), _is_literal(row)
+
+
+def _is_literal(row: dict[str, Any]) -> bool:
+    return not any(
+        isinstance(v, ClauseElement) and not isinstance(v, Null) for v in row.values()
+    )
+
+
+def _literal_values(row: dict[str, Any]) -> dict[str, Any]:
+    return {c: None if isinstance(v, Null) else v for c, v in row.items()}
+
+
 @dataclass
 class UpdateRowOp(MigrateOp):
     table: str
-    from_values: dict[str, Any] | list[dict[str, Any]]
-    to_values: dict[str, Any] | list[dict[str, Any]]
+    from_values: dict[str, Any] | list[dict[str, Any]] | RowDataFile
+    to_values: dict[str, Any] | list[dict[str, Any]] | RowDataFile
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+    commit_chunks: bool = False
 
     @classmethod
-    def update_table_row(cls, operations, table, from_values, to_values):
-        op = cls(table, from_values, to_values)
+    def update_table_row(
+        cls,
+        operations,
+        table,
+        from_values,
+        to_values,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        commit_chunks=False,
+    ):
+        op = cls(
+            table,
+            from_values,
+            to_values,
+            chunk_size=chunk_size,
+            commit_chunks=commit_chunks,
+        )
         return operations.invoke(op)
 
-    def render(self, metadata: MetaData):
+    def render(self, metadata: MetaData, dialect: Dialect | None = None):
+        """Render the update statements.
+
+        When a `dialect` is given which supports it, rows which update the same set
+        of columns are updated together, in chunks of `chunk_size`, by joining
+        against the set of new values (i.e. `UPDATE ... FROM (VALUES ...)`).
+        Otherwise, one `UPDATE` statement is produced per row.
+        """
         assert metadata.tables is not None
         table = metadata.tables[self.table]
 
         primary_key_columns = [c.name for c in table.primary_key.columns]
 
-        if isinstance(self.to_values, dict):
-            to_values: list[dict[str, Any]] = [self.to_values]
-        else:
-            to_values = self.to_values
+        to_values = iter_row_values(self.to_values, table)
+
+        batched = dialect is not None and supports_batched_update(dialect)
+        chunk_size = self.chunk_size
+        if dialect is not None and "sqlite" in dialect.name:
+            chunk_size = min(chunk_size, SQLITE_MAX_COMPOUND_SELECT)
 
         result = []
+        rows_by_columns: dict[tuple[str, ...], list[dict[str, Any]]] = {}
         for to_value in to_values:
-            where = [
-                table.c[c] == v for c, v in to_value.items() if c in primary_key_columns
-            ]
-            values = {c: v for c, v in to_value.items() if c not in primary_key_columns}
-            query = table.update().where(*where).values(**values)
-            result.append(query)
+            columns = tuple(c for c in to_value if c not in primary_key_columns)
+            if (
+                batched
+                and primary_key_columns
+                and columns
+                and set(primary_key_columns) <= to_value.keys()
+                and _is_literal(to_value)
+            ):
+                rows_by_columns.setdefault(columns, []).append(to_value)
+            else:
+                result.append(
+                    _update_row(table, primary_key_columns, columns, to_value)
+                )
+
+        for columns, rows in rows_by_columns.items():
+            for chunk in chunked(rows, chunk_size):
+                if len(chunk) == 1:
+                    query = _update_row(table, primary_key_columns, columns, chunk[0])
+                else:
+                    assert dialect
+                    query = _update_rows(
+                        dialect, table, primary_key_columns, columns, chunk
+                    )
+                result.append(query)
         return result
 
     def execute(self, conn: Connection):
+        """Update the rows in chunks of `chunk_size`.
+
+        Data files are streamed, rather than read all at once. With
+        `commit_chunks`, the transaction is committed after each chunk.
+        """
         metadata = get_metadata(conn, self.table)
+        assert metadata.tables is not None
+        table = metadata.tables[self.table]
 
-        for query in self.render(metadata):
-            conn.execute(query)
+        rows = iter_row_values(self.to_values, table)
+        total = len(rows) if isinstance(rows, list) else "?"
+        updated = 0
+        for chunk in chunked(rows, self.chunk_size):
+            start = time.perf_counter()
+            op = replace(self, from_values=[], to_values=chunk)
+            for query in op.render(metadata, dialect=conn.dialect):
+                conn.execute(query)
+            if self.commit_chunks:
+                commit_chunk(conn)
+
+            updated += len(chunk)
+            logger.info(
+                "Updated %s/%s rows of %s in %.3fs",
+                updated,
+                total,
+                self.table,
+                time.perf_counter() - start,
+            )
 
     def reverse(self):
-        return UpdateRowOp(self.table, self.to_values, self.from_values)
+        return UpdateRowOp(
+            self.table,
+            self.to_values,
+            self.from_values,
+            chunk_size=self.chunk_size,
+            commit_chunks=self.commit_chunks,
+        )
 
     def to_diff_tuple(self) -> tuple[Any, ...]:
         return "update_table_row", self.table, self.to_values, self.from_values
 
 
+def supports_batched_update(dialect: Dialect) -> bool:
+    if version.startswith("1.3"):
+        return False
+
+    if "sqlite" in dialect.name:
+        # UPDATE ... FROM was added in SQLite 3.33.
+        return (dialect.server_version_info or (0,)) >= (3, 33)
+
+    return dialect.name in {"postgresql", "mysql"}
+
+
+def _update_row(
+    table: Table,
+    primary_key_columns: list[str],
+    columns: tuple[str, ...],
+    row: dict[str, Any],
+):
+    where = [table.c[c] == row[c] for c in primary_key_columns if c in row]
+    return table.update().where(*where).values(**{c: row[c] for c in columns})
+
+
+def _update_rows(
+    dialect: Dialect,
+    table: Table,
+    primary_key_columns: list[str],
+    columns: tuple[str, ...],
+    rows: list[dict[str, Any]],
+):
+    """Update `rows` in one statement, by joining against their new values.
+
+    On postgresql the new values are a `VALUES` list. Elsewhere, they're produced
+    by a `UNION ALL` of selects, with which MySQL produces a multi-table
+    `UPDATE t, (...) v` and SQLite an `UPDATE ... FROM`.
+    """
+    from sqlalchemy import literal, union_all, values
+
+    names = [*primary_key_columns, *columns]
+    data = [tuple(_literal_values(row)[c] for c in names) for row in rows]
+
+    if dialect.name == "postgresql":
+        # The columns are typed, such that values go through their type's bind (or
+        # literal) processing, e.g. serializing JSON.
+        new_values: Any = values(
+            *[column(c, table.c[c].type) for c in names], name="v"
+        ).data(data)
+        source = {c: cast(new_values.c[c], table.c[c].type) for c in names}
+    else:
+        new_values = union_all(
+            *[
+                select(
+                    *[
+                        literal(value, table.c[c].type).label(c)
+                        for c, value in zip(names, row)
+                    ]
+                )
+                for row in data
+            ]
+        ).subquery("v")
+        source = {c: new_values.c[c] for c in names}
+
+    return (
+        table.update()
+        .where(*[table.c[c] == source[c] for c in primary_key_columns])
+        .values({c: source[c] for c in columns})
+    )
+
+
 @dataclass
 class DeleteRowOp(MigrateOp):
     table: str
-    values: dict[str, Any] | list[dict[str, Any]]
+    values: dict[str, Any] | list[dict[str, Any]] | RowDataFile
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+    commit_chunks: bool = False
 
     @classmethod
-    def delete_table_row(cls, operations, table, values):
-        op = cls(table, values)
+    def delete_table_row(
+        cls,
+        operations,
+        table,
+        values,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        commit_chunks=False,
+    ):
+        op = cls(table, values, chunk_size=chunk_size, commit_chunks=commit_chunks)
         return operations.invoke(op)
 
-    def render(self, metadata: MetaData):
+    @property
+    def rows(self) -> list[dict[str, Any]]:
+        assert not isinstance(self.values, RowDataFile)
+        if isinstance(self.values, dict):
+            return [self.values]
+        return self.values
+
+    def render(self, metadata: MetaData, dialect: Dialect | None = None):
+        """Render one `DELETE` per chunk of `chunk_size` rows, in primary key order.
+
+        Each chunk's rows are matched with `(pk) IN (...)`, rather than one
+        (growing) predicate per row, such that no single statement holds its locks
+        for too long. The rows of data files are streamed, in the order written.
+        """
         assert metadata.tables is not None
         table = metadata.tables[self.table]
 
-        if isinstance(self.values, dict):
-            rows_values: list[dict[str, Any]] = [self.values]
-        else:
-            rows_values = self.values
+        return [
+            table.delete().where(_delete_filter(None, table, chunk))
+            for chunk in chunked(self._ordered_rows(table), self.chunk_size)
+        ]
 
-        primary_key_columns = {c.name for c in table.primary_key.columns}
+    def execute(self, conn: Connection):
+        """Delete the rows in chunks of `chunk_size`, in primary key order.
 
-        where = or_(
-            *[
-                and_(
-                    *[
-                        table.c[c] == v
-                        for c, v in row_values.items()
-                        if c in primary_key_columns
-                    ]
-                )
-                for row_values in rows_values
-            ]
+        Where supported, each chunk's primary keys are joined against as a staged
+        set (see `primary_key_filter`). With `commit_chunks`, the transaction is
+        committed after each chunk.
+        """
+        metadata = get_metadata(conn, self.table)
+        assert metadata.tables is not None
+        table = metadata.tables[self.table]
+
+        rows = self._ordered_rows(table)
+        total = len(rows) if isinstance(rows, list) else "?"
+        deleted = 0
+        for chunk in chunked(rows, self.chunk_size):
+            start = time.perf_counter()
+            conn.execute(table.delete().where(_delete_filter(conn, table, chunk)))
+            if self.commit_chunks:
+                commit_chunk(conn)
+
+            deleted += len(chunk)
+            logger.info(
+                "Deleted %s/%s rows from %s in %.3fs",
+                deleted,
+                total,
+                self.table,
+                time.perf_counter() - start,
+            )
+
+    def _ordered_rows(self, table: Table) -> Iterable[dict[str, Any]]:
+        # Data files are streamed rather than read into memory to be sorted.
+        if isinstance(self.values, RowDataFile):
+            return self.values.read(table)
+
+        primary_key_columns = [c.name for c in table.primary_key.columns]
+        try:
+            return sorted(
+                self.rows, key=lambda row: [row.get(c) for c in primary_key_columns]
+            )
+        except TypeError:
+            # Mixed, or otherwise unorderable, values are deleted as declared.
+            return self.rows
+
+    def reverse(self):
+        return InsertRowOp(
+            self.table,
+            self.values,
+            chunk_size=self.chunk_size,
+            commit_chunks=self.commit_chunks,
         )
-        return [table.delete().where(where)]
+
+    def to_diff_tuple(self) -> tuple[Any, ...]:
+        return "delete_table_row", self.table, self.values
+
+
+def _delete_filter(
+    connection: Connection | None, table: Table, rows: list[dict[str, Any]]
+):
+    """Match the records of `table` having the primary keys of `rows`."""
+    primary_key_columns = [c.name for c in table.primary_key.columns]
+    if primary_key_columns and all(
+        set(primary_key_columns) <= row.keys() for row in rows
+    ):
+        pks = [tuple(row[c] for c in primary_key_columns) for row in rows]
+        return primary_key_filter(connection, table, pks)
+
+    # Rows which are missing (part of) their primary key are matched by whichever
+    # primary key columns they do include.
+    return or_(
+        *[
+            and_(*[table.c[c] == v for c, v in row.items() if c in primary_key_columns])
+            for row in rows
+        ]
+    )
+
+
+def commit_chunk(conn: Connection):
+    """Commit the connection's transaction, between the chunks of a row op.
+
+    Note this ends any surrounding transaction. In alembic, ops using it should be
+    run inside of `op.get_context().autocommit_block()`.
+    """
+    if not conn.in_transaction():
+        return
+
+    commit = getattr(conn, "commit", None)
+    if commit is None:
+        raise NotImplementedError(
+            "Committing between chunks requires a connection which supports `commit()`"
+        )
+    commit()
+
+
+@dataclass
+class UpsertRowOp(MigrateOp):
+    table: str
+    values: dict[str, Any] | list[dict[str, Any]]
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+    commit_chunks: bool = False
+
+    @classmethod
+    def upsert_table_row(
+        cls,
+        operations,
+        table,
+        values,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        commit_chunks=False,
+    ):
+        op = cls(table, values, chunk_size=chunk_size, commit_chunks=commit_chunks)
+        return operations.invoke(op)
+
+    @property
+    def rows(self) -> list[dict[str, Any]]:
+        if isinstance(self.values, dict):
+            return [self.values]
+        return self.values
+
+    def render(self, metadata: MetaData, dialect: Dialect | None = None):
+        """Render one idempotent `INSERT` per chunk (and set of columns) of rows.
+
+        That is, `INSERT ... ON CONFLICT DO UPDATE` on postgresql and sqlite, which
+        only updates rows whose values are distinct from the existing ones; and
+        `INSERT ... ON DUPLICATE KEY UPDATE` on mysql.
+        """
+        table = self._get_table(metadata, dialect)
+        assert dialect
+
+        result = []
+        for chunk in chunked(self.rows, self.chunk_size):
+            for columns, group in _upsert_groups(chunk):
+                statement = _upsert_statement(dialect, table, columns)
+                result.append(statement.values(group))
+        return result
 
     def execute(self, conn: Connection):
+        """Upsert the rows in chunks of `chunk_size`.
+
+        Rows are sent through `executemany` (which SQLAlchemy batches into
+        multi-row statements where supported), except for rows which contain SQL
+        expressions, which are rendered into the statement itself. With
+        `commit_chunks`, the transaction is committed after each chunk.
+        """
         metadata = get_metadata(conn, self.table)
+        table = self._get_table(metadata, conn.dialect)
+
+        rows = self.rows
+        total = len(rows)
+        upserted = 0
+        for chunk in chunked(rows, self.chunk_size):
+            start = time.perf_counter()
+            for columns, group in _upsert_groups(chunk):
+                statement = _upsert_statement(conn.dialect, table, columns)
+
+                literal_rows = [row for row in group if _is_literal(row)]
+                if literal_rows:
+                    conn.execute(
+                        statement, [_literal_values(row) for row in literal_rows]
+                    )
+
+                expression_rows = [row for row in group if not _is_literal(row)]
+                if expression_rows:
+                    conn.execute(statement.values(expression_rows))
+
+            if self.commit_chunks:
+                commit_chunk(conn)
+
+            upserted += len(chunk)
+            logger.info(
+                "Upserted %s/%s rows into %s in %.3fs",
+                upserted,
+                total,
+                self.table,
+                time.perf_counter() - start,
+            )
+
+    def _get_table(self, metadata: MetaData, dialect: Dialect | None) -> Table:
+        if dialect is None or not supports_upsert(dialect):
+            raise NotImplementedError(
+                f"Upserting rows is not supported by this dialect: {dialect and dialect.name}"
+            )
 
-        for query in self.render(metadata):
-            conn.execute(query)
+        assert metadata.tables is not None
+        return metadata.tables[self.table]
 
     def reverse(self):
-        return InsertRowOp(self.table, self.values)
+        # Upserted rows may have been inserted or updated, and the prior state of
+        # the updated ones is unknown, so there is nothing to safely reverse to.
+        raise NotImplementedError(
+            f"Upserted rows of {self.table} cannot be reversed, because their prior "
+            "state is unknown"
+        )
 
     def to_diff_tuple(self) -> tuple[Any, ...]:
-        return "delete_table_row", self.table, self.values
+        return "upsert_table_row", self.table, self.values
 
 
-def get_metadata(conn: Connection, tablename: str):
-    m = MetaData()
+def supports_upsert(dialect: Dialect) -> bool:
+    if "sqlite" in dialect.name:
+        # The sqlite dialect's `on_conflict_do_update` was added in SQLAlchemy 1.4,
+        # and `ON CONFLICT` in SQLite 3.24.
+        return not version.startswith("1.3") and (
+            dialect.server_version_info or (0,)
+        ) >= (3, 24)
 
-    try:
-        schema, table = tablename.split(".", 1)
-    except ValueError:
-        table = tablename
-        schema = None
+    return dialect.name in {"postgresql", "mysql", "mariadb"}
+
+
+def _upsert_groups(rows: list[dict[str, Any]]):
+    # Rows can only be written by the same statement if they include the same columns.
+    rows_by_columns: dict[tuple[str, ...], list[dict[str, Any]]] = {}
+    for row in rows:
+        rows_by_columns.setdefault(tuple(sorted(row)), []).append(row)
+    return rows_by_columns.items()
 
-    m.reflect(conn, schema=schema, only=[table])
-    return m
 
+def _upsert_statement(dialect: Dialect, table: Table, columns: tuple[str, ...]):
+    primary_key_columns = [c.name for c in table.primary_key.columns]
+    update_columns = [c for c in columns if c not in primary_key_columns]
 
-RowOp = Union[InsertRowOp, UpdateRowOp, DeleteRowOp]
+    if dialect.name in {"mysql", "mariadb"}:
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+        statement: Any = mysql_insert(table)
+
+        # MySQL has no "do nothing", so unchanged rows "update" their primary key.
+        update_columns = update_columns or primary_key_columns[:1]
+        return statement.on_duplicate_key_update(
+            {c: statement.inserted[c] for c in update_columns}
+        )
+
+    if dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+
+        statement = postgresql_insert(table)
+    else:
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+        statement = sqlite_insert(table)
+
+    if not update_columns:
+        return statement.on_conflict_do_nothing(index_elements=primary_key_columns)
+
+    excluded = statement.excluded
+    if dialect.name == "postgresql":
+        changed = [
+            is_distinct_from(table, table.c[c], excluded[c]) for c in update_columns
+        ]
+    else:
+        changed = [table.c[c].is_distinct_from(excluded[c]) for c in update_columns]
+
+    return statement.on_conflict_do_update(
+        index_elements=primary_key_columns,
+        set_={c: excluded[c] for c in update_columns},
+        where=or_(*changed),
+    )
+
+
+def get_metadata(conn: Connection, tablename: str):
+    cache = ReflectionCache.for_connection(conn)
+    cache.get_table(conn, tablename)
+    return cache.metadata
+
+
+RowOp = Union[InsertRowOp, UpdateRowOp, DeleteRowOp, UpsertRowOp]
 
 
 def compare_rows(
@@ -158,6 +700,16 @@ def compare_rows(
     metadata: MetaData,
     rows: Rows,
     row_filter: list[str] | None = None,
+) -> list[RowOp]:
+    with ReflectionCache.scope(connection):
+        return _compare_rows(connection, metadata, rows, row_filter)
+
+
+def _compare_rows(
+    connection: Connection,
+    metadata: MetaData,
+    rows: Rows,
+    row_filter: list[str] | None = None,
 ) -> list[RowOp]:
     assert metadata.tables is not None
 
@@ -165,125 +717,194 @@ def compare_rows(
 
     existing_tables = resolve_existing_tables(connection, rows)
 
-    # Collects table-specific primary keys so that we can efficiently compare rows
-    # further down by the pk
-    pk_to_row: dict[str, dict[tuple[Any, ...], Row]] = {}
+    reflection_cache = ReflectionCache.for_connection(connection)
 
-    # Collects the ongoing filter required to select all referenced records (by their pk)
-    filters_by_table: dict[Table, list] = {}
-    for row in rows:
-        if not match_name(row.qualified_name, row_filter):
-            continue
+    # Collects the primary keys of all referenced records, by table.
+    pks_by_table: dict[Table, dict[tuple[Any, ...], None]] = {}
 
-        table = metadata.tables.get(row.qualified_name)
-        if table is None:
-            raise ValueError(f"Unknown table: {row.qualified_name}")
+    # Collects the full set of declared columns by table, so that all inserted rows
+    # can be given the same set of columns.
+    columns_by_table: dict[str, dict[str, None]] = {}
 
-        primary_key_columns = [c.name for c in table.primary_key.columns]
+    # Collects the primary keys of the declared records of tables without a primary
+    # key (which are not otherwise tracked), by table.
+    pkless_pks_by_table: dict[Table, dict[tuple[Any, ...], None]] = {}
 
-        if set(primary_key_columns) - row.column_values.keys():
-            raise ValueError(
-                f"Row is missing primary key values required to declaratively specify: {row}"
-            )
-
-        table = metadata.tables.get(row.qualified_name)
-        if table is None:
-            continue
-
-        pk = tuple([row.column_values[c.name] for c in table.primary_key.columns])
-        pk_to_row.setdefault(table.fullname, {})[pk] = row
-
-        if table.primary_key.columns:
-            filters_by_table.setdefault(table, []).append(
-                and_(
-                    *[c == row.column_values[c.name] for c in table.primary_key.columns]
-                )
-            )
-
-    existing_rows_by_table = collect_existing_record_data(
-        connection, filters_by_table, existing_tables
-    )
-
-    existing_metadata = MetaData()
-    assert existing_metadata.tables is not None
-
-    table_row_inserts: dict[Table, list[dict[str, Any]]] = {}
+    # Inserts and updates are kept by primary key, so that a row redeclared in a
+    # later chunk can replace the result of its earlier comparison.
+    table_row_inserts: dict[Table, dict[tuple[Any, ...], dict[str, Any]]] = {}
     table_row_updates: dict[
-        Table, tuple[list[dict[str, Any]], list[dict[str, Any]]]
+        Table, dict[tuple[Any, ...], tuple[dict[str, Any], dict[str, Any]]]
     ] = {}
-    for tablename, pks in pk_to_row.items():
-        dest_table = metadata.tables[tablename]
 
-        row_inserts = table_row_inserts.setdefault(dest_table, [])
+    # Counts the rows, by table, whose values differ from their existing records
+    # only in representation (e.g. `Decimal` vs `float`), which are not updated.
+    equivalent_rows: dict[str, int] = {}
+
+    # Rows are compared in chunks, so that (potentially lazily read) rows need not
+    # all be held in memory at once.
+    for chunk in chunked(rows, LOOKUP_CHUNK_SIZE):
+        # Collects table-specific primary keys so that we can efficiently compare
+        # rows further down by the pk
+        pk_to_row: dict[str, dict[tuple[Any, ...], Row]] = {}
 
-        existing_rows = existing_rows_by_table.get(tablename, {})
+        for row in chunk:
+            if not match_name(row.qualified_name, row_filter):
+                continue
 
-        stub_keys = {
-            key: None for row in pks.values() for key in row.column_values.keys()
-        }
+            table = metadata.tables.get(row.qualified_name)
+            if table is None:
+                raise ValueError(f"Unknown table: {row.qualified_name}")
 
-        for pk, row in pks.items():
-            if pk in existing_rows:
-                if row.qualified_name not in existing_metadata.tables:
-                    existing_metadata.reflect(
-                        bind=connection, schema=row.schema, only=[row.tablename]
-                    )
-                current_table: Table = existing_metadata.tables[tablename]
+            primary_key_columns = [c.name for c in table.primary_key.columns]
 
-                existing_row = existing_rows[pk]
-                row_keys = row.column_values.keys()
-                record_dict = {k: v for k, v in existing_row.items() if k in row_keys}
+            if set(primary_key_columns) - row.column_values.keys():
+                raise ValueError(
+                    f"Row is missing primary key values required to declaratively specify: {row}"
+                )
 
-                column_values = filter_column_data(current_table, row.column_values)
-                if column_values == record_dict:
-                    continue
+            pk = _row_pk(table, row.column_values)
 
-                row_updates = table_row_updates.setdefault(current_table, ([], []))
-                row_updates[0].append(record_dict)
-                row_updates[1].append(column_values)
+            if table.primary_key.columns:
+                declared_pks = pks_by_table.setdefault(table, {})
             else:
-                insert_values = {**stub_keys, **row.column_values}
-                row_inserts.append(filter_column_data(dest_table, insert_values))
-
-    # Deletes should get inserted first, so as to avoid foreign key constraint errors.
-    if not rows.ignore_unspecified:
-        for table_name in rows.included_tables:
-            if not match_name(table_name, row_filter):
-                continue
+                declared_pks = pkless_pks_by_table.setdefault(table, {})
+
+            # The last declaration of a given primary key wins. Within a chunk, it
+            # simply replaces the earlier one, whereas the result of comparing a row
+            # declared in an earlier chunk must be discarded.
+            table_rows = pk_to_row.setdefault(table.fullname, {})
+            if pk in declared_pks and pk not in table_rows:
+                table_row_inserts.get(table, {}).pop(pk, None)
+                table_row_updates.get(table, {}).pop(pk, None)
+            declared_pks[pk] = None
+
+            table_rows[pk] = row
+
+            table_columns = columns_by_table.setdefault(table.fullname, {})
+            table_columns.update(dict.fromkeys(row.column_values))
+
+        # Tables compared on the server only return their missing or drifted rows
+        # (and so have no need of a digest, either).
+        sql_compared_tables = set()
+        if rows.comparison == "sql" and supports_sql_comparison(connection):
+            sql_compared_tables = {
+                tablename
+                for tablename in pk_to_row
+                if existing_tables[tablename]
+                and metadata.tables[tablename].primary_key.columns
+            }
+
+        # Tables whose declared rows are already known to exist unchanged need not
+        # have their records fetched or compared.
+        unchanged_tables = find_unchanged_tables(
+            connection,
+            {
+                tablename: table_rows
+                for tablename, table_rows in pk_to_row.items()
+                if tablename not in sql_compared_tables
+            },
+            existing_tables,
+            chunk_size=LOOKUP_CHUNK_SIZE,
+        )
 
-            table = metadata.tables[table_name]
-            filters_by_table.setdefault(table, [])
+        existing_rows_by_table = collect_existing_record_data(
+            connection,
+            {
+                metadata.tables[tablename]: list(pks)
+                for tablename, pks in pk_to_row.items()
+                if tablename not in unchanged_tables
+                and tablename not in sql_compared_tables
+                and metadata.tables[tablename].primary_key.columns
+            },
+            existing_tables,
+            chunk_size=LOOKUP_CHUNK_SIZE,
+        )
 
-        for table, filter in filters_by_table.items():
-            table_exists = existing_tables[table.fullname]
-            if not table_exists:
+        for tablename, pks in pk_to_row.items():
+            if tablename in unchanged_tables:
                 continue
 
-            statement = select(*table.primary_key)
-            if filter:
-                statement = statement.where(not_(or_(*filter)))
-
-            to_delete = connection.execute(statement).fetchall()
+            dest_table = metadata.tables[tablename]
+            row_inserts = table_row_inserts.setdefault(dest_table, {})
+            row_updates = table_row_updates.setdefault(dest_table, {})
+
+            if tablename in sql_compared_tables:
+                current_table = reflection_cache.get_table(connection, tablename)
+                drift = find_drifted_rows(
+                    connection,
+                    current_table,
+                    list(pks.values()),
+                    chunk_size=LOOKUP_CHUNK_SIZE,
+                )
 
-            if not to_delete:
+                for row in drift.missing:
+                    row_inserts[_row_pk(dest_table, row.column_values)] = (
+                        row.column_values
+                    )
+                for from_values, to_values in zip(drift.from_values, drift.to_values):
+                    row_updates[_row_pk(dest_table, to_values)] = (
+                        from_values,
+                        filter_column_data(current_table, to_values),
+                    )
                 continue
 
-            result.append(
-                DeleteRowOp(
-                    table.fullname, [row_to_dict(record) for record in to_delete]
-                )
-            )
+            existing_rows = existing_rows_by_table.get(tablename, {})
+
+            for pk, row in pks.items():
+                if pk in existing_rows:
+                    current_table = reflection_cache.get_table(connection, tablename)
+
+                    existing_row = existing_rows[pk]
+                    row_keys = row.column_values.keys()
+                    record_dict = {
+                        k: v for k, v in existing_row.items() if k in row_keys
+                    }
+
+                    column_values = filter_column_data(current_table, row.column_values)
+                    equivalent, normalized = compare_row_values(
+                        reflection_cache.get_normalizers(
+                            connection, tablename, dest_table
+                        ),
+                        column_values,
+                        record_dict,
+                    )
+                    if equivalent:
+                        if normalized:
+                            equivalent_rows[tablename] = (
+                                equivalent_rows.get(tablename, 0) + 1
+                            )
+                        continue
+
+                    row_updates[pk] = (record_dict, column_values)
+                else:
+                    row_inserts[pk] = row.column_values
+
+    for tablename, count in equivalent_rows.items():
+        logger.info(
+            "Skipped %s rows of %s as equivalent to their existing records",
+            count,
+            tablename,
+        )
+
+    # Deletes should get inserted first, so as to avoid foreign key constraint errors.
+    # (See `sort_row_ops`, for the order of ops across tables).
+    result.extend(
+        compare_unspecified_rows(
+            connection, metadata, rows, pks_by_table, existing_tables, row_filter
+        )
+    )
 
     for table, row_updates in table_row_updates.items():
-        old_rows, new_rows = row_updates
-        if not new_rows:
+        if not row_updates:
             continue
 
         result.append(
             UpdateRowOp(
                 table.fullname,
-                from_values=old_rows,
-                to_values=new_rows,
+                from_values=[old for old, _ in row_updates.values()],
+                to_values=[new for _, new in row_updates.values()],
+                chunk_size=rows.chunk_size,
             )
         )
 
@@ -291,63 +912,258 @@ def compare_rows(
         if not row_inserts:
             continue
 
-        result.append(InsertRowOp(table.fullname, values=row_inserts))
+        stub_keys = dict.fromkeys(columns_by_table[table.fullname])
+        insert_values = [
+            filter_column_data(table, {**stub_keys, **column_values})
+            for column_values in row_inserts.values()
+        ]
+        result.append(
+            InsertRowOp(
+                table.fullname, values=insert_values, chunk_size=rows.chunk_size
+            )
+        )
+
+    return sort_row_ops(metadata, result)
 
-    return result
 
+def _row_pk(table: Table, column_values: Mapping[str, Any]) -> tuple[Any, ...]:
+    return tuple([column_values[c.name] for c in table.primary_key.columns])
 
-def resolve_existing_tables(connection: Connection, rows: Rows) -> dict[str, bool]:
-    """Collect a map of referenced tables, to whether or not they exist."""
-    result = {}
+
+def upsert_rows(
+    connection: Connection,
+    metadata: MetaData,
+    rows: Rows,
+    row_filter: list[str] | None = None,
+) -> list[RowOp]:
+    """Produce idempotent upserts of the declared rows, rather than comparing them.
+
+    The declared rows are not compared against the existing ones, instead being
+    written (in chunks of `Rows.chunk_size`) such that existing rows are updated
+    and missing ones inserted. Unless `Rows.ignore_unspecified`, unspecified rows
+    are still looked up, to be deleted.
+    """
+    assert metadata.tables is not None
+
+    result: list[RowOp] = []
+
+    pks_by_table: dict[Table, dict[tuple[Any, ...], None]] = {}
+    values_by_table: dict[Table, dict[tuple[Any, ...], dict[str, Any]]] = {}
     for row in rows:
-        if row.qualified_name in result:
+        if not match_name(row.qualified_name, row_filter):
             continue
 
-        table_exists = check_table_exists(
-            connection,
-            row.tablename,
-            schema=row.schema,
+        table = metadata.tables.get(row.qualified_name)
+        if table is None:
+            raise ValueError(f"Unknown table: {row.qualified_name}")
+
+        primary_key_columns = [c.name for c in table.primary_key.columns]
+        if not primary_key_columns:
+            raise ValueError(
+                f"Upserting rows requires a primary key, which is missing on: {table.fullname}"
+            )
+
+        if set(primary_key_columns) - row.column_values.keys():
+            raise ValueError(
+                f"Row is missing primary key values required to declaratively specify: {row}"
+            )
+
+        pk = tuple([row.column_values[c] for c in primary_key_columns])
+        pks_by_table.setdefault(table, {})[pk] = None
+
+        # A row may only be upserted once per statement, so the last declaration wins.
+        table_values = values_by_table.setdefault(table, {})
+        table_values[pk] = filter_column_data(table, row.column_values)
+
+    if not rows.ignore_unspecified:
+        with ReflectionCache.scope(connection):
+            existing_tables = resolve_existing_tables(connection, rows)
+            result.extend(
+                compare_unspecified_rows(
+                    connection,
+                    metadata,
+                    rows,
+                    pks_by_table,
+                    existing_tables,
+                    row_filter,
+                )
+            )
+
+    for table, table_values in values_by_table.items():
+        result.append(
+            UpsertRowOp(
+                table.fullname,
+                values=list(table_values.values()),
+                chunk_size=rows.chunk_size,
+            )
         )
-        result[row.qualified_name] = table_exists
 
-    for fq_tablename in rows.included_tables:
-        schema, tablename = split_schema(fq_tablename)
-        result[fq_tablename] = check_table_exists(
-            connection,
-            tablename,
-            schema=schema,
+    return sort_row_ops(metadata, result)
+
+
+def should_defer_constraints(dialect: Dialect, rows: Rows) -> bool:
+    """Whether `DEFER_CONSTRAINTS` should precede the application of `rows`."""
+    return rows.defer_constraints and dialect.name == "postgresql"
+
+
+def sort_row_ops(metadata: MetaData, ops: list[RowOp]) -> list[RowOp]:
+    """Order `ops` by the foreign key dependencies between their tables.
+
+    Deletes come first, in reverse dependency order (i.e. the rows of referencing
+    tables are deleted before those of the tables they reference). All other ops
+    follow, in dependency order (i.e. referenced tables are written first). Ops
+    against the same table retain their relative order.
+
+    Only the tables of `ops` are sorted, so foreign key cycles among unrelated
+    tables are irrelevant. Cycles among the tables of `ops` are left in an arbitrary
+    order (see `Rows.defer_constraints`).
+    """
+    assert metadata.tables is not None
+
+    tables = dict.fromkeys(metadata.tables.get(op.table) for op in ops)
+    sorted_tables = sort_tables_and_constraints([t for t in tables if t is not None])
+    order = {
+        table.fullname: index
+        for index, (table, _) in enumerate(sorted_tables)
+        if table is not None
+    }
+    unknown = len(order)
+
+    deletes = [op for op in ops if isinstance(op, DeleteRowOp)]
+    writes = [op for op in ops if not isinstance(op, DeleteRowOp)]
+    return [
+        *sorted(deletes, key=lambda op: -order.get(op.table, unknown)),
+        *sorted(writes, key=lambda op: order.get(op.table, unknown)),
+    ]
+
+
+def compare_unspecified_rows(
+    connection: Connection,
+    metadata: MetaData,
+    rows: Rows,
+    pks_by_table: dict[Table, dict[tuple[Any, ...], None]],
+    existing_tables: dict[str, bool],
+    row_filter: list[str] | None = None,
+) -> list[RowOp]:
+    """Produce the deletes of existing rows which were not declared."""
+    assert metadata.tables is not None
+
+    result: list[RowOp] = []
+    if rows.ignore_unspecified:
+        return result
+
+    for table_name in rows.included_tables:
+        if not match_name(table_name, row_filter):
+            continue
+
+        table = metadata.tables[table_name]
+        pks_by_table.setdefault(table, {})
+
+    for table, table_pks in pks_by_table.items():
+        table_exists = existing_tables[table.fullname]
+        if not table_exists:
+            continue
+
+        chunks = collect_unspecified_record_data(
+            connection, table, list(table_pks), chunk_size=LOOKUP_CHUNK_SIZE
+        )
+        first_chunk = next(chunks, None)
+        if not first_chunk:
+            continue
+
+        # Beyond a single chunk, the rows are streamed into a (temporary) data file
+        # rather than held in memory, however many there are.
+        to_delete: list[dict[str, Any]] | RowDataFile = first_chunk
+        second_chunk = next(chunks, None)
+        if second_chunk:
+            to_delete = RowDataFile.temporary(
+                chain(first_chunk, second_chunk, chain.from_iterable(chunks))
+            )
+
+        result.append(
+            DeleteRowOp(table.fullname, to_delete, chunk_size=rows.chunk_size)
         )
 
     return result
 
 
+def resolve_existing_tables(connection: Connection, rows: Rows) -> dict[str, bool]:
+    """Collect a map of referenced tables, to whether or not they exist.
+
+    All referenced tables are checked together (rather than one at a time), and the
+    result is shared through the active `ReflectionCache.scope`, if any.
+    """
+    reflection_cache = ReflectionCache.for_connection(connection)
+    return reflection_cache.tables_exist(
+        connection, [*rows.tablenames, *rows.included_tables]
+    )
+
+
 def collect_existing_record_data(
     connection: Connection,
-    filters_by_table,
+    pks_by_table: dict[Table, list[tuple[Any, ...]]],
     existing_tables: dict[str, bool],
+    chunk_size: int = LOOKUP_CHUNK_SIZE,
 ) -> dict[str, dict[tuple[Any, ...], dict[str, Any]]]:
+    """Collect the existing records for the given primary keys, by table and pk.
+
+    Primary keys are sent to the database in chunks of `chunk_size`, to bound the
+    size of any individual query (and its parameter count).
+    """
     result: dict[str, dict[tuple[Any, ...], dict[str, Any]]] = {}
-    for table, filters in filters_by_table.items():
+    for table, pks in pks_by_table.items():
+        existing_rows = result.setdefault(table.fullname, {})
+
         table_exists = existing_tables[table.fullname]
         if not table_exists:
-            result[table.fullname] = {}
             continue
 
         primary_key_columns = [c.name for c in table.primary_key.columns]
 
-        query = select(text("*")).select_from(table).where(or_(*filters))
-        records = connection.execute(query)
-        assert records
+        for chunk in chunked(pks, chunk_size):
+            query = (
+                select(text("*"))
+                .select_from(table)
+                .where(primary_key_filter(connection, table, chunk))
+            )
+            records = connection.execute(query)
+            assert records
 
-        existing_rows = result.setdefault(table.fullname, {})
-        for record in records.fetchall():
-            record_dict = row_to_dict(record)
-            pk = tuple([record_dict[c] for c in primary_key_columns])
-            existing_rows[pk] = record_dict
+            for record in records.fetchall():
+                record_dict = row_to_dict(record)
+                pk = tuple([record_dict[c] for c in primary_key_columns])
+                existing_rows[pk] = record_dict
 
     return result
 
 
+def collect_unspecified_record_data(
+    connection: Connection,
+    table: Table,
+    pks: Sequence[tuple[Any, ...]],
+    chunk_size: int = LOOKUP_CHUNK_SIZE,
+) -> Iterator[list[dict[str, Any]]]:
+    """Yield the primary keys of existing records not among `pks`, in chunks.
+
+    The declared primary keys are anti-joined against server-side, so that only
+    the unspecified records are ever sent back; and those are streamed (in primary
+    key order), in chunks of `chunk_size`.
+    """
+    statement = select(*table.primary_key).order_by(*table.primary_key)
+    if pks:
+        statement = statement.where(
+            primary_key_filter(connection, table, pks, exclude=True)
+        )
+
+    statement = statement.execution_options(stream_results=True)
+    records = connection.execute(statement)
+    try:
+        while chunk := records.fetchmany(chunk_size):
+            yield [row_to_dict(record) for record in chunk]
+    finally:
+        records.close()
+
+
 def filter_column_data(table: Table, row: dict):
     return {
         c: v if v is not None else null() for c, v in row.items() if c in table.columns
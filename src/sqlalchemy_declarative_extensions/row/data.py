@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import csv
+import datetime
+import decimal
+import gzip
+import hashlib
+import io
+import json
+import os
+import tempfile
+import uuid
+import weakref
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, Literal, Sequence
+
+from sqlalchemy.sql.elements import ClauseElement, Null
+from sqlalchemy.sql.schema import Table
+
+DataFormat = Literal["json", "csv"]
+
+# Marks NULL values in CSV data files, the same as postgresql's `COPY` does. Likewise,
+# string values which begin with a backslash are escaped with an additional one, so
+# that they cannot be confused with it.
+CSV_NULL = "\\N"
+CSV_ESCAPE = "\\"
+
+
+@dataclass
+class RowDataFile:
+    """A sidecar file of row values, referenced by a rendered migration.
+
+    Rather than inlining the rows of autogenerated row operations into the migration
+    as literal SQL, when `Rows(migration_data=...)` is set they're written to a file
+    alongside the revision. At upgrade time, the file is streamed, and its rows
+    executed (with bound parameters) in chunks.
+
+    Files contain either JSON lines (`.jsonl`) or gzipped CSV (`.csv.gz`). Values
+    are coerced back to their columns' python types as they're read.
+
+    Examples:
+        >>> RowDataFile.relative_to("migrations/versions/abc_.py", "data/foo.jsonl")
+        RowDataFile(path='migrations/versions/data/foo.jsonl')
+    """
+
+    path: str | os.PathLike
+
+    @classmethod
+    def relative_to(cls, file: str | os.PathLike, path: str) -> RowDataFile:
+        """Return the data file at `path`, relative to (the directory of) `file`."""
+        return cls(os.path.join(os.path.dirname(file), path))
+
+    @classmethod
+    def write(
+        cls,
+        directory: str | os.PathLike,
+        name: str,
+        rows: Sequence[dict[str, Any]],
+        format: DataFormat = "json",
+        *,
+        table: Table | None = None,
+    ) -> str:
+        """Write `rows` into `directory`, returning the name of the written file.
+
+        Files are named by their content, so that rendering the same rows again
+        produces the same file.
+
+        When given, `table`'s column types determine how values are written; in
+        particular, the values of JSON columns are always JSON encoded in CSV files
+        (such that, for example, a plain string value can be read back).
+
+        A `TypeError` is raised for values which cannot be represented in a data
+        file (for example, SQL expressions). CSV files can additionally only contain
+        rows which all include the same set of columns, else a `ValueError` is raised.
+        """
+        if format == "csv":
+            content = gzip.compress(_csv_content(rows, table), mtime=0)
+            suffix = ".csv.gz"
+        else:
+            content = "".join(
+                json.dumps(_literal_values(row), default=_json_default) + "\n"
+                for row in rows
+            ).encode("utf-8")
+            suffix = ".jsonl"
+
+        digest = hashlib.sha256(content).hexdigest()[:16]
+        filename = f"{name}-{digest}{suffix}"
+
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, filename), "wb") as f:
+            f.write(content)
+        return filename
+
+    @classmethod
+    def temporary(cls, rows: Iterable[dict[str, Any]]) -> RowDataFile:
+        """Stream `rows` into a temporary JSON lines file.
+
+        The file is removed once the returned instance is garbage collected, which
+        allows ops to reference arbitrarily many rows without holding them in memory.
+        """
+        fd, path = tempfile.mkstemp(suffix=".jsonl")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                for row in rows:
+                    f.write(json.dumps(_literal_values(row), default=_json_default))
+                    f.write("\n")
+        except BaseException:
+            os.unlink(path)
+            raise
+
+        result = cls(path)
+        weakref.finalize(result, _remove_file, path)
+        return result
+
+    def read(self, table: Table) -> Iterator[dict[str, Any]]:
+        """Stream the file's rows, coercing their values to `table`'s column types."""
+        textual = self._is_csv
+        coercers = {c.name: _coercer(c.type, textual) for c in table.columns}
+
+        for row in self._read():
+            yield {
+                column: coercers[column](value)
+                if column in coercers and isinstance(value, str)
+                else value
+                for column, value in row.items()
+            }
+
+    @property
+    def _is_csv(self) -> bool:
+        return str(self.path).endswith(".csv.gz")
+
+    def _read(self) -> Iterator[dict[str, Any]]:
+        if self._is_csv:
+            with gzip.open(self.path, "rt", newline="", encoding="utf-8") as f:
+                for record in csv.DictReader(f):
+                    yield {c: _csv_unescape(v) for c, v in record.items()}
+            return
+
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:  # pragma: no cover
+        pass
+
+
+def _literal_values(row: dict[str, Any]) -> dict[str, Any]:
+    result = {}
+    for column, value in row.items():
+        if isinstance(value, Null):
+            value = None
+        elif isinstance(value, ClauseElement):
+            raise TypeError(
+                f"SQL expressions cannot be written to a data file: {value}"
+            )
+        result[column] = value
+    return result
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, (datetime.date, datetime.time, decimal.Decimal, uuid.UUID)):
+        return str(value)
+    raise TypeError(f"Unable to write value to a data file: {value!r}")
+
+
+def _csv_content(rows: Sequence[dict[str, Any]], table: Table | None) -> bytes:
+    columns = list(rows[0]) if rows else []
+    if any(row.keys() != set(columns) for row in rows):
+        raise ValueError("CSV data files require all rows to include the same columns")
+
+    json_columns = set()
+    if table is not None:
+        json_columns = {c.name for c in table.columns if _is_json(c.type)}
+
+    buffer = io.StringIO(newline="")
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for row in rows:
+        values = _literal_values(row)
+        writer.writerow([_csv_value(values[c], c in json_columns) for c in columns])
+    return buffer.getvalue().encode("utf-8")
+
+
+def _csv_value(value: Any, is_json: bool = False) -> str:
+    if value is None:
+        return CSV_NULL
+    if is_json or isinstance(value, (dict, list)):
+        return json.dumps(value, default=_json_default)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, str):
+        if value.startswith(CSV_ESCAPE):
+            return CSV_ESCAPE + value
+        return value
+    if isinstance(value, (int, float)):
+        return str(value)
+    return _json_default(value)
+
+
+def _csv_unescape(value: str) -> str | None:
+    if value == CSV_NULL:
+        return None
+    if value.startswith(CSV_ESCAPE):
+        return value[len(CSV_ESCAPE) :]
+    return value
+
+
+def _parse_bool(value: str) -> bool:
+    return value.lower() in {"true", "t", "1"}
+
+
+def _coercer(column_type, textual: bool):
+    """Produce a function converting a string value back into `column_type`'s type.
+
+    In CSV (i.e. `textual`) files every value is a string, whereas JSON files only
+    contain strings for those types which JSON cannot represent natively.
+    """
+    try:
+        python_type = column_type.python_type
+    except NotImplementedError:
+        return _identity
+
+    if textual:
+        if python_type is bool:
+            return _parse_bool
+        if _is_json(column_type):
+            return json.loads
+        if python_type in {int, float}:
+            return python_type
+
+    if python_type in {decimal.Decimal, uuid.UUID}:
+        return python_type
+    if python_type in {datetime.date, datetime.datetime, datetime.time}:
+        return python_type.fromisoformat
+    return _identity
+
+
+def _is_json(column_type) -> bool:
+    try:
+        return column_type.python_type in {dict, list}
+    except NotImplementedError:
+        return False
+
+
+def _identity(value: Any) -> Any:
+    return value
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Mapping, Sequence
+
+from sqlalchemy import Text, cast, func, literal
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql.schema import Table
+from sqlalchemy.sql.sqltypes import String
+
+from sqlalchemy_declarative_extensions.row.base import Row
+from sqlalchemy_declarative_extensions.row.cache import ReflectionCache
+from sqlalchemy_declarative_extensions.row.lookup import chunked, primary_key_filter
+from sqlalchemy_declarative_extensions.sqlalchemy import select, version
+
+
+def find_unchanged_tables(
+    connection: Connection,
+    pk_to_row: dict[str, dict[tuple[Any, ...], Row]],
+    existing_tables: dict[str, bool],
+    chunk_size: int,
+) -> set[str]:
+    """Find the tables whose declared rows all already exist, unchanged.
+
+    A digest of the declared columns of the declared rows is computed on the
+    server, and compared against the same digest computed locally. Tables whose
+    digests match can skip fetching and comparing their rows entirely.
+
+    The digest is only computed on postgresql, and only for tables whose declared
+    values are all strings, integers, booleans, or `None` (for which the textual
+    representation is unambiguous). In all other cases, tables are assumed to
+    have changed; and fall back to a full comparison.
+    """
+    if connection.dialect.name != "postgresql" or version.startswith("1.3"):
+        return set()
+
+    reflection_cache = ReflectionCache.for_connection(connection)
+
+    result = set()
+    for tablename, rows_by_pk in pk_to_row.items():
+        if not rows_by_pk or not existing_tables.get(tablename):
+            continue
+
+        table = reflection_cache.get_table(connection, tablename)
+        primary_key = [c.name for c in table.primary_key.columns]
+        if not primary_key:
+            continue
+
+        # Rows are digested by the set of columns they declare, so that undeclared
+        # columns are not compared.
+        rows_by_columns: dict[tuple[str, ...], list[tuple[Any, ...]]] = {}
+        try:
+            for row in rows_by_pk.values():
+                if row.column_values.keys() - table.c.keys():
+                    raise KeyError(row)
+
+                columns = tuple(c for c in table.c.keys() if c in row.column_values)
+                pk = tuple(row.column_values[c] for c in primary_key)
+                rows_by_columns.setdefault(columns, []).append(
+                    (pk, row_text(row.column_values, columns))
+                )
+
+            for rows in rows_by_columns.values():
+                rows.sort(key=lambda r: r[0])
+        except (KeyError, TypeError):
+            continue
+
+        if all(
+            _digests_match(connection, table, columns, rows, chunk_size)
+            for columns, rows in rows_by_columns.items()
+        ):
+            result.add(tablename)
+
+    return result
+
+
+def _digests_match(
+    connection: Connection,
+    table: Table,
+    columns: Sequence[str],
+    rows: list[tuple[Any, ...]],
+    chunk_size: int,
+) -> bool:
+    from sqlalchemy.dialects.postgresql import aggregate_order_by
+
+    column_texts = []
+    for c in columns:
+        text = cast(table.c[c], Text)
+        column_texts.append(
+            func.coalesce(cast(func.length(text), Text) + ":" + text, "null")
+        )
+    row_text_column = func.concat_ws(",", *column_texts)
+
+    # Text primary keys are ordered by their code points, the same as python does.
+    order_by = [
+        c.collate("C") if isinstance(c.type, String) else c
+        for c in table.primary_key.columns
+    ]
+
+    for chunk in chunked(rows, chunk_size):
+        query = (
+            select(
+                func.md5(
+                    func.coalesce(
+                        func.string_agg(
+                            row_text_column,
+                            aggregate_order_by(literal("\n"), *order_by),
+                        ),
+                        "",
+                    )
+                )
+            )
+            .select_from(table)
+            .where(primary_key_filter(connection, table, [pk for pk, _ in chunk]))
+        )
+
+        server_digest = connection.execute(query).scalar()
+        if server_digest != chunk_digest([text for _, text in chunk]):
+            return False
+    return True
+
+
+def row_text(column_values: Mapping[str, Any], columns: Sequence[str]) -> str:
+    """Produce the digested text of the given `columns` of a row.
+
+    Each value is length-prefixed, so that the text is unambiguous regardless of
+    the values' contents. This must exactly match the text produced on the server.
+
+    A `TypeError` is raised for values whose textual representation is not known
+    to match the database's.
+    """
+    values = []
+    for column in columns:
+        text = value_text(column_values[column])
+        if text is None:
+            values.append("null")
+        else:
+            values.append(f"{len(text)}:{text}")
+    return ",".join(values)
+
+
+def chunk_digest(row_texts: list[str]) -> str:
+    return hashlib.md5("\n".join(row_texts).encode("utf-8")).hexdigest()  # noqa: S324
+
+
+def value_text(value: Any) -> str | None:
+    """Produce the postgresql textual representation (i.e. `value::text`) of a value."""
+    if value is None:
+        return None
+
+    value_type = type(value)
+    if value_type is bool:
+        return "true" if value else "false"
+
+    if value_type is int or value_type is str:
+        return str(value)
+
+    raise TypeError(value_type)
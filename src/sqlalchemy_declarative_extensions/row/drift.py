@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Sequence
+
+from sqlalchemy import case, cast, column, literal
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql.elements import ClauseElement, Null
+from sqlalchemy.sql.expression import and_, or_
+from sqlalchemy.sql.schema import Table
+from sqlalchemy.sql.sqltypes import JSON, Integer, NullType
+
+from sqlalchemy_declarative_extensions.row.base import Row
+from sqlalchemy_declarative_extensions.row.lookup import chunked
+from sqlalchemy_declarative_extensions.sqlalchemy import select, version
+
+# The (ordinal) column identifying each row within the relation of declared rows.
+DECLARED_ROW_COLUMN = "_declared_row"
+
+
+@dataclass
+class RowDrift:
+    """The declared rows of a table which differ from the existing records.
+
+    `missing` holds the declared rows which do not exist. `from_values` and
+    `to_values` hold, for each drifted row, its primary key along with only those
+    columns whose existing value differs from the declared one.
+    """
+
+    missing: list[Row] = field(default_factory=list)
+    from_values: list[dict[str, Any]] = field(default_factory=list)
+    to_values: list[dict[str, Any]] = field(default_factory=list)
+
+
+def supports_sql_comparison(connection: Connection) -> bool:
+    return connection.dialect.name == "postgresql" and not version.startswith("1.3")
+
+
+def find_drifted_rows(
+    connection: Connection,
+    table: Table,
+    rows: Sequence[Row],
+    chunk_size: int,
+) -> RowDrift:
+    """Compare the declared `rows` against the records of (the reflected) `table`.
+
+    Rather than fetching every existing record to compare in python, the declared
+    values are sent as a relation typed by the column types of `table`, and joined
+    against the table. The server evaluates `IS DISTINCT FROM` for each
+    declared column, and returns only those rows which are missing or differ, along
+    with the existing values of only their differing columns.
+
+    Rows are compared in chunks of `chunk_size`, grouped by their set of declared
+    columns. Declared columns which do not exist on `table` are ignored.
+    """
+    primary_key = [c.name for c in table.primary_key.columns]
+
+    rows_by_columns: dict[tuple[str, ...], list[Row]] = {}
+    for row in rows:
+        columns = tuple(c for c in table.c.keys() if c in row.column_values)
+        rows_by_columns.setdefault(columns, []).append(row)
+
+    result = RowDrift()
+    for columns, column_rows in rows_by_columns.items():
+        value_columns = [c for c in columns if c not in primary_key]
+        for chunk in chunked(column_rows, chunk_size):
+            query = _drift_query(table, primary_key, value_columns, chunk)
+            for record in connection.execute(query):
+                # The declared rows are numbered from 1, like `WITH ORDINALITY`.
+                row = chunk[record[0] - 1]
+                if record[1]:
+                    result.missing.append(row)
+                    continue
+
+                pk = {c: row.column_values[c] for c in primary_key}
+                from_values = dict(pk)
+                to_values = dict(pk)
+                for index, name in enumerate(value_columns):
+                    if record[2 + 2 * index]:
+                        from_values[name] = record[3 + 2 * index]
+                        to_values[name] = row.column_values[name]
+
+                result.from_values.append(from_values)
+                result.to_values.append(to_values)
+
+    return result
+
+
+def _drift_query(
+    table: Table,
+    primary_key: list[str],
+    value_columns: list[str],
+    rows: list[Row],
+):
+    """Produce the query of the missing, or drifted, rows among `rows`.
+
+    Each result row holds the index of its declared row; whether it is missing; and
+    then, for each of `value_columns`, whether it differs and its existing value
+    (or `NULL`, where it does not differ).
+    """
+    columns = [*primary_key, *value_columns]
+    declared = _declared_relation(table, columns, rows)
+
+    missing = table.c[primary_key[0]].is_(None)
+    distinct = [
+        is_distinct_from(table, table.c[c], declared.c[c]) for c in value_columns
+    ]
+
+    changes = []
+    for c, is_distinct in zip(value_columns, distinct):
+        changes.append(is_distinct)
+        changes.append(case((is_distinct, table.c[c])))
+
+    return (
+        select(declared.c[DECLARED_ROW_COLUMN], missing, *changes)
+        .select_from(
+            declared.outerjoin(
+                table,
+                and_(*[table.c[c] == declared.c[c] for c in primary_key]),
+            )
+        )
+        .where(or_(missing, *distinct))
+    )
+
+
+def _declared_relation(table: Table, columns: list[str], rows: list[Row]):
+    """Produce the declared `rows` as a relation, typed by `table`'s columns.
+
+    This is `unnest()` of one (typed) array parameter per column, with ordinality,
+    the same as `stage_primary_keys`: the statement is then the same for every
+    chunk, and compiled only once. Rows which contain SQL expressions (or columns
+    of unknown type) instead produce a `VALUES` list, with each value cast to its
+    column's type.
+    """
+    from sqlalchemy import func, values
+
+    column_types = [table.c[c].type for c in columns]
+    arrays = [[_literal_value(row.column_values[c]) for row in rows] for c in columns]
+    if not any(isinstance(t, NullType) for t in column_types) and not any(
+        isinstance(v, ClauseElement) for array in arrays for v in array
+    ):
+        from sqlalchemy.dialects.postgresql import ARRAY
+
+        return (
+            func.unnest(
+                *[
+                    cast(literal(array, ARRAY(t)), ARRAY(t))
+                    for array, t in zip(arrays, column_types)
+                ]
+            )
+            .table_valued(
+                *[column(c, t) for c, t in zip(columns, column_types)],
+                with_ordinality=DECLARED_ROW_COLUMN,
+            )
+            .render_derived(name="declared")
+        )
+
+    return values(
+        *[column(c, t) for c, t in zip(columns, column_types)],
+        column(DECLARED_ROW_COLUMN, Integer()),
+        name="declared",
+    ).data(
+        [
+            (
+                *[_typed_value(table, c, row.column_values[c]) for c in columns],
+                index + 1,
+            )
+            for index, row in enumerate(rows)
+        ]
+    )
+
+
+def _literal_value(value: Any) -> Any:
+    if isinstance(value, Null):
+        return None
+    return value
+
+
+def _typed_value(table: Table, column_name: str, value: Any):
+    """Cast `value` to its column's type, so that the `VALUES` columns are typed.
+
+    Otherwise, postgresql would resolve (untyped) parameters as `text`.
+    """
+    column_type = table.c[column_name].type
+    if isinstance(column_type, NullType):
+        return value
+
+    if not isinstance(value, ClauseElement):
+        value = literal(value, column_type)
+    return cast(value, column_type)
+
+
+def is_distinct_from(table: Table, existing, declared):
+    """Produce `existing IS DISTINCT FROM declared`, for a column of `table`.
+
+    postgresql's `json` type has no equality operator (unlike `jsonb`), so `json`
+    columns are compared as `jsonb`.
+    """
+    column_type = table.c[existing.name].type
+    if isinstance(column_type, JSON) and column_type.__visit_name__ == "JSON":
+        from sqlalchemy.dialects.postgresql import JSONB
+
+        return cast(existing, JSONB).is_distinct_from(cast(declared, JSONB))
+
+    return existing.is_distinct_from(declared)
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from itertools import islice
+from typing import Any, Iterable, Iterator, Sequence
+
+from sqlalchemy import column, func, literal, literal_column, tuple_
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql.expression import not_
+from sqlalchemy.sql.schema import Table
+
+from sqlalchemy_declarative_extensions.sqlalchemy import select, version
+
+
+def primary_key_filter(
+    connection: Connection | None,
+    table: Table,
+    pks: Sequence[tuple[Any, ...]],
+    *,
+    exclude: bool = False,
+):
+    """Produce a filter matching the records of `table` with the given primary keys.
+
+    Where supported, the primary keys are joined against as a set (which the
+    database can hash), rather than having to evaluate one predicate per primary
+    key. Otherwise (or without a `connection`, such as when rendering literal SQL),
+    this falls back to `(pk) IN (...)`.
+
+    With `exclude=True`, the filter instead matches the records **not** among the
+    given primary keys (as an anti-join, i.e. `NOT EXISTS`, where supported).
+    """
+    primary_key = list(table.primary_key.columns)
+
+    staged_pks = stage_primary_keys(connection, table, pks)
+    if staged_pks is not None:
+        staged_columns = [staged_pks.c[c.name] for c in primary_key]
+        if exclude:
+            return not_(
+                select(literal_column("1"))
+                .select_from(staged_pks)
+                .where(*[c == s for c, s in zip(primary_key, staged_columns)])
+                .exists()
+            )
+        return tuple_(*primary_key).in_(select(*staged_columns))
+
+    if len(primary_key) == 1:
+        filter = primary_key[0].in_([pk[0] for pk in pks])
+    else:
+        filter = tuple_(*primary_key).in_(pks)
+
+    if exclude:
+        return not_(filter)
+    return filter
+
+
+def stage_primary_keys(
+    connection: Connection | None, table: Table, pks: Sequence[tuple[Any, ...]]
+):
+    """Produce a table-valued set of the given primary keys, where supported.
+
+    On postgresql, this is `unnest()` of one array parameter per primary key column.
+    Unlike a `VALUES` list, the statement (and its size) is then independent of the
+    number of primary keys, so it is compiled only once and bound as a handful of
+    parameters.
+
+    Returns `None` for dialects which do not support it.
+    """
+    if connection is None or version.startswith("1.3"):
+        return None
+
+    if connection.dialect.name != "postgresql":
+        return None
+
+    from sqlalchemy.dialects.postgresql import ARRAY
+
+    primary_key = list(table.primary_key.columns)
+    arrays = [
+        literal(list(values), ARRAY(c.type))
+        for c, values in zip(primary_key, zip(*pks))
+    ]
+    columns = [column(c.name, c.type) for c in primary_key]
+    return (
+        func.unnest(*arrays).table_valued(*columns).render_derived(name="declared_pks")
+    )
+
+
+def chunked(items: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
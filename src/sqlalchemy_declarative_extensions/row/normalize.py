@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import datetime
+import decimal
+import enum
+import json
+import uuid
+from typing import Any, Callable, Mapping
+
+from sqlalchemy.sql.elements import ClauseElement, Null
+from sqlalchemy.sql.schema import Table
+
+Normalizer = Callable[[Any], Any]
+
+_TRUE = {"true", "t", "1"}
+_FALSE = {"false", "f", "0"}
+
+
+def table_normalizers(
+    table: Table, declared: Table | None = None
+) -> dict[str, Normalizer]:
+    """Produce one normalizer per column of (the reflected) `table`.
+
+    Non-native enums reflect as plain strings, so the enum labels of the `declared`
+    table's columns are used where the reflected column has none.
+    """
+    normalizers = {}
+    for column in table.columns:
+        column_type = column.type
+        if declared is not None and not getattr(column_type, "enums", None):
+            declared_column = declared.columns.get(column.name)
+            if declared_column is not None and getattr(
+                declared_column.type, "enums", None
+            ):
+                column_type = declared_column.type
+
+        normalizers[column.name] = column_normalizer(column_type)
+    return normalizers
+
+
+def column_normalizer(column_type) -> Normalizer:
+    """Produce a function which canonicalizes values of `column_type`.
+
+    Declared values and existing records can represent the same value differently:
+    `Decimal` vs `float`, naive vs aware datetimes, enum members vs their names, or
+    (on dialects which return them as text, like sqlite) dates and JSON as strings.
+    Both sides are normalized, such that equivalent values compare equal.
+    """
+    try:
+        python_type = column_type.python_type
+    except NotImplementedError:
+        python_type = None
+
+    labels = set(getattr(column_type, "enums", None) or ())
+
+    if python_type is decimal.Decimal:
+        convert: Normalizer = _decimal_normalizer(getattr(column_type, "scale", None))
+    elif python_type is float:
+        convert = _normalize_float
+    elif python_type is bool:
+        convert = _normalize_bool
+    elif python_type is datetime.datetime:
+        convert = _datetime_normalizer(bool(getattr(column_type, "timezone", False)))
+    elif python_type is datetime.date:
+        convert = _normalize_date
+    elif python_type is datetime.time:
+        convert = _normalize_time
+    elif python_type is uuid.UUID:
+        convert = _normalize_uuid
+    elif python_type in {dict, list}:
+        convert = _normalize_json
+    else:
+        convert = _identity
+
+    def normalize(value: Any) -> Any:
+        if value is None or isinstance(value, Null):
+            return None
+        if isinstance(value, enum.Enum):
+            if labels:
+                # Enums are stored by name, unless declared by their values.
+                if value.name in labels or value.value not in labels:
+                    return value.name
+                return value.value
+
+            # Otherwise, the column stores the enum's value.
+            value = value.value
+        return convert(value)
+
+    return normalize
+
+
+def compare_row_values(
+    normalizers: Mapping[str, Normalizer],
+    declared: Mapping[str, Any],
+    existing: Mapping[str, Any],
+) -> tuple[bool, bool]:
+    """Compare the `declared` values of a row against its `existing` record.
+
+    Returns whether the row is equivalent, and whether any column's values were
+    only found to be equivalent after normalization.
+    """
+    normalized = False
+    for column, value in declared.items():
+        if isinstance(value, Null):
+            value = None
+
+        current = existing.get(column)
+        if type(value) is type(current) and not isinstance(value, ClauseElement):
+            if value == current:
+                continue
+
+        normalize = normalizers.get(column, _identity)
+        value = normalize(value)
+        if isinstance(value, ClauseElement):
+            # SQL expressions cannot be evaluated locally.
+            return False, normalized
+
+        if value != normalize(current):
+            return False, normalized
+
+        normalized = True
+    return True, normalized
+
+
+def _decimal_normalizer(scale: int | None) -> Normalizer:
+    exponent = decimal.Decimal(1).scaleb(-scale) if scale is not None else None
+
+    def normalize(value: Any) -> Any:
+        if isinstance(value, bool) or not isinstance(
+            value, (int, float, str, decimal.Decimal)
+        ):
+            return value
+
+        try:
+            result = decimal.Decimal(str(value))
+        except decimal.InvalidOperation:
+            return value
+
+        # Values are rounded to the column's scale, as they are when stored.
+        if exponent is not None and result.is_finite():
+            result = result.quantize(exponent, rounding=decimal.ROUND_HALF_UP)
+        return result
+
+    return normalize
+
+
+def _normalize_float(value: Any) -> Any:
+    if isinstance(value, (int, decimal.Decimal, str)) and not isinstance(value, bool):
+        try:
+            return float(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _normalize_bool(value: Any) -> Any:
+    if isinstance(value, int):
+        return bool(value)
+    if isinstance(value, str) and value.lower() in _TRUE | _FALSE:
+        return value.lower() in _TRUE
+    return value
+
+
+def _datetime_normalizer(timezone: bool) -> Normalizer:
+    def normalize(value: Any) -> Any:
+        if isinstance(value, str):
+            try:
+                value = datetime.datetime.fromisoformat(value)
+            except ValueError:
+                return value
+
+        if not isinstance(value, datetime.datetime):
+            return value
+
+        # Naive values are assumed to be UTC.
+        if value.tzinfo is None:
+            if timezone:
+                return value.replace(tzinfo=datetime.timezone.utc)
+            return value
+
+        value = value.astimezone(datetime.timezone.utc)
+        if timezone:
+            return value
+        return value.replace(tzinfo=None)
+
+    return normalize
+
+
+def _normalize_date(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            return datetime.date.fromisoformat(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _normalize_time(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            return datetime.time.fromisoformat(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _normalize_uuid(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            return uuid.UUID(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _normalize_json(value: Any) -> Any:
+    # Dicts compare irrespective of key order, so only serialized values need parsing.
+    if isinstance(value, (str, bytes)):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _identity(value: Any) -> Any:
+    return value
@@ -1,16 +1,34 @@
 from __future__ import annotations
 
-from sqlalchemy import MetaData
+from sqlalchemy import MetaData, text
 from sqlalchemy.engine import Connection
 
 from sqlalchemy_declarative_extensions.row import Rows
-from sqlalchemy_declarative_extensions.row.compare import compare_rows
+from sqlalchemy_declarative_extensions.row.cache import ReflectionCache
+from sqlalchemy_declarative_extensions.row.compare import (
+    DEFER_CONSTRAINTS,
+    compare_rows,
+    should_defer_constraints,
+    supports_upsert,
+    upsert_rows,
+)
 
 
 def rows_query(rows: Rows, row_filter: list[str] | None = None):
     def receive_after_create(metadata: MetaData, connection: Connection, **_):
-        results = compare_rows(connection, metadata, rows, row_filter)
-        for op in results:
-            op.execute(connection)
+        # Comparing the rows and executing the resulting operations share reflected
+        # tables, as no DDL is executed in between.
+        with ReflectionCache.scope(connection):
+            # Dialects without native upserts fall back to comparing rows.
+            if rows.strategy == "upsert" and supports_upsert(connection.dialect):
+                results = upsert_rows(connection, metadata, rows, row_filter)
+            else:
+                results = compare_rows(connection, metadata, rows, row_filter)
+
+            if results and should_defer_constraints(connection.dialect, rows):
+                connection.execute(text(DEFER_CONSTRAINTS))
+
+            for op in results:
+                op.execute(connection)
 
     return receive_after_create
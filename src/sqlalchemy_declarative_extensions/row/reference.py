@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Iterator, Mapping
+
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql.schema import MetaData, Table, UniqueConstraint
+
+if TYPE_CHECKING:
+    from sqlalchemy_declarative_extensions.row.base import Rows
+
+
+class TableLookup(Mapping[Any, Mapping[str, Any]]):
+    """A read-only, in-memory index of one table's declared rows.
+
+    Rows are looked up by primary key (a scalar for single-column primary keys, and
+    a tuple otherwise), or through `by` for any unique column.
+
+    Examples:
+        >>> from sqlalchemy import Column, Integer, MetaData, String, Table
+        >>> metadata = MetaData()
+        >>> _ = Table(
+        ...     "currency",
+        ...     metadata,
+        ...     Column("id", Integer, primary_key=True),
+        ...     Column("code", String, unique=True),
+        ... )
+        >>> currencies = TableLookup.build(
+        ...     metadata.tables["currency"], [{"id": 1, "code": "USD"}]
+        ... )
+        >>> currencies[1]["code"], currencies.by("code")["USD"]["id"]
+        ('USD', 1)
+    """
+
+    __slots__ = ("tablename", "primary_key", "_rows", "_unique")
+
+    def __init__(
+        self,
+        tablename: str,
+        primary_key: tuple[str, ...],
+        rows: dict[Any, Mapping[str, Any]],
+        unique: dict[str, Mapping[Any, Mapping[str, Any]]],
+    ):
+        self.tablename = tablename
+        self.primary_key = primary_key
+        self._rows = rows
+        self._unique = unique
+
+    @classmethod
+    def build(cls, table: Table, rows: list[Mapping[str, Any]]) -> TableLookup:
+        """Index `rows` by the primary key, and unique columns, of `table`.
+
+        Later declarations of the same primary key replace earlier ones. Rows which
+        share a value of a unique column raise a `ValueError`.
+        """
+        primary_key = tuple(c.name for c in table.primary_key.columns)
+        if not primary_key:
+            raise ValueError(f"Declared rows require a primary key: {table.fullname}")
+
+        by_pk: dict[Any, Mapping[str, Any]] = {}
+        for row in rows:
+            if set(primary_key) - row.keys():
+                raise ValueError(
+                    f"Row is missing primary key values required to declaratively specify: {row}"
+                )
+            by_pk[_key(row, primary_key)] = MappingProxyType(dict(row))
+
+        unique: dict[str, Mapping[Any, Mapping[str, Any]]] = {}
+        for column in unique_columns(table):
+            index: dict[Any, Mapping[str, Any]] = {}
+            for row in by_pk.values():
+                value = row.get(column)
+                if value is None:
+                    continue
+
+                if value in index:
+                    raise ValueError(
+                        f"Declared rows of {table.fullname} share the unique value {column}={value!r}"
+                    )
+                index[value] = row
+            unique[column] = MappingProxyType(index)
+
+        return cls(table.fullname, primary_key, by_pk, unique)
+
+    def by(self, column: str) -> Mapping[Any, Mapping[str, Any]]:
+        """Return the rows indexed by the unique `column`."""
+        if column in self.primary_key and len(self.primary_key) == 1:
+            return MappingProxyType(self._rows)
+
+        try:
+            return self._unique[column]
+        except KeyError:
+            raise KeyError(
+                f"{self.tablename}.{column} is not a unique column; expected one of: {sorted(self._unique)}"
+            ) from None
+
+    def __getitem__(self, pk: Any) -> Mapping[str, Any]:
+        return self._rows[pk]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __repr__(self) -> str:
+        return f"TableLookup({self.tablename!r}, rows={len(self._rows)}, unique={sorted(self._unique)})"
+
+
+class RowLookup(Mapping[str, TableLookup]):
+    """Read-only, in-memory lookups of declared rows, by (qualified) table name.
+
+    Built by `Rows.lookup`, which builds it once per `MetaData`, such that reference
+    values can be resolved without querying the database.
+    """
+
+    __slots__ = ("rows", "metadata", "_tables")
+
+    def __init__(self, rows: Rows, metadata: MetaData):
+        assert metadata.tables is not None
+
+        self.rows = rows
+        self.metadata = metadata
+
+        rows_by_table: dict[str, list[Mapping[str, Any]]] = {
+            tablename: [] for tablename in rows.included_tables
+        }
+        for row in rows:
+            rows_by_table.setdefault(row.qualified_name, []).append(row.column_values)
+
+        self._tables = {}
+        for tablename, table_rows in rows_by_table.items():
+            table = metadata.tables.get(tablename)
+            if table is None:
+                raise ValueError(f"Unknown table: {tablename}")
+            self._tables[tablename] = TableLookup.build(table, table_rows)
+
+    def verify(self, connection: Connection) -> None:
+        """Check that the database matches the declared rows.
+
+        For example, at application startup. Raises a `ValueError` describing the
+        row operations which would be required to bring the database in line with
+        the declaration, if there are any.
+        """
+        from sqlalchemy_declarative_extensions.row.compare import compare_rows
+
+        ops = compare_rows(connection, self.metadata, self.rows)
+        if ops:
+            pending = ", ".join(f"{op.to_diff_tuple()[0]}({op.table})" for op in ops)
+            raise ValueError(
+                f"The database does not match the declared rows, requiring: {pending}"
+            )
+
+    def __getitem__(self, tablename: str) -> TableLookup:
+        return self._tables[tablename]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._tables)
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+
+def unique_columns(table: Table) -> list[str]:
+    """Collect the columns of `table` which are unique on their own.
+
+    That is, `unique=True` columns and single-column unique constraints or indexes,
+    excluding (single-column) primary keys.
+    """
+    result = {c.name: None for c in table.columns if c.unique}
+    for constraint in table.constraints:
+        if isinstance(constraint, UniqueConstraint) and len(constraint.columns) == 1:
+            result.update({c.name: None for c in constraint.columns})
+
+    for index in table.indexes:
+        if index.unique and len(index.expressions) == 1 and len(index.columns) == 1:
+            result.update({c.name: None for c in index.columns})
+
+    primary_key = [c.name for c in table.primary_key.columns]
+    if len(primary_key) == 1:
+        result.pop(primary_key[0], None)
+    return list(result)
+
+
+def _key(row: Mapping[str, Any], columns: tuple[str, ...]) -> Any:
+    if len(columns) == 1:
+        return row[columns[0]]
+    return tuple(row[c] for c in columns)
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import csv
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+from sqlalchemy_declarative_extensions.row.base import Row
+from sqlalchemy_declarative_extensions.sql import split_schema
+
+
+@dataclass
+class RowSource:
+    """A lazily read, file-backed source of rows for a single table.
+
+    The file is only opened (and read, one line at a time) when the rows are
+    iterated, i.e. when rows are being compared against the database.
+    """
+
+    tablename: str
+    path: str | os.PathLike
+    schema: str | None = None
+
+    def __post_init__(self):
+        self.schema, self.tablename = split_schema(self.tablename, schema=self.schema)
+
+    @property
+    def qualified_name(self):
+        if self.schema:
+            return f"{self.schema}.{self.tablename}"
+        return self.tablename
+
+    def __iter__(self) -> Iterator[Row]:
+        for column_values in self.read():
+            yield Row(self.tablename, schema=self.schema, **column_values)
+
+    def read(self) -> Iterator[dict[str, Any]]:
+        raise NotImplementedError()  # pragma: no cover
+
+
+@dataclass
+class CsvSource(RowSource):
+    """Read rows from a CSV file, whose header row names the columns.
+
+    As CSV values are untyped, `converters` can supply a function (per column)
+    with which to convert the raw string values. Values equal to `null` are
+    converted to `None`.
+
+    Examples:
+        >>> source = CsvSource("users", "users.csv", converters={"id": int})
+        >>> source.qualified_name
+        'users'
+    """
+
+    converters: dict[str, Callable[[str], Any]] = field(default_factory=dict)
+    null: str | None = ""
+
+    def read(self) -> Iterator[dict[str, Any]]:
+        with open(self.path, newline="", encoding="utf-8") as f:
+            for record in csv.DictReader(f):
+                yield {
+                    column: self._convert(column, value)
+                    for column, value in record.items()
+                }
+
+    def _convert(self, column: str, value: str) -> Any:
+        if value == self.null:
+            return None
+
+        converter = self.converters.get(column)
+        if converter is None:
+            return value
+        return converter(value)
+
+
+@dataclass
+class JsonlSource(RowSource):
+    """Read rows from a JSON lines file, one JSON object (of column values) per line.
+
+    Examples:
+        >>> source = JsonlSource("auth.users", "users.jsonl")
+        >>> source.qualified_name
+        'auth.users'
+    """
+
+    def read(self) -> Iterator[dict[str, Any]]:
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                yield json.loads(line)
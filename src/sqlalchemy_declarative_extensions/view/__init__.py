@@ -5,8 +5,10 @@ from sqlalchemy_declarative_extensions.view.base import (
     register_view,
     view,
 )
+from sqlalchemy_declarative_extensions.view.cache import DefinitionCache
 
 __all__ = [
+    "DefinitionCache",
     "view",
     "View",
     "register_view",
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import inspect
+import os
 import uuid
 import warnings
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field, replace
+from itertools import repeat
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -33,6 +36,7 @@ from sqlalchemy_declarative_extensions.sqlalchemy import (
     create_mapper,
     escape_params,
 )
+from sqlalchemy_declarative_extensions.view.cache import DefinitionCache
 
 if TYPE_CHECKING:
     from sqlalchemy_declarative_extensions.dialects.postgresql import (
@@ -43,6 +47,10 @@ T = TypeVar("T")
 ViewType = TypeVar("ViewType", "View", "DeclarativeView")
 NamingConvention = Dict[str, Any]
 
+# Below this many views, the cost of spinning up worker processes outweighs the
+# benefit of parallelizing `sqlglot` normalization.
+PARALLEL_NORMALIZATION_THRESHOLD = 50
+
 
 def view(
     base,
@@ -230,11 +238,34 @@ class View:
             )
         )
 
-    def render_definition(self, conn: Connection, using_connection: bool = True):
+    def render_definition(
+        self,
+        conn: Connection,
+        using_connection: bool = True,
+        cache: DefinitionCache | None = None,
+    ):
         dialect = conn.engine.dialect
 
         compiled_definition = self.compile_definition(dialect)
 
+        if cache is None:
+            return self._render_definition(conn, compiled_definition, using_connection)
+
+        mode = _normalization_mode(dialect, using_connection)
+        key = cache.key(compiled_definition, dialect, mode)
+        result = cache.get(key)
+        if result is None:
+            result = self._render_definition(
+                conn, compiled_definition, using_connection
+            )
+            cache.set(key, result)
+        return result
+
+    def _render_definition(
+        self, conn: Connection, compiled_definition: str, using_connection: bool
+    ) -> str:
+        dialect = conn.engine.dialect
+
         if using_connection and dialect.name == "postgresql":
             from sqlalchemy_declarative_extensions.dialects import get_view
 
@@ -261,27 +292,8 @@ class View:
                 finally:
                     trans.rollback()
         else:
-            # Fall back to library-based normalization, which cannot be perfect.
-            try:
-                import sqlglot
-                from sqlglot.optimizer.normalize import normalize
-            except ImportError:  # pragma: no cover
-                raise ImportError("View autogeneration requires the 'parse' extra.")
-
-            dialect_name_map = {"postgresql": "postgres"}
-            dialect_name = dialect_name_map.get(dialect.name, dialect.name)
-
-            # aiosqlite, pmrsqlite, etc
-            if "sqlite" in dialect_name:
-                dialect_name = "sqlite"
-
-            return (
-                escape_params(
-                    normalize(
-                        sqlglot.parse_one(compiled_definition, read=dialect_name)
-                    ).sql(dialect_name)
-                )
-                + ";"
+            return _normalize_with_sqlglot(
+                compiled_definition, _sqlglot_dialect_name(dialect)
             )
 
     def render_constraints(self, *, create):
@@ -305,7 +317,13 @@ class View:
         conn: Connection,
         naming_convention: NamingConvention | None,
         using_connection: bool = True,
+        definition: str | None = None,
     ) -> Self:
+        """Produce a normalized copy of the view.
+
+        An already rendered `definition` (i.e. the output of `render_definitions`)
+        can be supplied, in which case the view's own definition is not re-rendered.
+        """
         constraints = None
         if self.constraints:
             constraints = [
@@ -313,9 +331,12 @@ class View:
                 for c in self.constraints
             ]
 
+        if definition is None:
+            definition = self.render_definition(conn, using_connection=using_connection)
+
         return replace(
             self,
-            definition=self.render_definition(conn, using_connection=using_connection),
+            definition=definition,
             constraints=constraints,
         )
 
@@ -371,6 +392,165 @@ class View:
         return result
 
 
+def render_definitions(
+    conn: Connection,
+    views: Sequence[View],
+    using_connection: bool = True,
+    cache: DefinitionCache | None = None,
+    workers: int | None = None,
+) -> list[str]:
+    """Render the definitions of many views at once.
+
+    The result is equivalent to calling `View.render_definition` on each view in turn.
+
+    For postgresql however, rather than creating (and reflecting) up to two temporary
+    views per view, each inside its own savepoint, all temporary views are created
+    inside a single savepoint and their definitions are fetched with a single query.
+    Only those views whose definition changed after the first round-trip are
+    round-tripped a second time.
+
+    Otherwise, (CPU-bound) `sqlglot` normalization is spread across a pool of
+    `workers` processes, if supplied and there are enough views to be worth it.
+    """
+    dialect = conn.engine.dialect
+    compiled_definitions = [view.compile_definition(dialect) for view in views]
+
+    result: list[str | None] = [None] * len(compiled_definitions)
+    keys: list[str] = []
+    if cache is not None:
+        mode = _normalization_mode(dialect, using_connection)
+        keys = [cache.key(d, dialect, mode) for d in compiled_definitions]
+        result = [cache.get(key) for key in keys]
+
+    missing = [index for index, definition in enumerate(result) if definition is None]
+    if missing:
+        missing_definitions = [compiled_definitions[index] for index in missing]
+        if using_connection and dialect.name == "postgresql":
+            rendered = _render_postgresql_definitions(conn, missing_definitions)
+        else:
+            rendered = _render_sqlglot_definitions(
+                missing_definitions, _sqlglot_dialect_name(dialect), workers=workers
+            )
+
+        for index, definition in zip(missing, rendered):
+            result[index] = definition
+            if cache is not None:
+                cache.set(keys[index], definition)
+
+    return cast(List[str], result)
+
+
+def _render_postgresql_definitions(
+    conn: Connection, compiled_definitions: list[str]
+) -> list[str]:
+    with conn.begin_nested() as trans:
+        try:
+            definitions = _roundtrip_definitions(conn, compiled_definitions)
+
+            # Optimization, the view query **can** change if we re-run it,
+            # but if it's not changed from the first iteration, we assume it won't.
+            changed = [
+                index
+                for index, (compiled_definition, definition) in enumerate(
+                    zip(compiled_definitions, definitions)
+                )
+                if definition != compiled_definition
+            ]
+
+            # Re-generate the view, it **can** not produce the same text twice.
+            redefinitions = _roundtrip_definitions(
+                conn, [definitions[index] for index in changed]
+            )
+
+            result = list(compiled_definitions)
+            for index, definition in zip(changed, redefinitions):
+                result[index] = definition
+
+            return [escape_params(definition) for definition in result]
+        finally:
+            trans.rollback()
+
+
+def _render_sqlglot_definitions(
+    compiled_definitions: list[str], dialect_name: str, workers: int | None = None
+) -> list[str]:
+    if (
+        not workers
+        or workers < 2
+        or len(compiled_definitions) < PARALLEL_NORMALIZATION_THRESHOLD
+    ):
+        return [
+            _normalize_with_sqlglot(definition, dialect_name)
+            for definition in compiled_definitions
+        ]
+
+    # Batch up the work sent to each process, to amortize the per-task IPC overhead.
+    chunksize = max(1, len(compiled_definitions) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(
+            executor.map(
+                _normalize_with_sqlglot,
+                compiled_definitions,
+                repeat(dialect_name),
+                chunksize=chunksize,
+            )
+        )
+
+
+def _normalize_with_sqlglot(compiled_definition: str, dialect_name: str) -> str:
+    # Fall back to library-based normalization, which cannot be perfect.
+    try:
+        import sqlglot
+        from sqlglot.optimizer.normalize import normalize
+    except ImportError:  # pragma: no cover
+        raise ImportError("View autogeneration requires the 'parse' extra.")
+
+    return (
+        escape_params(
+            normalize(sqlglot.parse_one(compiled_definition, read=dialect_name)).sql(
+                dialect_name
+            )
+        )
+        + ";"
+    )
+
+
+def _sqlglot_dialect_name(dialect: Dialect) -> str:
+    dialect_name_map = {"postgresql": "postgres"}
+    dialect_name = dialect_name_map.get(dialect.name, dialect.name)
+
+    # aiosqlite, pmrsqlite, etc
+    if "sqlite" in dialect_name:
+        dialect_name = "sqlite"
+
+    return dialect_name
+
+
+def _normalization_mode(dialect: Dialect, using_connection: bool) -> str:
+    if using_connection and dialect.name == "postgresql":
+        return "connection"
+
+    try:
+        import sqlglot
+    except ImportError:  # pragma: no cover
+        return "sqlglot"
+    return f"sqlglot=={sqlglot.__version__}"
+
+
+def _roundtrip_definitions(conn: Connection, definitions: list[str]) -> list[str]:
+    from sqlalchemy_declarative_extensions.dialects import get_view_definitions
+
+    if not definitions:
+        return []
+
+    random_names = ["v" + uuid.uuid4().hex for _ in definitions]
+    for random_name, definition in zip(random_names, definitions):
+        conn.execute(text(f"CREATE VIEW {random_name} AS {definition}"))
+
+    definitions_by_name = get_view_definitions(conn, random_names)
+    return [definitions_by_name[random_name] for random_name in random_names]
+
+
 @dataclass
 class ViewIndex:
     columns: list[str]
@@ -514,6 +694,12 @@ class Views:
     Note: `ignore` option accepts a list of strings. Each string is individually
         interpreted as a "glob". This means a string like "foo.*" would ignore all views
         contained within the schema "foo".
+
+    Note: `normalization_cache` opts into caching normalized view definitions on disk
+        (see `DefinitionCache`). It accepts either a directory path, or a `DefinitionCache`.
+
+    Note: `normalization_workers` opts into normalizing view definitions through `sqlglot`
+        (i.e. for dialects other than postgresql) across a pool of that many processes.
     """
 
     views: list[View | DeclarativeView] = field(default_factory=list)
@@ -523,6 +709,8 @@ class Views:
     ignore: Iterable[str] = field(default_factory=set)
     ignore_views: Iterable[str] = field(default_factory=set)
     naming_convention: NamingConvention | None = None
+    normalization_cache: str | os.PathLike | DefinitionCache | None = None
+    normalization_workers: int | None = None
 
     @classmethod
     def coerce_from_unknown(
@@ -571,10 +759,12 @@ class Views:
         if not all(
             x.ignore_unspecified == instances[0].ignore_unspecified
             and x.naming_convention == instances[0].naming_convention
+            and x.normalization_cache == instances[0].normalization_cache
+            and x.normalization_workers == instances[0].normalization_workers
             for x in instances
         ):
             raise ValueError(
-                "All combined `Views` instances must agree on the set of settings: ignore_unspecified, naming_convention"
+                "All combined `Views` instances must agree on the set of settings: ignore_unspecified, naming_convention, normalization_cache, normalization_workers"
             )
 
         views = [s for instance in instances for s in instance.views]
@@ -596,6 +786,8 @@ class Views:
             ignore=ignore,
             ignore_views=ignore_views,
             naming_convention=naming_convention,
+            normalization_cache=instances[0].normalization_cache,
+            normalization_workers=instances[0].normalization_workers,
         )
 
     def append(self, view: View | DeclarativeView):
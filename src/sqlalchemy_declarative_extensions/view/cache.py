@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+from sqlalchemy.engine import Dialect
+
+# Bump whenever a change to normalization would alter previously cached results.
+CACHE_VERSION = 1
+
+
+@dataclass
+class DefinitionCache:
+    """An opt-in, on-disk cache of normalized view definitions.
+
+    Entries are keyed by the compiled definition, dialect, server version, and
+    normalization mode, so that their result can be persisted across runs (for
+    example, by saving and restoring `path` between CI jobs).
+
+    Note that the key does **not** include the relations a view references, although
+    (on postgresql in particular) the normalized definition can depend on them: for
+    example, `SELECT *` is expanded to the referenced table's columns. A cached
+    definition can therefore go stale after a referenced table changes. Either
+    `clear` the cache when that happens, or supply a `namespace` which changes along
+    with the schema (for example, the current alembic head revision).
+
+    The cache is bounded by `max_size` (in bytes), beyond which the least recently
+    used entries are evicted.
+
+    Arguments:
+        path: The directory in which cached definitions are stored.
+        max_size: The maximum total size of the cached definitions.
+        namespace: An arbitrary value included in every key, such that changing it
+            invalidates all previously cached definitions.
+
+    Examples:
+        >>> from sqlalchemy_declarative_extensions import Views
+        >>> views = Views(normalization_cache=".cache/views")
+        >>> views = Views(normalization_cache=DefinitionCache(".cache/views", max_size=1024))
+        >>> views = Views(normalization_cache=DefinitionCache(".cache/views", namespace="a1b2c3"))
+    """
+
+    path: str | os.PathLike
+    max_size: int = 50 * 1024 * 1024
+    namespace: str | None = None
+
+    @classmethod
+    def coerce_from_unknown(
+        cls, unknown: str | os.PathLike | DefinitionCache | None
+    ) -> DefinitionCache | None:
+        if unknown is None or isinstance(unknown, DefinitionCache):
+            return unknown
+
+        return cls(unknown)
+
+    @property
+    def directory(self) -> Path:
+        return Path(self.path)
+
+    def key(self, definition: str, dialect: Dialect, mode: str) -> str:
+        components = [
+            CACHE_VERSION,
+            definition,
+            dialect.name,
+            list(dialect.server_version_info or ()),
+            mode,
+            self.namespace,
+        ]
+        raw_key = json.dumps(components, default=str).encode("utf-8")
+        return hashlib.sha256(raw_key).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        path = self._entry_path(key)
+        try:
+            result = path.read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+        # Eviction is by modification time, so reads count as "uses".
+        try:
+            os.utime(path)
+        except OSError:  # pragma: no cover
+            pass
+        return result
+
+    def set(self, key: str, value: str) -> None:
+        path = self._entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write then rename, so that concurrent readers never observe partial entries.
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(value)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def clear(self) -> None:
+        """Remove all cached definitions."""
+        for path in self.directory.glob("*/*"):
+            try:
+                path.unlink()
+            except OSError:  # pragma: no cover
+                continue
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until the cache fits in `max_size`."""
+        entries = []
+        total_size = 0
+        for path in self.directory.glob("*/*"):
+            if path.suffix == ".tmp":
+                continue
+            try:
+                stat = path.stat()
+            except OSError:  # pragma: no cover
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_size += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= self.max_size:
+                break
+
+            try:
+                path.unlink()
+            except OSError:  # pragma: no cover
+                continue
+            total_size -= size
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / key[:2] / key
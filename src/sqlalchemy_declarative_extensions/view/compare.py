@@ -9,7 +9,12 @@ from sqlalchemy.engine import Connection, Dialect
 
 from sqlalchemy_declarative_extensions.dialects import get_view_cls, get_views
 from sqlalchemy_declarative_extensions.op import ExecuteOp
-from sqlalchemy_declarative_extensions.view.base import View, Views
+from sqlalchemy_declarative_extensions.view.base import (
+    View,
+    Views,
+    render_definitions,
+)
+from sqlalchemy_declarative_extensions.view.cache import DefinitionCache
 
 
 @dataclass
@@ -53,7 +58,18 @@ def compare_views(
     connection: Connection,
     views: Views,
     normalize_with_connection: bool = True,
+    workers: int | None = None,
 ) -> list[Operation]:
+    """Compare the declared `views` against those which exist in the database.
+
+    Arguments:
+        connection: The connection to the database.
+        views: The declared views.
+        normalize_with_connection: Whether to normalize view definitions by
+            round-tripping them through the database (where supported).
+        workers: The number of processes across which `sqlglot` normalization is
+            spread. Defaults to `Views.normalization_workers`.
+    """
     if views.ignore_views:
         warnings.warn(
             "`ignore_views` is deprecated, use `ignore` instead", DeprecationWarning
@@ -77,39 +93,80 @@ def compare_views(
     new_view_names = expected_view_names - existing_view_names
     removed_view_names = existing_view_names - expected_view_names
 
-    for view in concrete_defined_views:
+    cache = DefinitionCache.coerce_from_unknown(views.normalization_cache)
+    if workers is None:
+        workers = views.normalization_workers
+
+    # Ignored views are excluded before any (comparatively expensive) rendering.
+    # Dialects can alter a view's name during normalization (e.g. snowflake's case),
+    # so patterns are matched against both its declared and normalized names.
+    concrete_defined_views = [
+        view
+        for view in concrete_defined_views
+        if not any(
+            fnmatch(name, view_pattern)
+            for name in _view_names(connection, views, view)
+            for view_pattern in views.ignore
+        )
+    ]
+    declared_definitions = render_definitions(
+        connection,
+        concrete_defined_views,
+        using_connection=False,
+        cache=cache,
+        workers=workers,
+    )
+
+    candidates: list[tuple[View, View | None]] = []
+    for view, declared_definition in zip(concrete_defined_views, declared_definitions):
         normalized_view = view.normalize(
-            connection, views.naming_convention, using_connection=False
+            connection, views.naming_convention, definition=declared_definition
         )
 
         view_name = normalized_view.qualified_name
-
-        ignore_matches = any(
-            fnmatch(view_name, view_pattern) for view_pattern in views.ignore
-        )
-        if ignore_matches:
-            continue
-
         view_created = view_name in new_view_names
+        existing_view = None if view_created else existing_views_by_name[view_name]
+        candidates.append((normalized_view, existing_view))
+
+    # Both sides of every comparison are rendered in one batch, which (for postgresql)
+    # avoids creating and reflecting a set of temporary views per view.
+    comparable_views = [
+        v
+        for normalized_view, existing_view in candidates
+        if existing_view is not None
+        for v in (normalized_view, existing_view)
+    ]
+    rendered_definitions = iter(
+        render_definitions(
+            connection,
+            comparable_views,
+            using_connection=normalize_with_connection,
+            cache=cache,
+            workers=workers,
+        )
+    )
 
-        if view_created:
+    for normalized_view, existing_view in candidates:
+        if existing_view is None:
             result.append(CreateViewOp(normalized_view))
-        else:
-            normalized_view = normalized_view.normalize(
-                connection,
-                views.naming_convention,
-                using_connection=normalize_with_connection,
-            )
+            continue
 
-            existing_view = existing_views_by_name[view_name]
-            normalized_existing_view = existing_view.normalize(
-                connection,
-                views.naming_convention,
-                using_connection=normalize_with_connection,
-            )
+        normalized_view = normalized_view.normalize(
+            connection,
+            views.naming_convention,
+            definition=next(rendered_definitions),
+        )
+        normalized_existing_view = existing_view.normalize(
+            connection,
+            views.naming_convention,
+            definition=next(rendered_definitions),
+        )
+
+        if normalized_existing_view != normalized_view:
+            result.append(UpdateViewOp(normalized_existing_view, normalized_view))
 
-            if normalized_existing_view != normalized_view:
-                result.append(UpdateViewOp(normalized_existing_view, normalized_view))
+    if cache is not None:
+        cache.evict()
 
     if not views.ignore_unspecified:
         for removed_view in removed_view_names:
@@ -123,3 +180,13 @@ def compare_views(
             result.append(DropViewOp(view))
 
     return result
+
+
+def _view_names(connection: Connection, views: Views, view: View) -> set[str]:
+    """Produce the declared and normalized names of `view`, without rendering it."""
+    normalized_view = view.normalize(
+        connection,
+        views.naming_convention,
+        definition=view.compile_definition(connection.dialect),
+    )
+    return {view.qualified_name, normalized_view.qualified_name}
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, types
+
+from sqlalchemy_declarative_extensions import Row, Rows, declarative_database
+from sqlalchemy_declarative_extensions.sqlalchemy import declarative_base
+
+_Base = declarative_base()
+
+
+@declarative_database
+class Base(_Base):  # type: ignore
+    __abstract__ = True
+
+    rows = Rows(migration_data="csv").are(
+        Row("foo", id=1, name="new, with a comma", active=None),
+        Row("foo", id=2, name="asdf"),
+        Row("foo", id=3, name="qwer", active=False),
+    )
+
+
+class Foo(Base):
+    __tablename__ = "foo"
+
+    id = Column(types.Integer(), primary_key=True)
+    name = Column(types.Unicode(), nullable=False)
+    active = Column(types.Boolean())
@@ -0,0 +1,45 @@
+from pathlib import Path
+
+from pytest_alembic import MigrationContext
+from sqlalchemy import text
+
+
+def test_apply_autogenerated_revision(alembic_runner: MigrationContext, alembic_engine):
+    alembic_runner.migrate_up_one()
+
+    with alembic_engine.connect() as conn:
+        conn.execute(
+            text("INSERT INTO foo (id, name, active) VALUES (2, 'changeme', True)")
+        )
+        conn.execute(
+            text("INSERT INTO foo (id, name, active) VALUES (3, 'changeme', True)")
+        )
+        conn.execute(text("commit"))
+
+    alembic_runner.generate_revision(autogenerate=True, prevent_file_generation=False)
+
+    versions = Path("migrations/versions")
+    data_files = sorted(p.name for p in (versions / "data").iterdir())
+    assert sorted(f.split(".", 1)[1] for f in data_files) == [
+        "csv.gz",
+        "jsonl",
+        "jsonl",
+    ]
+    assert all(f.startswith("foo-") for f in data_files)
+
+    (revision,) = (p for p in versions.glob("*.py") if p.name != "a63ad8efc2f4_.py")
+    content = revision.read_text()
+    assert "RowDataFile.relative_to(__file__" in content
+    assert "asdf" not in content
+
+    alembic_runner.migrate_up_one()
+
+    with alembic_engine.connect() as conn:
+        result = conn.execute(text("select * from foo order by id")).fetchall()
+
+    expected_result = [
+        (1, "new, with a comma", None),
+        (2, "asdf", True),
+        (3, "qwer", False),
+    ]
+    assert expected_result == result
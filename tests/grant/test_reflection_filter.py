@@ -0,0 +1,157 @@
+import pytest
+from pytest_mock_resources import create_postgres_fixture
+from sqlalchemy import text
+
+from sqlalchemy_declarative_extensions.dialects import (
+    get_default_grants,
+    get_grants,
+)
+from sqlalchemy_declarative_extensions.dialects.postgresql.acl import (
+    parse_acl,
+    parse_default_acl,
+)
+from sqlalchemy_declarative_extensions.sql import qualify_name
+
+pg = create_postgres_fixture(scope="function", engine_kwargs={"echo": True})
+
+
+def create_grants(conn):
+    conn.execute(text("CREATE ROLE acl_read"))
+    conn.execute(text("CREATE ROLE acl_write"))
+    conn.execute(text("CREATE SCHEMA other"))
+    conn.execute(text("CREATE TABLE foo (id serial)"))
+    conn.execute(text("CREATE TABLE other.bar (id serial)"))
+    conn.execute(text("CREATE TABLE untouched (id integer)"))
+    conn.execute(text("GRANT SELECT ON foo, other.bar TO acl_read"))
+    conn.execute(text("GRANT INSERT, UPDATE ON foo TO acl_write WITH GRANT OPTION"))
+    conn.execute(text("GRANT USAGE ON SEQUENCE foo_id_seq TO acl_write"))
+    conn.execute(text("GRANT SELECT ON other.bar TO PUBLIC"))
+    conn.execute(text("GRANT USAGE ON SCHEMA other TO acl_read"))
+    conn.execute(
+        text(
+            "ALTER DEFAULT PRIVILEGES IN SCHEMA other GRANT SELECT ON TABLES TO acl_read"
+        )
+    )
+    conn.execute(
+        text(
+            "ALTER DEFAULT PRIVILEGES IN SCHEMA public GRANT INSERT ON TABLES TO acl_write"
+        )
+    )
+
+
+@pytest.mark.grant
+@pytest.mark.parametrize(
+    "roles",
+    [{"acl_read"}, {"acl_write", "PUBLIC"}, {"user"}, {"acl_read", "user"}, set()],
+)
+def test_filtered_by_role(pg, roles):
+    with pg.connect() as conn:
+        create_grants(conn)
+
+        expected = [
+            g for g in get_grants(conn, expanded=True) if g.grant.target_role in roles
+        ]
+        assert set(get_grants(conn, roles=roles, expanded=True)) == set(expected)
+
+        expected_defaults = [
+            g
+            for g in get_default_grants(conn, expanded=True)
+            if g.grant.target_role in roles
+        ]
+        result = get_default_grants(conn, roles=roles, expanded=True)
+        assert set(result) == set(expected_defaults)
+
+
+@pytest.mark.grant
+def test_filtered_by_schema(pg):
+    with pg.connect() as conn:
+        create_grants(conn)
+
+        grants = get_grants(conn, roles={"acl_read", "PUBLIC"}, schemas={"other"})
+        assert sorted((g.targets, g.grant.target_role) for g in grants) == [
+            (("other",), "acl_read"),
+            (("other.bar",), "PUBLIC"),
+            (("other.bar",), "acl_read"),
+        ]
+
+        grants = get_grants(conn, schemas={"public"})
+        assert {g.targets for g in grants} == {
+            ("foo",),
+            ("foo_id_seq",),
+            ("untouched",),
+        }
+
+        default_grants = get_default_grants(conn, schemas={"other"})
+        assert [g.default_grant.in_schemas for g in default_grants] == [("other",)]
+
+
+@pytest.mark.grant
+@pytest.mark.parametrize("expanded", [True, False])
+def test_matches_parsed_acl(pg, expanded):
+    with pg.connect() as conn:
+        create_grants(conn)
+        conn.execute(text("CREATE ROLE acl_grantor"))
+        conn.execute(text("GRANT SELECT ON foo TO acl_grantor WITH GRANT OPTION"))
+        conn.execute(text("SET ROLE acl_grantor"))
+        conn.execute(text("GRANT SELECT ON foo TO acl_write"))
+        conn.execute(text("RESET ROLE"))
+
+        records = conn.execute(
+            text(
+                "SELECT n.nspname, c.relname, c.relkind, r.rolname, c.relacl::text[] "
+                "FROM pg_class c "
+                "JOIN pg_namespace n ON n.oid = c.relnamespace "
+                "JOIN pg_roles r ON r.oid = c.relowner "
+                "WHERE n.nspname IN ('public', 'other') AND c.relkind IN ('r', 'S') "
+                "UNION ALL "
+                "SELECT NULL, n.nspname, 'n', r.rolname, n.nspacl::text[] "
+                "FROM pg_namespace n JOIN pg_roles r ON r.oid = n.nspowner "
+                "WHERE n.nspname = 'other'"
+            )
+        ).fetchall()
+        expected = [
+            grant
+            for schema, name, relkind, owner, acl in records
+            for acl_item in acl or [None]
+            for grant in parse_acl(
+                acl_item,
+                relkind,
+                qualify_name(schema, name),
+                owner=owner,
+                expanded=expanded,
+            )
+        ]
+        assert sorted(get_grants(conn, expanded=expanded), key=repr) == sorted(
+            expected, key=repr
+        )
+
+        records = conn.execute(
+            text(
+                "SELECT n.nspname, d.defaclobjtype, d.defaclacl::text[] "
+                "FROM pg_default_acl d "
+                "JOIN pg_namespace n ON n.oid = d.defaclnamespace"
+            )
+        ).fetchall()
+        expected_defaults = [
+            grant
+            for schema, object_type, acl in records
+            for acl_item in acl
+            for grant in parse_default_acl(
+                acl_item, object_type, schema, current_role="user", expanded=expanded
+            )
+        ]
+        assert sorted(get_default_grants(conn, expanded=expanded), key=repr) == sorted(
+            expected_defaults, key=repr
+        )
+
+
+@pytest.mark.grant
+def test_quoted_role_name(pg):
+    with pg.connect() as conn:
+        conn.execute(text('CREATE ROLE "acl ""quoted"", role"'))
+        conn.execute(text("CREATE TABLE foo (id integer)"))
+        conn.execute(text('GRANT SELECT ON foo TO "acl ""quoted"", role"'))
+
+        (grant,) = get_grants(conn, roles={'acl "quoted", role'})
+        assert grant.targets == ("foo",)
+        assert grant.grant.target_role == 'acl "quoted", role'
@@ -41,3 +41,13 @@ def test_single_row_ops(pytester):
 @pytest.mark.alembic
 def test_row_rewriter(pytester):
     successful_test_run(pytester, count=1)
+
+
+@pytest.mark.alembic
+def test_upsert_rows(pytester):
+    successful_test_run(pytester, count=1)
+
+
+@pytest.mark.alembic
+def test_rows_migration_data(pytester):
+    successful_test_run(pytester, count=1)
@@ -0,0 +1,144 @@
+import pytest
+from pytest_mock_resources import create_postgres_fixture, create_sqlite_fixture
+from sqlalchemy import (
+    Column,
+    MetaData,
+    Table,
+    create_engine,
+    func,
+    null,
+    select,
+    text,
+    types,
+)
+from sqlalchemy.dialects import mysql, postgresql
+
+from sqlalchemy_declarative_extensions.row.compare import UpdateRowOp
+
+pg = create_postgres_fixture(scope="function", engine_kwargs={"echo": True})
+sqlite = create_sqlite_fixture(scope="function")
+
+metadata = MetaData()
+foo = Table(
+    "foo",
+    metadata,
+    Column("kind", types.Unicode(), primary_key=True),
+    Column("id", types.Integer(), primary_key=True),
+    Column("name", types.Unicode(), nullable=True),
+    Column("active", types.Boolean(), nullable=True),
+)
+
+to_values = [
+    {"kind": "a", "id": 1, "name": "one"},
+    {"kind": "a", "id": 2, "name": null()},
+    {"kind": "a", "id": 3, "name": "three"},
+    {"kind": "b", "id": 1, "name": "b1", "active": False},
+    {"kind": "b", "id": 2, "name": "b2", "active": True},
+    {"kind": "b", "id": 3, "name": func.upper("b3")},
+]
+
+
+@pytest.mark.parametrize("engine_name", ["pg", "sqlite"])
+def test_execute_batched(engine_name, request):
+    engine = request.getfixturevalue(engine_name)
+    with engine.connect() as conn:
+        metadata.create_all(conn)
+        for kind in "abc":
+            for id in range(1, 4):
+                conn.execute(
+                    text(
+                        "INSERT INTO foo (kind, id, name, active) "
+                        f"VALUES ('{kind}', {id}, 'old', true)"
+                    )
+                )
+
+        op = UpdateRowOp("foo", from_values=[], to_values=to_values, chunk_size=2)
+        statements = op.render(metadata, dialect=conn.dialect)
+
+        # a1/a2 and a3 (by chunk), b1/b2 (by column set), and b3 (by expression)
+        assert len(statements) == 4
+
+        op.execute(conn)
+        result = conn.execute(
+            text("SELECT kind, id, name, active FROM foo ORDER BY kind, id")
+        ).fetchall()
+
+    assert result == [
+        ("a", 1, "one", True),
+        ("a", 2, None, True),
+        ("a", 3, "three", True),
+        ("b", 1, "b1", False),
+        ("b", 2, "b2", True),
+        ("b", 3, "B3", True),
+        ("c", 1, "old", True),
+        ("c", 2, "old", True),
+        ("c", 3, "old", True),
+    ]
+
+
+documents = Table(
+    "documents",
+    metadata,
+    Column("id", types.Integer(), primary_key=True),
+    Column("data", types.JSON(), nullable=True),
+    Column("datab", postgresql.JSONB(), nullable=True),
+)
+
+
+@pytest.mark.parametrize("driver", ["psycopg", "psycopg2"])
+def test_execute_batched_json(pg, driver):
+    url = pg.url.set(drivername=f"postgresql+{driver}")
+    engine = create_engine(url)
+    with engine.connect() as conn:
+        documents.create(conn)
+        conn.execute(documents.insert(), [{"id": 1}, {"id": 2}])
+
+        to_values = [
+            {"id": 1, "data": {"a": [1, 2]}, "datab": {"b": None}},
+            {"id": 2, "data": "text", "datab": [1, "2"]},
+        ]
+        op = UpdateRowOp("documents", from_values=[], to_values=to_values)
+        op.execute(conn)
+
+        result = conn.execute(
+            select(documents.c.data, documents.c.datab).order_by(documents.c.id)
+        ).fetchall()
+
+    engine.dispose()
+    assert result == [({"a": [1, 2]}, {"b": None}), ("text", [1, "2"])]
+
+
+def test_render_pg(pg):
+    with pg.connect() as conn:
+        op = UpdateRowOp("foo", from_values=[], to_values=to_values[:2])
+        [statement] = op.render(metadata, dialect=conn.dialect)
+        rendered = str(
+            statement.compile(
+                dialect=conn.dialect, compile_kwargs={"literal_binds": True}
+            )
+        )
+
+    assert rendered == (
+        "UPDATE foo SET name=CAST(v.name AS VARCHAR) "
+        "FROM (VALUES ('a', 1, 'one'), ('a', 2, NULL)) AS v (kind, id, name) "
+        "WHERE foo.kind = CAST(v.kind AS VARCHAR) AND foo.id = CAST(v.id AS INTEGER)"
+    )
+
+
+def test_render_mysql():
+    dialect = mysql.dialect()
+    op = UpdateRowOp("foo", from_values=[], to_values=to_values[:2])
+    [statement] = op.render(metadata, dialect=dialect)
+    rendered = str(
+        statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+    )
+
+    assert rendered.startswith("UPDATE foo, (SELECT 'a' AS kind, 1 AS id")
+    assert rendered.endswith(
+        "AS v SET foo.name=v.name WHERE foo.kind = v.kind AND foo.id = v.id"
+    )
+
+
+def test_render_without_dialect():
+    op = UpdateRowOp("foo", from_values=[], to_values=to_values)
+    assert len(op.render(metadata)) == len(to_values)
@@ -0,0 +1,90 @@
+import logging
+
+import pytest
+from pytest_mock_resources import create_postgres_fixture, create_sqlite_fixture
+from sqlalchemy import Column, MetaData, Table, func, null, text, types
+
+from sqlalchemy_declarative_extensions.row.compare import InsertRowOp
+
+pg = create_postgres_fixture(scope="function", engine_kwargs={"echo": True})
+sqlite = create_sqlite_fixture(scope="function")
+
+metadata = MetaData()
+foo = Table(
+    "foo",
+    metadata,
+    Column("id", types.Integer(), primary_key=True),
+    Column("name", types.Unicode(), nullable=True),
+)
+bar = Table(
+    "bar",
+    MetaData(),
+    Column("id", types.Integer(), primary_key=True),
+    Column("data", types.JSON(), nullable=True),
+)
+
+values = [
+    {"id": 1, "name": "one"},
+    {"id": 2, "name": null()},
+    {"id": 3, "name": "it's \\ three"},
+    {"id": 4, "name": func.upper("four")},
+    {"id": 5},
+]
+
+
+@pytest.mark.parametrize("engine_name", ["pg", "sqlite"])
+def test_execute_chunked(engine_name, request, caplog):
+    engine = request.getfixturevalue(engine_name)
+    with engine.connect() as conn:
+        metadata.create_all(conn)
+
+        op = InsertRowOp("foo", values, chunk_size=2)
+        with caplog.at_level(
+            logging.INFO, logger="sqlalchemy_declarative_extensions.row.compare"
+        ):
+            op.execute(conn)
+
+        result = conn.execute(text("SELECT id, name FROM foo ORDER BY id")).fetchall()
+
+    assert result == [
+        (1, "one"),
+        (2, None),
+        (3, "it's \\ three"),
+        (4, "FOUR"),
+        (5, None),
+    ]
+
+    # Each chunk's progress is reported along with its elapsed time.
+    progress = [
+        r.getMessage().rsplit(" in ", 1)[0]
+        for r in caplog.records
+        if r.name == "sqlalchemy_declarative_extensions.row.compare"
+    ]
+    assert progress == [
+        "Inserted 2/5 rows into foo",
+        "Inserted 4/5 rows into foo",
+        "Inserted 5/5 rows into foo",
+    ]
+
+
+def test_execute_json_pg(pg):
+    with pg.connect() as conn:
+        bar.create(conn)
+
+        op = InsertRowOp(
+            "bar",
+            [{"id": 1, "data": {"a": 1}}, {"id": 2, "data": [1, "2"]}, {"id": 3}],
+        )
+        op.execute(conn)
+
+        result = conn.execute(bar.select().order_by(bar.c.id)).fetchall()
+
+    assert result == [(1, {"a": 1}), (2, [1, "2"]), (3, None)]
+
+
+def test_render_chunked():
+    op = InsertRowOp("foo", values[:3], chunk_size=2)
+    assert len(op.render(metadata)) == 2
+
+    op = InsertRowOp("foo", values[0])
+    assert len(op.render(metadata)) == 1
@@ -0,0 +1,101 @@
+import logging
+
+import pytest
+from pytest_mock_resources import create_postgres_fixture, create_sqlite_fixture
+from sqlalchemy import Column, MetaData, Table, text, types
+from sqlalchemy.dialects import postgresql
+
+from sqlalchemy_declarative_extensions import Row, Rows
+from sqlalchemy_declarative_extensions.row.compare import (
+    DeleteRowOp,
+    InsertRowOp,
+    compare_rows,
+)
+
+pg = create_postgres_fixture(scope="function", engine_kwargs={"echo": True})
+sqlite = create_sqlite_fixture(scope="function")
+
+metadata = MetaData()
+foo = Table(
+    "foo",
+    metadata,
+    Column("id", types.Integer(), primary_key=True),
+    Column("name", types.Unicode(), nullable=True),
+)
+bar = Table(
+    "bar",
+    metadata,
+    Column("a", types.Integer(), primary_key=True),
+    Column("b", types.Unicode(), primary_key=True),
+)
+
+
+def test_render_chunks_in_primary_key_order():
+    op = DeleteRowOp("foo", [{"id": 4}, {"id": 1}, {"id": 3}, {"id": 2}], chunk_size=3)
+    queries = [
+        str(
+            q.compile(
+                dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+            )
+        )
+        for q in op.render(metadata)
+    ]
+    assert queries == [
+        "DELETE FROM foo WHERE foo.id IN (1, 2, 3)",
+        "DELETE FROM foo WHERE foo.id IN (4)",
+    ]
+
+
+def test_render_composite_primary_key():
+    op = DeleteRowOp("bar", [{"a": 2, "b": "x"}, {"a": 1, "b": "y"}])
+    (query,) = op.render(metadata)
+    rendered = str(
+        query.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+    assert rendered == "DELETE FROM bar WHERE (bar.a, bar.b) IN ((1, 'y'), (2, 'x'))"
+
+
+@pytest.mark.parametrize("engine_name", ["pg", "sqlite"])
+def test_execute_chunks(engine_name, request, caplog):
+    engine = request.getfixturevalue(engine_name)
+    with engine.connect() as conn:
+        metadata.create_all(conn)
+        InsertRowOp("foo", [{"id": i, "name": str(i)} for i in range(1, 7)]).execute(
+            conn
+        )
+
+        rows = Rows(chunk_size=2).are(Row("foo", id=3, name="3"))
+        (op,) = compare_rows(conn, metadata, rows)
+        assert isinstance(op, DeleteRowOp)
+        assert op.chunk_size == 2
+
+        with caplog.at_level(logging.INFO):
+            op.execute(conn)
+
+        records = conn.execute(text("SELECT id FROM foo")).fetchall()
+        assert records == [(3,)]
+
+    messages = [
+        r.getMessage() for r in caplog.records if r.getMessage().startswith("Deleted")
+    ]
+    assert [m.split(" in ")[0] for m in messages] == [
+        "Deleted 2/5 rows from foo",
+        "Deleted 4/5 rows from foo",
+        "Deleted 5/5 rows from foo",
+    ]
+
+
+def test_commit_chunks(pg):
+    with pg.connect() as conn:
+        metadata.create_all(conn)
+        InsertRowOp("foo", [{"id": i} for i in range(1, 5)]).execute(conn)
+        conn.commit()
+
+        pks = [{"id": i} for i in range(1, 5)]
+        DeleteRowOp("foo", pks, chunk_size=2, commit_chunks=True).execute(conn)
+
+        # Each chunk was committed, so the deletes survive a rollback.
+        conn.rollback()
+        assert conn.execute(text("SELECT count(*) FROM foo")).scalar() == 0
@@ -0,0 +1,105 @@
+import pytest
+from pytest_mock_resources import create_postgres_fixture, create_sqlite_fixture
+from sqlalchemy import Column, MetaData, text, types
+from sqlalchemy import Table as SqlaTable
+
+from sqlalchemy_declarative_extensions import Row, Rows
+from sqlalchemy_declarative_extensions.row import Table, TableRows, compare
+from sqlalchemy_declarative_extensions.row.compare import (
+    DeleteRowOp,
+    InsertRowOp,
+    UpdateRowOp,
+    compare_rows,
+)
+
+pg = create_postgres_fixture(scope="function", engine_kwargs={"echo": True})
+sqlite = create_sqlite_fixture(scope="function")
+
+metadata = MetaData()
+foo = SqlaTable(
+    "foo",
+    metadata,
+    Column("id", types.Integer(), primary_key=True),
+    Column("name", types.Unicode(), nullable=True),
+    Column("active", types.Boolean(), nullable=True),
+)
+
+
+def test_rows_are_compact():
+    row = Row("foo", id=1)
+    assert not hasattr(row, "__dict__")
+
+    users = Table("foo", active=True)
+    first = users.row(id=1)
+    assert not hasattr(users, "__dict__")
+    assert not hasattr(first, "__dict__")
+
+
+def test_table_row_values_are_mutable():
+    users = Table("auth.users", active=True)
+    first, second = users.row(id=1), users.row(id=2)
+    assert (first.schema, first.tablename) == ("auth", "users")
+
+    first.column_values["name"] = "one"
+    first.column_values.update(active=False)
+    assert first == Row("auth.users", id=1, name="one", active=False)
+    assert second == Row("auth.users", id=2, active=True)
+    assert users.column_values == {"active": True}
+
+
+def test_table_rows():
+    users = Table("auth.users", active=True)
+    table_rows = users.rows(["id", "name"], (1, "one"), (2, "two"))
+
+    assert table_rows.qualified_name == "auth.users"
+    assert table_rows.columns == ("active", "id", "name")
+    assert len(table_rows) == 2
+    assert list(table_rows) == [
+        Row("auth.users", id=1, name="one", active=True),
+        Row("auth.users", id=2, name="two", active=True),
+    ]
+
+    with pytest.raises(ValueError):
+        TableRows("users", ["id", "name"], [(1,)])
+
+
+@pytest.mark.parametrize("engine_name", ["pg", "sqlite"])
+def test_compare_table_rows(engine_name, request, monkeypatch):
+    monkeypatch.setattr(compare, "LOOKUP_CHUNK_SIZE", 2)
+
+    rows = Rows().are(
+        TableRows(
+            "foo",
+            ["id", "name", "active"],
+            [(1, "one", False), (2, "two", True), (3, "three", False)],
+        ),
+        Row("foo", id=4, name="four"),
+    )
+
+    engine = request.getfixturevalue(engine_name)
+    with engine.connect() as conn:
+        metadata.create_all(conn)
+        conn.execute(text("INSERT INTO foo (id, name, active) VALUES (2, 'old', true)"))
+        conn.execute(
+            text("INSERT INTO foo (id, name, active) VALUES (5, 'five', true)")
+        )
+
+        result = compare_rows(conn, metadata, rows)
+        assert [type(op) for op in result] == [DeleteRowOp, UpdateRowOp, InsertRowOp]
+        assert result[0].values == [{"id": 5}]
+        assert [v["id"] for v in result[2].values] == [4, 1, 3]
+
+        for op in result:
+            op.execute(conn)
+
+        records = conn.execute(
+            text("SELECT id, name, active FROM foo ORDER BY id")
+        ).fetchall()
+        assert records == [
+            (1, "one", False),
+            (2, "two", True),
+            (3, "three", False),
+            (4, "four", None),
+        ]
+
+        assert compare_rows(conn, metadata, rows) == []
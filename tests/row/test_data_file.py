@@ -0,0 +1,134 @@
+import datetime
+import decimal
+
+import pytest
+from pytest_mock_resources import create_postgres_fixture, create_sqlite_fixture
+from sqlalchemy import Column, MetaData, Table, func, null, text, types
+
+from sqlalchemy_declarative_extensions.row import RowDataFile
+from sqlalchemy_declarative_extensions.row.compare import (
+    DeleteRowOp,
+    InsertRowOp,
+    UpdateRowOp,
+)
+
+pg = create_postgres_fixture(scope="function", engine_kwargs={"echo": True})
+sqlite = create_sqlite_fixture(scope="function")
+
+metadata = MetaData()
+foo = Table(
+    "foo",
+    metadata,
+    Column("id", types.Integer(), primary_key=True),
+    Column("name", types.Unicode(), nullable=True),
+    Column("active", types.Boolean(), nullable=True),
+    Column("created", types.Date(), nullable=True),
+    Column("price", types.Numeric(10, 2), nullable=True),
+    Column("data", types.JSON(), nullable=True),
+)
+
+values = [
+    {
+        "id": 1,
+        "name": "one, two",
+        "active": True,
+        "created": datetime.date(2024, 1, 2),
+        "price": decimal.Decimal("1.50"),
+    },
+    {"id": 2, "name": "\\N ", "active": False, "created": None, "price": null()},
+    {"id": 3, "name": "", "active": None, "created": None, "price": None},
+]
+
+
+@pytest.mark.parametrize("format", ["json", "csv"])
+def test_round_trip(format, tmp_path):
+    filename = RowDataFile.write(tmp_path, "foo", values, format=format)
+    assert filename.startswith("foo-")
+
+    # Files are named by their content.
+    assert RowDataFile.write(tmp_path, "foo", values, format=format) == filename
+
+    data_file = RowDataFile.relative_to(tmp_path / "revision.py", filename)
+    rows = list(data_file.read(foo))
+
+    expected = [dict(row) for row in values]
+    expected[1]["price"] = None
+    assert rows == expected
+
+
+@pytest.mark.parametrize("format", ["json", "csv"])
+def test_round_trip_escaped(format, tmp_path):
+    escaped_values = [
+        {"id": 1, "name": "\\N", "data": "a string"},
+        {"id": 2, "name": "\\\\N", "data": {"a": [1, "\\N"]}},
+        {"id": 3, "name": None, "data": 4},
+        {"id": 4, "name": "\\", "data": None},
+    ]
+    filename = RowDataFile.write(
+        tmp_path, "foo", escaped_values, format=format, table=foo
+    )
+
+    rows = list(RowDataFile(tmp_path / filename).read(foo))
+    assert rows == escaped_values
+
+
+def test_unrepresentable_values(tmp_path):
+    with pytest.raises(TypeError):
+        RowDataFile.write(tmp_path, "foo", [{"id": 1, "name": func.upper("a")}])
+
+    with pytest.raises(TypeError):
+        RowDataFile.write(tmp_path, "foo", [{"id": 1, "name": object()}])
+
+    with pytest.raises(ValueError):
+        RowDataFile.write(tmp_path, "foo", [{"id": 1}, {"id": 2, "name": "a"}], "csv")
+
+
+@pytest.mark.parametrize("engine_name", ["pg", "sqlite"])
+@pytest.mark.parametrize("format", ["json", "csv"])
+def test_execute(engine_name, format, request, tmp_path):
+    inserts = RowDataFile(tmp_path / RowDataFile.write(tmp_path, "foo", values, format))
+    updates = RowDataFile(
+        tmp_path
+        / RowDataFile.write(
+            tmp_path,
+            "foo",
+            [{"id": 1, "name": "uno"}, {"id": 2, "name": "dos"}],
+            "json",
+        )
+    )
+
+    engine = request.getfixturevalue(engine_name)
+    with engine.connect() as conn:
+        metadata.create_all(conn)
+
+        InsertRowOp("foo", inserts, chunk_size=2).execute(conn)
+        UpdateRowOp("foo", [], updates, chunk_size=2).execute(conn)
+
+        result = conn.execute(
+            text("SELECT id, name, active FROM foo ORDER BY id")
+        ).fetchall()
+
+    assert result == [(1, "uno", True), (2, "dos", False), (3, "", None)]
+
+
+@pytest.mark.parametrize("engine_name", ["pg", "sqlite"])
+@pytest.mark.parametrize("format", ["json", "csv"])
+def test_execute_reverse(engine_name, format, request, tmp_path):
+    inserts = RowDataFile(tmp_path / RowDataFile.write(tmp_path, "foo", values, format))
+
+    engine = request.getfixturevalue(engine_name)
+    with engine.connect() as conn:
+        metadata.create_all(conn)
+        conn.execute(foo.insert().values(id=4, name="unrelated"))
+
+        op = InsertRowOp("foo", inserts, chunk_size=2)
+        op.execute(conn)
+
+        reverse = op.reverse()
+        assert reverse == DeleteRowOp("foo", inserts, chunk_size=2)
+        assert len(reverse.render(metadata)) == 2
+
+        reverse.execute(conn)
+        result = conn.execute(text("SELECT id FROM foo")).fetchall()
+
+    assert result == [(4,)]
@@ -0,0 +1,110 @@
+from pytest_mock_resources import create_postgres_fixture
+from sqlalchemy import Column, MetaData, Table, text, types
+
+from sqlalchemy_declarative_extensions import Row, Rows
+from sqlalchemy_declarative_extensions.row import compare
+from sqlalchemy_declarative_extensions.row.compare import UpdateRowOp, compare_rows
+from sqlalchemy_declarative_extensions.row.digest import (
+    find_unchanged_tables,
+    row_text,
+)
+
+pg = create_postgres_fixture(scope="function", engine_kwargs={"echo": True})
+
+metadata = MetaData()
+foo = Table(
+    "foo",
+    metadata,
+    Column("kind", types.Unicode(), primary_key=True),
+    Column("id", types.Integer(), primary_key=True),
+    Column("name", types.Unicode(), nullable=True),
+    Column("active", types.Boolean(), nullable=True),
+    Column("score", types.Float(), nullable=True),
+)
+
+rows = Rows(ignore_unspecified=True).are(
+    Row("foo", kind="b", id=2, name='it\'s a \\ "name"', active=True),
+    Row("foo", kind="a", id=1, name="ünïcödé", active=False),
+    Row("foo", kind="a", id=10, name=None),
+    Row("foo", kind="B", id=3),
+)
+
+
+def _seed(conn):
+    metadata.create_all(conn)
+    conn.execute(
+        foo.insert().values(
+            [
+                {"kind": "b", "id": 2, "name": 'it\'s a \\ "name"', "active": True},
+                {"kind": "a", "id": 1, "name": "ünïcödé", "active": False},
+                {"kind": "a", "id": 10, "name": None, "active": True},
+                {"kind": "B", "id": 3, "name": "ignored", "active": None},
+            ]
+        )
+    )
+
+
+def test_unchanged_skips_fetch(pg, monkeypatch):
+    monkeypatch.setattr(compare, "LOOKUP_CHUNK_SIZE", 3)
+
+    with pg.connect() as conn:
+        _seed(conn)
+
+        def collect_existing_record_data(connection, pks_by_table, *args, **kwargs):
+            assert pks_by_table == {}
+            return {}
+
+        monkeypatch.setattr(
+            compare, "collect_existing_record_data", collect_existing_record_data
+        )
+        assert compare_rows(conn, metadata, rows) == []
+
+
+def test_changed_falls_back(pg):
+    with pg.connect() as conn:
+        _seed(conn)
+        conn.execute(text("UPDATE foo SET name = 'changed' WHERE id = 1"))
+
+        pk_to_row = {
+            "foo": {(r.column_values["kind"], r.column_values["id"]): r for r in rows}
+        }
+        assert find_unchanged_tables(conn, pk_to_row, {"foo": True}, 1000) == set()
+
+        changed_rows = Rows(ignore_unspecified=True).are(*list(rows)[:2])
+        result = compare_rows(conn, metadata, changed_rows)
+        assert result == [
+            UpdateRowOp(
+                "foo",
+                from_values=[
+                    {"kind": "a", "id": 1, "name": "changed", "active": False}
+                ],
+                to_values=[{"kind": "a", "id": 1, "name": "ünïcödé", "active": False}],
+            )
+        ]
+
+
+def test_missing_row(pg):
+    with pg.connect() as conn:
+        _seed(conn)
+        conn.execute(text("DELETE FROM foo WHERE id = 3"))
+
+        pk_to_row = {
+            "foo": {(r.column_values["kind"], r.column_values["id"]): r for r in rows}
+        }
+        assert find_unchanged_tables(conn, pk_to_row, {"foo": True}, 1000) == set()
+
+
+def test_unsupported_types(pg):
+    with pg.connect() as conn:
+        _seed(conn)
+
+        row = Row("foo", kind="a", id=1, score=1.5)
+        pk_to_row = {"foo": {("a", 1): row}}
+        assert find_unchanged_tables(conn, pk_to_row, {"foo": True}, 1000) == set()
+
+
+def test_row_text():
+    assert (
+        row_text({"a": 1, "b": None, "c": "x,y"}, ["a", "b", "c"]) == "1:1,null,3:x,y"
+    )
+    assert row_text({"a": "null"}, ["a"]) != row_text({"a": None}, ["a"])
@@ -0,0 +1,75 @@
+import pytest
+from pytest_mock_resources import create_postgres_fixture, create_sqlite_fixture
+from sqlalchemy import Column, MetaData, Table, event, text, types
+
+from sqlalchemy_declarative_extensions import Row, Rows
+from sqlalchemy_declarative_extensions.dialects import get_existing_tables
+from sqlalchemy_declarative_extensions.row.cache import ReflectionCache
+from sqlalchemy_declarative_extensions.row.compare import resolve_existing_tables
+
+pg = create_postgres_fixture(scope="function", engine_kwargs={"echo": True})
+sqlite = create_sqlite_fixture(scope="function")
+
+metadata = MetaData()
+foo = Table("foo", metadata, Column("id", types.Integer(), primary_key=True))
+
+
+class QueryCounter:
+    def __init__(self, conn):
+        self.count = 0
+        event.listen(conn, "before_cursor_execute", self)
+
+    def __call__(self, *_):
+        self.count += 1
+
+
+@pytest.mark.parametrize("engine_name", ["pg", "sqlite"])
+def test_get_existing_tables(engine_name, request):
+    engine = request.getfixturevalue(engine_name)
+    with engine.connect() as conn:
+        metadata.create_all(conn)
+        conn.execute(text("CREATE VIEW foo_view AS SELECT id FROM foo"))
+
+        if engine_name == "pg":
+            conn.execute(text("CREATE SCHEMA bar"))
+            conn.execute(text("CREATE TABLE bar.baz (id integer)"))
+            names = ["foo", "foo_view", "missing", "public.foo", "bar.baz", "bar.foo"]
+            expected = {"foo", "foo_view", "public.foo", "bar.baz"}
+        else:
+            names = ["foo", "foo_view", "missing", "main.foo", "main.missing"]
+            expected = {"foo", "foo_view", "main.foo"}
+
+        assert get_existing_tables(conn, names) == expected
+
+
+def test_single_query(pg):
+    rows = Rows(included_tables=["bar.baz", "bar.qux"]).are(
+        *[Row(f"foo{i}", id=1) for i in range(20)],
+        Row("bar.foo", id=1),
+    )
+
+    with pg.connect() as conn:
+        conn.execute(text("CREATE SCHEMA bar"))
+        conn.execute(text("CREATE TABLE foo3 (id integer)"))
+        conn.execute(text("CREATE TABLE bar.baz (id integer)"))
+
+        counter = QueryCounter(conn)
+        with ReflectionCache.scope(conn) as cache:
+            result = resolve_existing_tables(conn, rows)
+            assert counter.count == 1
+
+            assert {name for name, exists in result.items() if exists} == {
+                "foo3",
+                "bar.baz",
+            }
+            assert len(result) == 23
+
+            # The result is shared within the scope, until DDL invalidates it.
+            resolve_existing_tables(conn, rows)
+            assert counter.count == 1
+
+            conn.execute(text("CREATE TABLE bar.foo (id integer)"))
+            result = resolve_existing_tables(conn, rows)
+            assert result["bar.foo"] is True
+            assert counter.count == 3
+            assert cache.existing_tables["bar.foo"] is True
@@ -0,0 +1,127 @@
+import pytest
+from pytest_mock_resources import create_postgres_fixture
+from sqlalchemy import Column, ForeignKey, MetaData, Table, text, types
+
+from sqlalchemy_declarative_extensions import Row, Rows, register_sqlalchemy_events
+from sqlalchemy_declarative_extensions.row.compare import (
+    DeleteRowOp,
+    InsertRowOp,
+    UpdateRowOp,
+    compare_rows,
+    sort_row_ops,
+)
+
+pg = create_postgres_fixture(scope="function", engine_kwargs={"echo": True})
+
+metadata = MetaData()
+Table(
+    "grandchild",
+    metadata,
+    Column("id", types.Integer(), primary_key=True),
+    Column("child_id", ForeignKey("child.id"), nullable=False),
+)
+Table(
+    "child",
+    metadata,
+    Column("id", types.Integer(), primary_key=True),
+    Column("parent_id", ForeignKey("parent.id"), nullable=False),
+)
+Table("parent", metadata, Column("id", types.Integer(), primary_key=True))
+
+
+def test_ops_ordered_by_foreign_keys(pg):
+    rows = Rows(included_tables=["grandchild", "child", "parent"]).are(
+        Row("grandchild", id=2, child_id=2),
+        Row("child", id=2, parent_id=2),
+        Row("parent", id=2),
+    )
+
+    with pg.connect() as conn:
+        metadata.create_all(conn)
+        conn.execute(text("INSERT INTO parent (id) VALUES (1)"))
+        conn.execute(text("INSERT INTO child (id, parent_id) VALUES (1, 1)"))
+        conn.execute(text("INSERT INTO grandchild (id, child_id) VALUES (1, 1)"))
+
+        result = compare_rows(conn, metadata, rows)
+        assert [(type(op), op.table) for op in result] == [
+            (DeleteRowOp, "grandchild"),
+            (DeleteRowOp, "child"),
+            (DeleteRowOp, "parent"),
+            (InsertRowOp, "parent"),
+            (InsertRowOp, "child"),
+            (InsertRowOp, "grandchild"),
+        ]
+
+        for op in result:
+            op.execute(conn)
+
+        assert compare_rows(conn, metadata, rows) == []
+
+
+def test_sort_ignores_unrelated_cycles():
+    cyclic_metadata = MetaData()
+    Table(
+        "a",
+        cyclic_metadata,
+        Column("id", types.Integer(), primary_key=True),
+        Column("b_id", ForeignKey("b.id")),
+    )
+    Table(
+        "b",
+        cyclic_metadata,
+        Column("id", types.Integer(), primary_key=True),
+        Column("a_id", ForeignKey("a.id")),
+    )
+    for table in metadata.tables.values():
+        table.to_metadata(cyclic_metadata)
+
+    # Sorting every table of the metadata would warn (i.e. error) about the cycle.
+    ops = [
+        InsertRowOp("child", [{"id": 1, "parent_id": 1}]),
+        UpdateRowOp("unknown", [{"id": 1}], [{"id": 1}]),
+        InsertRowOp("parent", [{"id": 1}]),
+        DeleteRowOp("child", [{"id": 2}]),
+        DeleteRowOp("parent", [{"id": 2}]),
+    ]
+    result = sort_row_ops(cyclic_metadata, ops)
+    assert [(type(op), op.table) for op in result] == [
+        (DeleteRowOp, "child"),
+        (DeleteRowOp, "parent"),
+        (InsertRowOp, "parent"),
+        (InsertRowOp, "child"),
+        (UpdateRowOp, "unknown"),
+    ]
+
+
+@pytest.mark.parametrize("defer_constraints", [True, False])
+def test_defer_constraints(pg, defer_constraints):
+    tree_metadata = MetaData()
+    Table(
+        "tree",
+        tree_metadata,
+        Column("id", types.Integer(), primary_key=True),
+        Column(
+            "parent_id",
+            ForeignKey("tree.id", deferrable=True, initially="IMMEDIATE"),
+            nullable=True,
+        ),
+    )
+
+    # With one row per statement, the child row is written before its parent.
+    tree_metadata.info["rows"] = Rows(
+        chunk_size=1, defer_constraints=defer_constraints
+    ).are(
+        Row("tree", id=1, parent_id=2),
+        Row("tree", id=2, parent_id=None),
+    )
+    register_sqlalchemy_events(tree_metadata, rows=True)
+
+    if not defer_constraints:
+        with pytest.raises(Exception, match="foreign key constraint"):
+            tree_metadata.create_all(pg)
+        return
+
+    tree_metadata.create_all(pg)
+    with pg.connect() as conn:
+        records = conn.execute(text("SELECT id, parent_id FROM tree ORDER BY id"))
+        assert records.fetchall() == [(1, 2), (2, None)]
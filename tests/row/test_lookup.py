@@ -0,0 +1,130 @@
+import pytest
+from pytest_mock_resources import create_postgres_fixture, create_sqlite_fixture
+from sqlalchemy import Column, MetaData, Table, text, types
+
+from sqlalchemy_declarative_extensions import Row, Rows
+from sqlalchemy_declarative_extensions.row import RowDataFile, compare
+from sqlalchemy_declarative_extensions.row.compare import (
+    DeleteRowOp,
+    InsertRowOp,
+    UpdateRowOp,
+    collect_existing_record_data,
+    compare_rows,
+)
+
+pg = create_postgres_fixture(scope="function", engine_kwargs={"echo": True})
+sqlite = create_sqlite_fixture(scope="function")
+
+metadata = MetaData()
+foo = Table(
+    "foo",
+    metadata,
+    Column("id", types.Integer(), primary_key=True),
+    Column("name", types.Unicode(), nullable=True),
+)
+bar = Table(
+    "bar",
+    metadata,
+    Column("kind", types.Unicode(), primary_key=True),
+    Column("id", types.Integer(), primary_key=True),
+    Column("name", types.Unicode(), nullable=True),
+)
+
+
+@pytest.mark.parametrize("engine_name", ["pg", "sqlite"])
+def test_collect_existing_record_data_chunked(engine_name, request):
+    engine = request.getfixturevalue(engine_name)
+    with engine.connect() as conn:
+        metadata.create_all(conn)
+        for i in range(10):
+            conn.execute(text(f"INSERT INTO foo (id, name) VALUES ({i}, 'foo{i}')"))
+            conn.execute(
+                text(f"INSERT INTO bar (kind, id, name) VALUES ('a', {i}, 'a{i}')")
+            )
+
+        pks_by_table = {
+            foo: [(i,) for i in range(5, 15)],
+            bar: [("a", 2), ("a", 3), ("b", 2), ("a", 20)],
+        }
+        result = collect_existing_record_data(
+            conn, pks_by_table, {"foo": True, "bar": True}, chunk_size=3
+        )
+
+    assert result == {
+        "foo": {(i,): {"id": i, "name": f"foo{i}"} for i in range(5, 10)},
+        "bar": {
+            ("a", 2): {"kind": "a", "id": 2, "name": "a2"},
+            ("a", 3): {"kind": "a", "id": 3, "name": "a3"},
+        },
+    }
+
+
+@pytest.mark.parametrize("engine_name", ["pg", "sqlite"])
+def test_compare_rows_chunked(engine_name, request, monkeypatch):
+    monkeypatch.setattr(compare, "LOOKUP_CHUNK_SIZE", 2)
+
+    engine = request.getfixturevalue(engine_name)
+    with engine.connect() as conn:
+        metadata.create_all(conn)
+        conn.execute(text("INSERT INTO bar (kind, id, name) VALUES ('a', 1, 'a1')"))
+        conn.execute(text("INSERT INTO bar (kind, id, name) VALUES ('a', 2, 'a2')"))
+        conn.execute(text("INSERT INTO bar (kind, id, name) VALUES ('b', 1, 'b1')"))
+
+        rows = Rows(ignore_unspecified=True).are(
+            Row("bar", kind="a", id=1, name="a1"),
+            Row("bar", kind="a", id=2, name="changed"),
+            Row("bar", kind="b", id=1, name="b1"),
+            Row("bar", kind="b", id=2, name="b2"),
+        )
+        result = compare_rows(conn, metadata, rows)
+
+    assert result == [
+        UpdateRowOp(
+            "bar",
+            from_values=[{"kind": "a", "id": 2, "name": "a2"}],
+            to_values=[{"kind": "a", "id": 2, "name": "changed"}],
+        ),
+        InsertRowOp("bar", values=[{"kind": "b", "id": 2, "name": "b2"}]),
+    ]
+
+
+@pytest.mark.parametrize("engine_name", ["pg", "sqlite"])
+def test_delete_unspecified_chunked(engine_name, request, monkeypatch):
+    monkeypatch.setattr(compare, "LOOKUP_CHUNK_SIZE", 2)
+
+    engine = request.getfixturevalue(engine_name)
+    with engine.connect() as conn:
+        metadata.create_all(conn)
+        for kind, id in [("a", 1), ("a", 2), ("a", 3), ("b", 1), ("b", 2)]:
+            conn.execute(text(f"INSERT INTO bar (kind, id) VALUES ('{kind}', {id})"))
+
+        rows = Rows().are(
+            Row("bar", kind="a", id=2),
+            Row("bar", kind="b", id=1),
+        )
+        result = compare_rows(conn, metadata, rows)
+
+        # Beyond a single chunk, the unspecified rows are spilled to a data file.
+        [op] = result
+        assert isinstance(op, DeleteRowOp)
+        assert isinstance(op.values, RowDataFile)
+
+        deleted = [(v["kind"], v["id"]) for v in op.values.read(metadata.tables["bar"])]
+        assert deleted == [("a", 1), ("a", 3), ("b", 2)]
+
+        op.execute(conn)
+        remaining = conn.execute(text("SELECT kind, id FROM bar ORDER BY kind, id"))
+        assert remaining.fetchall() == [("a", 2), ("b", 1)]
+
+
+@pytest.mark.parametrize("engine_name", ["pg", "sqlite"])
+def test_delete_unspecified_all(engine_name, request):
+    engine = request.getfixturevalue(engine_name)
+    with engine.connect() as conn:
+        metadata.create_all(conn)
+        conn.execute(text("INSERT INTO foo (id) VALUES (1)"))
+
+        rows = Rows(included_tables=["foo"])
+        result = compare_rows(conn, metadata, rows)
+
+    assert result == [DeleteRowOp("foo", [{"id": 1}])]
@@ -0,0 +1,188 @@
+import datetime
+import decimal
+import enum
+import logging
+
+import pytest
+from pytest_mock_resources import create_postgres_fixture, create_sqlite_fixture
+from sqlalchemy import Column, MetaData, Table, text, types
+from sqlalchemy.dialects.postgresql import JSONB
+
+from sqlalchemy_declarative_extensions import Row, Rows
+from sqlalchemy_declarative_extensions.row.compare import UpdateRowOp, compare_rows
+from sqlalchemy_declarative_extensions.row.normalize import (
+    column_normalizer,
+    compare_row_values,
+    table_normalizers,
+)
+
+pg = create_postgres_fixture(scope="function", engine_kwargs={"echo": True})
+sqlite = create_sqlite_fixture(scope="function")
+
+
+class Color(enum.Enum):
+    red = "r"
+    green = "g"
+
+
+class Size(enum.IntEnum):
+    small = 1
+    large = 2
+
+
+class Shape(str, enum.Enum):
+    circle = "c"
+    square = "s"
+
+
+metadata = MetaData()
+foo = Table(
+    "foo",
+    metadata,
+    Column("id", types.Integer(), primary_key=True),
+    Column("price", types.Numeric(10, 2), nullable=True),
+    Column("ratio", types.Float(), nullable=True),
+    Column("created", types.DateTime(timezone=True), nullable=True),
+    Column("day", types.Date(), nullable=True),
+    Column("color", types.Enum(Color, native_enum=False), nullable=True),
+    Column("active", types.Boolean(), nullable=True),
+)
+
+json_metadata = MetaData()
+Table(
+    "docs",
+    json_metadata,
+    Column("id", types.Integer(), primary_key=True),
+    Column("doc", JSONB(), nullable=True),
+)
+
+
+def test_column_normalizers():
+    numeric = column_normalizer(types.Numeric(10, 2))
+    assert numeric(1.1) == numeric(decimal.Decimal("1.10")) == decimal.Decimal("1.10")
+    assert numeric(1.005) == decimal.Decimal("1.01")
+
+    timestamp = column_normalizer(types.DateTime(timezone=True))
+    naive = datetime.datetime(2024, 1, 1, 12)
+    aware = datetime.datetime(
+        2024, 1, 1, 14, tzinfo=datetime.timezone(datetime.timedelta(hours=2))
+    )
+    assert timestamp(naive) == timestamp(aware) == timestamp("2024-01-01 12:00:00")
+
+    enum_type = column_normalizer(types.Enum("red", "green"))
+    assert enum_type(Color.red) == "red"
+    assert column_normalizer(types.Enum("r", "g"))(Color.red) == "r"
+
+    json = column_normalizer(types.JSON())
+    assert json('{"b": 1, "a": [1, 2]}') == json({"a": [1, 2], "b": 1})
+
+    assert column_normalizer(types.Integer())(None) is None
+
+
+def test_compare_row_values():
+    normalizers = {"price": column_normalizer(types.Numeric(10, 2))}
+
+    assert compare_row_values(normalizers, {"id": 1}, {"id": 1}) == (True, False)
+    assert compare_row_values(
+        normalizers,
+        {"id": 1, "price": 1.5},
+        {"id": 1, "price": decimal.Decimal("1.50")},
+    ) == (True, True)
+    assert compare_row_values(
+        normalizers, {"id": 1, "price": 1.5}, {"id": 1, "price": decimal.Decimal("2")}
+    ) == (False, False)
+
+
+def test_enum_values_without_labels():
+    normalizers = {
+        "size": column_normalizer(types.Integer()),
+        "shape": column_normalizer(types.String()),
+    }
+
+    assert compare_row_values(normalizers, {"size": Size.small}, {"size": 1}) == (
+        True,
+        True,
+    )
+    assert compare_row_values(normalizers, {"size": Size.large}, {"size": 1}) == (
+        False,
+        False,
+    )
+    assert compare_row_values(normalizers, {"shape": Shape.circle}, {"shape": "c"}) == (
+        True,
+        True,
+    )
+    assert compare_row_values(
+        normalizers, {"shape": Shape.circle}, {"shape": "circle"}
+    ) == (False, False)
+
+
+def test_declared_enum_labels():
+    reflected = Table("foo", MetaData(), Column("color", types.String(5)))
+    normalizers = table_normalizers(reflected, foo)
+    assert normalizers["color"](Color.red) == "red"
+
+    assert table_normalizers(reflected)["color"](Color.red) == "r"
+
+
+@pytest.mark.parametrize("engine_name", ["pg", "sqlite"])
+def test_equivalent_rows_are_not_updated(engine_name, request, caplog):
+    rows = Rows().are(
+        Row(
+            "foo",
+            id=1,
+            price=1.1,
+            ratio=decimal.Decimal("0.5"),
+            created=datetime.datetime(
+                2024, 1, 1, 14, tzinfo=datetime.timezone(datetime.timedelta(hours=2))
+            ),
+            day=datetime.date(2024, 1, 1),
+            color=Color.red,
+            active=True,
+        ),
+        Row("foo", id=2, price=None, color=None, active=None),
+        Row("foo", id=3, price=decimal.Decimal("3"), active=False),
+    )
+
+    engine = request.getfixturevalue(engine_name)
+    with engine.connect() as conn:
+        metadata.create_all(conn)
+        existing = [
+            {
+                "id": 1,
+                "price": decimal.Decimal("1.10"),
+                "ratio": 0.5,
+                "created": datetime.datetime(
+                    2024, 1, 1, 12, tzinfo=datetime.timezone.utc
+                ),
+                "day": datetime.date(2024, 1, 1),
+                "color": Color.red,
+                "active": True,
+            },
+            {"id": 2},
+            {"id": 3, "price": decimal.Decimal("4"), "active": False},
+        ]
+        for record in existing:
+            conn.execute(foo.insert().values(record))
+
+        with caplog.at_level(logging.INFO):
+            (update,) = compare_rows(conn, metadata, rows)
+
+        assert isinstance(update, UpdateRowOp)
+        assert [v["id"] for v in update.to_values] == [3]
+
+    assert "Skipped 1 rows of foo as equivalent to their existing records" in [
+        r.getMessage() for r in caplog.records
+    ]
+
+
+def test_json_key_order(pg):
+    rows = Rows().are(Row("docs", id=1, doc={"b": [1, 2], "a": {"y": 1, "x": 2}}))
+
+    with pg.connect() as conn:
+        json_metadata.create_all(conn)
+        conn.execute(
+            text(
+                """INSERT INTO docs (id, doc) VALUES (1, '{"a": {"x": 2, "y": 1}, "b": [1, 2]}')"""
+            )
+        )
+        assert compare_rows(conn, json_metadata, rows) == []
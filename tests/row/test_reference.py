@@ -0,0 +1,122 @@
+import dataclasses
+
+import pytest
+from pytest_mock_resources import create_postgres_fixture, create_sqlite_fixture
+from sqlalchemy import Column, Index, MetaData, Table, UniqueConstraint, text, types
+
+from sqlalchemy_declarative_extensions import Row, Rows
+from sqlalchemy_declarative_extensions.row import Table as RowTable
+from sqlalchemy_declarative_extensions.row import TableLookup
+
+pg = create_postgres_fixture(scope="function", engine_kwargs={"echo": True})
+sqlite = create_sqlite_fixture(scope="function")
+
+metadata = MetaData()
+currency = Table(
+    "currency",
+    metadata,
+    Column("id", types.Integer(), primary_key=True),
+    Column("code", types.Unicode(), unique=True),
+    Column("name", types.Unicode(), nullable=True),
+    Column("symbol", types.Unicode(), nullable=True),
+    Column("iso", types.Integer(), nullable=True),
+    UniqueConstraint("name"),
+    Index("currency_iso", "iso", unique=True),
+)
+tier = Table(
+    "tier",
+    metadata,
+    Column("plan", types.Unicode(), primary_key=True),
+    Column("level", types.Integer(), primary_key=True),
+)
+
+currencies = RowTable("currency")
+rows = Rows().are(
+    currencies.rows(
+        ["id", "code", "name", "symbol", "iso"],
+        (1, "USD", "Dollar", "$", 840),
+        (2, "EUR", "Euro", "€", 978),
+        (3, "XXX", None, None, None),
+    ),
+    Row("tier", plan="free", level=1),
+    Row("tier", plan="pro", level=2),
+)
+
+
+def test_lookup():
+    lookup = rows.lookup(metadata)
+    assert set(lookup) == {"currency", "tier"}
+
+    currency_lookup = lookup["currency"]
+    assert currency_lookup[1]["code"] == "USD"
+    assert currency_lookup.get(4) is None
+    assert len(currency_lookup) == 3
+
+    assert currency_lookup.by("code")["EUR"]["id"] == 2
+    assert currency_lookup.by("name")["Dollar"]["id"] == 1
+    assert currency_lookup.by("iso")[978]["code"] == "EUR"
+    assert currency_lookup.by("id")[3]["code"] == "XXX"
+
+    # NULLs are not indexed.
+    assert None not in currency_lookup.by("name")
+
+    with pytest.raises(KeyError):
+        currency_lookup.by("symbol")
+
+    assert lookup["tier"][("pro", 2)] == {"plan": "pro", "level": 2}
+
+
+def test_lookup_is_memoized_and_read_only():
+    lookup = rows.lookup(metadata)
+    assert rows.lookup(metadata) is lookup
+
+    with pytest.raises(TypeError):
+        lookup["currency"][1]["code"] = "GBP"  # type: ignore
+
+    with pytest.raises(TypeError):
+        lookup["currency"].by("code")["GBP"] = {}  # type: ignore
+
+    # Redeclaring rows produces a new `Rows`, and so a new lookup.
+    assert rows.are(Row("currency", id=1)).lookup(metadata) is not lookup
+
+
+def test_lookups_follow_public_fields():
+    # The memoized lookups must not shift the position of any public field.
+    names = [f.name for f in dataclasses.fields(Rows)]
+    assert names[-1] == "_lookups"
+    assert not any(name.startswith("_") for name in names[:-1])
+
+
+def test_duplicate_unique_values():
+    duplicates = Rows().are(
+        Row("currency", id=1, code="USD"), Row("currency", id=2, code="USD")
+    )
+    with pytest.raises(ValueError):
+        duplicates.lookup(metadata)
+
+    with pytest.raises(ValueError):
+        TableLookup.build(currency, [{"code": "USD"}])
+
+
+@pytest.mark.parametrize("engine_name", ["pg", "sqlite"])
+def test_verify(engine_name, request):
+    engine = request.getfixturevalue(engine_name)
+    lookup = rows.lookup(metadata)
+
+    with engine.connect() as conn:
+        metadata.create_all(conn)
+
+        with pytest.raises(ValueError, match=r"insert_table_row\(currency\)"):
+            lookup.verify(conn)
+
+        conn.execute(
+            text(
+                "INSERT INTO currency (id, code, name, symbol, iso) VALUES "
+                "(1, 'USD', 'Dollar', '$', 840), (2, 'EUR', 'Euro', '€', 978), "
+                "(3, 'XXX', NULL, NULL, NULL)"
+            )
+        )
+        conn.execute(
+            text("INSERT INTO tier (plan, level) VALUES ('free', 1), ('pro', 2)")
+        )
+        lookup.verify(conn)
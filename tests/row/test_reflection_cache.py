@@ -0,0 +1,127 @@
+import importlib
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from pytest_mock_resources import create_postgres_fixture
+from sqlalchemy import Column, Index, MetaData, Table, text, types
+from sqlalchemy.schema import CreateIndex
+
+from sqlalchemy_declarative_extensions.row.cache import ReflectionCache
+from sqlalchemy_declarative_extensions.row.compare import (
+    DeleteRowOp,
+    InsertRowOp,
+    UpdateRowOp,
+)
+
+pg = create_postgres_fixture(scope="function", engine_kwargs={"echo": True})
+
+metadata = MetaData()
+foo = Table(
+    "foo",
+    metadata,
+    Column("id", types.Integer(), primary_key=True),
+    Column("name", types.Unicode(), nullable=True),
+)
+bar = Table(
+    "bar",
+    metadata,
+    Column("id", types.Integer(), primary_key=True),
+)
+
+
+def test_shared_between_ops(pg):
+    with pg.connect() as conn:
+        metadata.create_all(conn)
+
+        with ReflectionCache.scope(conn) as cache:
+            InsertRowOp("foo", [{"id": 1, "name": "a"}, {"id": 2}]).execute(conn)
+            UpdateRowOp("foo", {"id": 1, "name": "a"}, {"id": 1, "name": "b"}).execute(
+                conn
+            )
+            DeleteRowOp("foo", {"id": 2}).execute(conn)
+
+        assert (cache.hits, cache.misses) == (2, 1)
+
+        result = conn.execute(text("SELECT id, name FROM foo")).fetchall()
+        assert result == [(1, "b")]
+
+
+def test_ddl_invalidation(pg):
+    with pg.connect() as conn:
+        metadata.create_all(conn)
+
+        with ReflectionCache.scope(conn) as cache:
+            cache.get_table(conn, "foo")
+            cache.get_table(conn, "bar")
+
+            # DDL naming its table only invalidates that table.
+            name = Column("name", types.Unicode())
+            Table("foo", MetaData(), name)
+            conn.execute(CreateIndex(Index("foo_name", name)))
+            assert list(cache.metadata.tables) == ["bar"]
+
+            cache.get_table(conn, "foo")
+
+            # Textual SQL invalidates every table.
+            conn.execute(text("ALTER TABLE foo ADD COLUMN active boolean"))
+            assert list(cache.metadata.tables) == []
+
+            InsertRowOp("foo", {"id": 1, "active": True}).execute(conn)
+            assert "active" in cache.metadata.tables["foo"].c
+            assert cache.misses == 4
+
+        # DDL is no longer watched once the scope ends.
+        cache.get_table(conn, "foo")
+        conn.execute(text("ALTER TABLE foo DROP COLUMN active"))
+        assert list(cache.metadata.tables) == ["foo"]
+
+
+def test_shared_within_migration(pg):
+    alembic_row = importlib.import_module(
+        "sqlalchemy_declarative_extensions.alembic.row"
+    )
+
+    with pg.connect() as conn:
+        metadata.create_all(conn)
+
+        op = Operations(MigrationContext.configure(conn))
+        op.insert_table_row("foo", {"id": 1})
+        op.insert_table_row("foo", {"id": 2})
+        op.add_column("foo", Column("active", types.Boolean(), nullable=True))
+        op.insert_table_row("foo", {"id": 3, "active": True})
+
+        cache = alembic_row._migration_caches[op.migration_context]
+        assert (cache.hits, cache.misses) == (1, 2)
+        assert ReflectionCache.active(conn) is None
+
+        result = conn.execute(text("SELECT id, active FROM foo ORDER BY id")).fetchall()
+        assert result == [(1, None), (2, None), (3, True)]
+
+
+def test_dropped_with_scope(pg):
+    with pg.connect() as conn:
+        metadata.create_all(conn)
+
+        with ReflectionCache.scope(conn) as cache:
+            with ReflectionCache.scope(conn) as nested_cache:
+                assert nested_cache is cache
+
+            assert ReflectionCache.active(conn) is cache
+            cache.get_table(conn, "foo")
+
+        assert ReflectionCache.active(conn) is None
+
+        new_cache = ReflectionCache.for_connection(conn)
+        assert new_cache is not cache
+        assert new_cache.metadata.tables == {}
+
+
+def test_no_global_listeners(pg):
+    with pg.connect() as conn:
+        metadata.create_all(conn)
+
+        with ReflectionCache.scope(conn):
+            InsertRowOp("foo", {"id": 1}).execute(conn)
+
+    assert not pg.dispatch.after_cursor_execute
+    assert not pg.dispatch.commit
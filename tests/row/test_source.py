@@ -0,0 +1,134 @@
+import json
+
+import pytest
+from pytest_mock_resources import create_postgres_fixture, create_sqlite_fixture
+from sqlalchemy import Column, MetaData, Table, text, types
+
+from sqlalchemy_declarative_extensions import Row, Rows, declare_database
+from sqlalchemy_declarative_extensions.row import compare
+from sqlalchemy_declarative_extensions.row.compare import (
+    DeleteRowOp,
+    InsertRowOp,
+    UpdateRowOp,
+    compare_rows,
+)
+from sqlalchemy_declarative_extensions.row.source import CsvSource, JsonlSource
+
+pg = create_postgres_fixture(scope="function", engine_kwargs={"echo": True})
+sqlite = create_sqlite_fixture(scope="function")
+
+metadata = MetaData()
+foo = Table(
+    "foo",
+    metadata,
+    Column("id", types.Integer(), primary_key=True),
+    Column("name", types.Unicode(), nullable=True),
+    Column("active", types.Boolean(), nullable=True),
+)
+
+
+def _write_csv(path):
+    path.write_text(
+        "id,name,active\n"
+        "1,one,\n"
+        '2,"two, with a comma",1\n'
+        "3,three,0\n"
+        "4,,1\n"
+        "5,five,1\n"
+    )
+
+
+def _write_jsonl(path):
+    records = [
+        {"id": 1, "name": "one", "active": None},
+        {"id": 2, "name": "two, with a comma", "active": True},
+        {"id": 3, "name": "three", "active": False},
+        {"id": 4, "name": None, "active": True},
+        {"id": 5, "name": "five", "active": True},
+    ]
+    path.write_text("\n".join(json.dumps(r) for r in records) + "\n\n")
+
+
+@pytest.mark.parametrize("engine_name", ["pg", "sqlite"])
+@pytest.mark.parametrize("format", ["csv", "jsonl"])
+def test_compare_source(engine_name, format, request, tmp_path, monkeypatch):
+    monkeypatch.setattr(compare, "LOOKUP_CHUNK_SIZE", 2)
+
+    path = tmp_path / f"foo.{format}"
+    if format == "csv":
+        _write_csv(path)
+        converters = {"id": int, "active": lambda v: v == "1"}
+        rows = Rows.from_csv("foo", path, converters=converters)
+    else:
+        _write_jsonl(path)
+        rows = Rows.from_jsonl("foo", path)
+
+    engine = request.getfixturevalue(engine_name)
+    with engine.connect() as conn:
+        metadata.create_all(conn)
+        conn.execute(text("INSERT INTO foo (id, name, active) VALUES (2, 'old', true)"))
+        conn.execute(text("INSERT INTO foo (id, name, active) VALUES (6, 'six', true)"))
+
+        result = compare_rows(conn, metadata, rows)
+        assert [type(op) for op in result] == [DeleteRowOp, UpdateRowOp, InsertRowOp]
+        assert result[0].values == [{"id": 6}]
+        assert [v["id"] for v in result[2].values] == [1, 3, 4, 5]
+
+        for op in result:
+            op.execute(conn)
+
+        records = conn.execute(text("SELECT id, name FROM foo ORDER BY id")).fetchall()
+        assert records == [
+            (1, "one"),
+            (2, "two, with a comma"),
+            (3, "three"),
+            (4, None),
+            (5, "five"),
+        ]
+
+
+@pytest.mark.parametrize("comparison", ["python", "sql"])
+def test_duplicates_last_wins(pg, comparison, monkeypatch):
+    monkeypatch.setattr(compare, "LOOKUP_CHUNK_SIZE", 2)
+
+    rows = Rows(ignore_unspecified=True, comparison=comparison).are(
+        # Chunk 1: 1 is unchanged, and 4 is updated.
+        Row("foo", id=1, name="a"),
+        Row("foo", id=4, name="x"),
+        # Chunk 2: 1 is redeclared (and now updated).
+        Row("foo", id=3, name="c"),
+        Row("foo", id=1, name="z"),
+        # Chunk 3: 4 is redeclared (and now unchanged).
+        Row("foo", id=2, name="b"),
+        Row("foo", id=4, name="d"),
+        # Chunk 4: 2 is redeclared, both across and within a chunk.
+        Row("foo", id=2, name="b2"),
+        Row("foo", id=2, name="b3"),
+    )
+
+    with pg.connect() as conn:
+        metadata.create_all(conn)
+        conn.execute(text("INSERT INTO foo (id, name) VALUES (1, 'a'), (4, 'd')"))
+
+        result = compare_rows(conn, metadata, rows)
+        assert [type(op) for op in result] == [UpdateRowOp, InsertRowOp]
+        assert [v["id"] for v in result[0].to_values] == [1]
+        assert sorted(v["id"] for v in result[1].values) == [2, 3]
+
+        for op in result:
+            op.execute(conn)
+
+        records = conn.execute(text("SELECT id, name FROM foo ORDER BY id")).fetchall()
+        assert records == [(1, "z"), (2, "b3"), (3, "c"), (4, "d")]
+
+
+def test_sources_read_lazily(tmp_path):
+    path = tmp_path / "missing.csv"
+    rows = Rows(ignore_unspecified=True).are(
+        Row("foo", id=1), CsvSource("foo", path), JsonlSource("bar.foo", path)
+    )
+    declare_database(MetaData(), rows=rows)
+
+    assert rows.tablenames == ["foo", "bar.foo"]
+    with pytest.raises(FileNotFoundError):
+        list(rows)
@@ -0,0 +1,177 @@
+import datetime
+import decimal
+
+import pytest
+from pytest_mock_resources import create_postgres_fixture, create_sqlite_fixture
+from sqlalchemy import Column, MetaData, Table, event, func, select, text, types
+from sqlalchemy.dialects.postgresql import JSON, JSONB
+
+from sqlalchemy_declarative_extensions import Row, Rows
+from sqlalchemy_declarative_extensions.row import compare
+from sqlalchemy_declarative_extensions.row.compare import (
+    DeleteRowOp,
+    InsertRowOp,
+    UpdateRowOp,
+    compare_rows,
+)
+
+pg = create_postgres_fixture(scope="function", engine_kwargs={"echo": True})
+sqlite = create_sqlite_fixture(scope="function")
+
+metadata = MetaData()
+foo = Table(
+    "foo",
+    metadata,
+    Column("id", types.Integer(), primary_key=True),
+    Column("name", types.Unicode(), nullable=True),
+    Column("price", types.Numeric(10, 2), nullable=True),
+    Column("created", types.Date(), nullable=True),
+)
+
+json_metadata = MetaData()
+Table(
+    "docs",
+    json_metadata,
+    Column("id", types.Integer(), primary_key=True),
+    Column("doc", JSON(), nullable=True),
+    Column("docb", JSONB(), nullable=True),
+)
+
+
+def insert_existing(conn):
+    conn.execute(
+        text(
+            "INSERT INTO foo (id, name, price, created) VALUES "
+            "(1, 'one', 1.50, '2024-01-01'), "
+            "(2, 'two', 2.00, NULL), "
+            "(3, 'three', NULL, '2024-01-03'), "
+            "(5, 'five', 5, NULL)"
+        )
+    )
+
+
+declared = [
+    Row(
+        "foo",
+        id=1,
+        name="one",
+        price=decimal.Decimal("1.5"),
+        created=datetime.date(2024, 1, 1),
+    ),
+    Row("foo", id=2, name="deux", price=2),
+    Row("foo", id=3, name="three"),
+    Row("foo", id=4, name="four"),
+]
+
+
+def test_only_drift_is_returned(pg, monkeypatch):
+    monkeypatch.setattr(compare, "LOOKUP_CHUNK_SIZE", 2)
+    rows = Rows(comparison="sql").are(*declared)
+
+    with pg.connect() as conn:
+        metadata.create_all(conn)
+        insert_existing(conn)
+
+        fetched = []
+
+        @event.listens_for(conn, "after_cursor_execute")
+        def count_rows(_conn, cursor, statement, *_):
+            if "_declared_row" in statement:
+                fetched.append(cursor.rowcount)
+
+        result = compare_rows(conn, metadata, rows)
+        assert [type(op) for op in result] == [DeleteRowOp, UpdateRowOp, InsertRowOp]
+
+        # Only the missing, and drifted, rows were returned from the comparisons.
+        assert sum(fetched) == 2
+
+        delete, update, insert = result
+        assert delete.values == [{"id": 5}]
+        assert update.from_values == [{"id": 2, "name": "two"}]
+        assert update.to_values == [{"id": 2, "name": "deux"}]
+        assert [v["id"] for v in insert.values] == [4]
+
+        for op in result:
+            op.execute(conn)
+
+        assert compare_rows(conn, metadata, rows) == []
+
+
+@pytest.mark.parametrize("engine_name", ["pg", "sqlite"])
+def test_same_result_as_python_comparison(engine_name, request):
+    engine = request.getfixturevalue(engine_name)
+    with engine.connect() as conn:
+        metadata.create_all(conn)
+        insert_existing(conn)
+
+        for op in compare_rows(conn, metadata, Rows(comparison="sql").are(*declared)):
+            op.execute(conn)
+
+        records = conn.execute(select(foo).order_by(foo.c.id)).fetchall()
+        assert records == [
+            (1, "one", decimal.Decimal("1.50"), datetime.date(2024, 1, 1)),
+            (2, "deux", decimal.Decimal("2.00"), None),
+            (3, "three", None, datetime.date(2024, 1, 3)),
+            (4, "four", None, None),
+        ]
+
+        assert compare_rows(conn, metadata, Rows().are(*declared)) == []
+
+
+def test_json_columns(pg):
+    rows = Rows(comparison="sql").are(
+        Row("docs", id=1, doc={"a": 1, "b": [1, 2]}, docb={"b": 2, "a": 1}),
+        Row("docs", id=2, doc={"a": 2}, docb={"a": 1}),
+    )
+
+    with pg.connect() as conn:
+        json_metadata.create_all(conn)
+        conn.execute(
+            text(
+                "INSERT INTO docs (id, doc, docb) VALUES "
+                """(1, '{"b": [1, 2], "a": 1}', '{"a": 1, "b": 2}'), """
+                """(2, '{"a": 1}', '{"a": 1}')"""
+            )
+        )
+
+        (update,) = compare_rows(conn, json_metadata, rows)
+        assert isinstance(update, UpdateRowOp)
+        assert update.to_values == [{"id": 2, "doc": {"a": 2}}]
+
+        update.execute(conn)
+        assert compare_rows(conn, json_metadata, rows) == []
+
+
+def test_null_values(pg):
+    rows = Rows(comparison="sql").are(
+        Row("foo", id=1, name=None, price=None),
+        Row("foo", id=2, name=None, price=2),
+    )
+
+    with pg.connect() as conn:
+        metadata.create_all(conn)
+        conn.execute(
+            text(
+                "INSERT INTO foo (id, name, price) VALUES (1, NULL, NULL), (2, 'two', 2)"
+            )
+        )
+
+        (update,) = compare_rows(conn, metadata, rows)
+        assert update.from_values == [{"id": 2, "name": "two"}]
+
+        update.execute(conn)
+        assert compare_rows(conn, metadata, rows) == []
+
+
+def test_expression_values(pg):
+    rows = Rows(comparison="sql").are(
+        Row("foo", id=1, name=func.upper("one")),
+        Row("foo", id=2, name=func.upper("two")),
+    )
+
+    with pg.connect() as conn:
+        metadata.create_all(conn)
+        conn.execute(text("INSERT INTO foo (id, name) VALUES (1, 'ONE'), (2, 'two')"))
+
+        (update,) = compare_rows(conn, metadata, rows)
+        assert update.from_values == [{"id": 2, "name": "two"}]
@@ -0,0 +1,158 @@
+import pytest
+from pytest_mock_resources import create_postgres_fixture, create_sqlite_fixture
+from sqlalchemy import Column, MetaData, Table, text, types
+from sqlalchemy.dialects import mysql
+
+from sqlalchemy_declarative_extensions import Row, Rows, register_sqlalchemy_events
+from sqlalchemy_declarative_extensions.row.compare import (
+    DeleteRowOp,
+    UpsertRowOp,
+    upsert_rows,
+)
+
+pg = create_postgres_fixture(scope="function", engine_kwargs={"echo": True})
+sqlite = create_sqlite_fixture(scope="function")
+
+metadata = MetaData()
+foo = Table(
+    "foo",
+    metadata,
+    Column("id", types.Integer(), primary_key=True),
+    Column("name", types.Unicode(), nullable=True),
+    Column("active", types.Boolean(), nullable=True),
+)
+documents = Table(
+    "documents",
+    metadata,
+    Column("id", types.Integer(), primary_key=True),
+    Column("data", types.JSON(), nullable=True),
+)
+
+
+@pytest.mark.parametrize("engine_name", ["pg", "sqlite"])
+def test_upsert_rows(engine_name, request):
+    rows = Rows(chunk_size=2).are(
+        Row("foo", id=1, name="one", active=None),
+        Row("foo", id=2, name="two"),
+        Row("foo", id=3, name="three", active=False),
+        Row("foo", id=4),
+    )
+
+    engine = request.getfixturevalue(engine_name)
+    with engine.connect() as conn:
+        metadata.create_all(conn)
+        conn.execute(text("INSERT INTO foo (id, name, active) VALUES (2, 'old', true)"))
+        conn.execute(
+            text("INSERT INTO foo (id, name, active) VALUES (4, 'four', true)")
+        )
+        conn.execute(
+            text("INSERT INTO foo (id, name, active) VALUES (5, 'five', true)")
+        )
+
+        result = upsert_rows(conn, metadata, rows)
+        assert [type(op) for op in result] == [DeleteRowOp, UpsertRowOp]
+        assert result[0].values == [{"id": 5}]
+
+        for op in result:
+            op.execute(conn)
+
+        records = conn.execute(
+            text("SELECT id, name, active FROM foo ORDER BY id")
+        ).fetchall()
+        assert records == [
+            (1, "one", None),
+            (2, "two", True),
+            (3, "three", False),
+            (4, "four", True),
+        ]
+
+
+def test_unchanged_rows_not_written(pg):
+    rows = Rows(ignore_unspecified=True).are(
+        Row("foo", id=1, name="one"),
+        Row("foo", id=2, name="two"),
+    )
+
+    with pg.connect() as conn:
+        metadata.create_all(conn)
+        conn.execute(text("INSERT INTO foo (id, name) VALUES (1, 'one'), (2, 'old')"))
+
+        xmin = "SELECT xmin::text FROM foo WHERE id = 1"
+        before = conn.execute(text(xmin)).scalar()
+
+        (op,) = upsert_rows(conn, metadata, rows)
+        op.execute(conn)
+
+        assert conn.execute(text(xmin)).scalar() == before
+        assert conn.execute(text("SELECT name FROM foo WHERE id = 2")).scalar() == "two"
+
+
+def test_upsert_json(pg):
+    rows = Rows(ignore_unspecified=True).are(
+        Row("documents", id=1, data={"a": 1}),
+        Row("documents", id=2, data={"b": [2]}),
+        Row("documents", id=3, data=None),
+    )
+
+    with pg.connect() as conn:
+        metadata.create_all(conn)
+        conn.execute(text("INSERT INTO documents (id, data) VALUES (1, '{\"a\": 1}')"))
+        conn.execute(text("INSERT INTO documents (id, data) VALUES (2, '{\"b\": 1}')"))
+
+        (op,) = upsert_rows(conn, metadata, rows)
+        op.execute(conn)
+
+        records = conn.execute(documents.select().order_by(documents.c.id)).fetchall()
+        assert records == [(1, {"a": 1}), (2, {"b": [2]}), (3, None)]
+
+
+def test_last_declaration_wins(pg):
+    rows = Rows(ignore_unspecified=True).are(
+        Row("foo", id=1, name="one"),
+        Row("foo", id=1, name="uno"),
+    )
+
+    with pg.connect() as conn:
+        metadata.create_all(conn)
+        (op,) = upsert_rows(conn, metadata, rows)
+        assert op.values == [{"id": 1, "name": "uno"}]
+
+
+def test_render_mysql():
+    op = UpsertRowOp("foo", [{"id": 1, "name": "one"}, {"id": 2}])
+    queries = [
+        str(q.compile(dialect=mysql.dialect(), compile_kwargs={"literal_binds": True}))
+        for q in op.render(metadata, dialect=mysql.dialect())
+    ]
+    assert queries == [
+        "INSERT INTO foo (id, name) VALUES (1, 'one') "
+        "ON DUPLICATE KEY UPDATE name = VALUES(name)",
+        "INSERT INTO foo (id) VALUES (2) ON DUPLICATE KEY UPDATE id = VALUES(id)",
+    ]
+
+
+def test_irreversible():
+    op = UpsertRowOp("foo", [{"id": 1, "name": "one"}])
+    with pytest.raises(NotImplementedError):
+        op.reverse()
+
+
+def test_register_sqlalchemy_events(pg):
+    upsert_metadata = MetaData()
+    Table(
+        "foo",
+        upsert_metadata,
+        Column("id", types.Integer(), primary_key=True),
+        Column("name", types.Unicode(), nullable=True),
+    )
+    upsert_metadata.info["rows"] = Rows(strategy="upsert").are(
+        Row("foo", id=1, name="one"),
+        Row("foo", id=2, name="two"),
+    )
+    register_sqlalchemy_events(upsert_metadata, rows=True)
+
+    with pg.connect() as conn:
+        upsert_metadata.create_all(conn)
+        records = conn.execute(text("SELECT id, name FROM foo ORDER BY id")).fetchall()
+
+    assert records == [(1, "one"), (2, "two")]
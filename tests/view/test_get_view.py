@@ -0,0 +1,97 @@
+from pytest_mock_resources import create_postgres_fixture
+from sqlalchemy import event, text
+
+from sqlalchemy_declarative_extensions.dialects import (
+    get_view,
+    get_views,
+    get_views_by_name,
+)
+from sqlalchemy_declarative_extensions.dialects.postgresql import (
+    MaterializedOptions,
+    View,
+    ViewIndex,
+)
+
+pg = create_postgres_fixture(scope="function", engine_kwargs={"echo": True})
+
+
+def test_get_view(pg):
+    with pg.connect() as conn:
+        conn.execute(text("CREATE SCHEMA foo"))
+        conn.execute(text("CREATE VIEW bar AS SELECT 1 AS id"))
+        conn.execute(text("CREATE VIEW foo.bar AS SELECT 2 AS id"))
+
+        result = get_view(conn, "bar")
+        assert result == View("bar", " SELECT 1 AS id;")
+
+        result = get_view(conn, "bar", schema="foo")
+        assert result == View("bar", " SELECT 2 AS id;", schema="foo")
+
+
+def test_get_views_by_name(pg):
+    with pg.connect() as conn:
+        conn.execute(text("CREATE SCHEMA foo"))
+        conn.execute(text("CREATE VIEW bar AS SELECT 1 AS id"))
+        conn.execute(text("CREATE VIEW baz AS SELECT 1 AS id"))
+        conn.execute(text("CREATE MATERIALIZED VIEW foo.bar AS SELECT 2 AS id"))
+
+        result = get_views_by_name(conn, ["bar", "foo.bar", "missing"])
+        assert sorted(result, key=lambda v: v.qualified_name) == [
+            View("bar", " SELECT 1 AS id;"),
+            View(
+                "bar",
+                " SELECT 2 AS id;",
+                schema="foo",
+                materialized=MaterializedOptions(),
+            ),
+        ]
+
+        assert get_views_by_name(conn, []) == []
+
+
+def test_get_views_materialized_indexes(pg):
+    with pg.connect() as conn:
+        conn.execute(text("CREATE SCHEMA foo"))
+        conn.execute(text("CREATE VIEW plain AS SELECT 1 AS id"))
+        conn.execute(text("CREATE MATERIALIZED VIEW bar AS SELECT 1 AS id, 'a' AS n"))
+        conn.execute(text("CREATE MATERIALIZED VIEW foo.bar AS SELECT 2 AS id"))
+        conn.execute(text("CREATE UNIQUE INDEX bar_id ON bar (id) INCLUDE (n)"))
+        conn.execute(text("CREATE INDEX bar_n_id ON bar (n, id)"))
+        conn.execute(text("CREATE INDEX bar_id ON foo.bar (id)"))
+
+        views = {v.qualified_name: v for v in get_views(conn)}
+        assert views["plain"].constraints is None
+        assert views["bar"].constraints == [
+            ViewIndex(["id"], name="bar_id", unique=True),
+            ViewIndex(["n", "id"], name="bar_n_id"),
+        ]
+        assert views["foo.bar"].constraints == [ViewIndex(["id"], name="bar_id")]
+
+        for view in views.values():
+            expected = [
+                ViewIndex(raw["column_names"], name=raw["name"], unique=raw["unique"])
+                for raw in conn.dialect.get_indexes(conn, view.name, view.schema)
+            ]
+            assert (view.constraints or []) == expected
+
+
+def test_get_views_by_name_materialized_indexes(pg):
+    with pg.connect() as conn:
+        conn.execute(text("CREATE MATERIALIZED VIEW bar AS SELECT 1 AS id"))
+        conn.execute(text("CREATE MATERIALIZED VIEW baz AS SELECT 1 AS id"))
+        conn.execute(text("CREATE INDEX bar_id ON bar (id)"))
+        conn.execute(text("CREATE INDEX baz_id ON baz (id)"))
+
+        statements = []
+        event.listen(
+            conn,
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+
+        [view] = get_views_by_name(conn, ["bar"])
+        assert view.constraints == [ViewIndex(["id"], name="bar_id")]
+
+        # The indexes are only fetched for the requested view.
+        [index_statement] = [s for s in statements if "pg_index" in s]
+        assert "requested_views" in index_statement
@@ -1,4 +1,5 @@
-from pytest_mock_resources import create_postgres_fixture
+import pytest
+from pytest_mock_resources import create_postgres_fixture, create_sqlite_fixture
 from sqlalchemy import Column, text, types
 
 from sqlalchemy_declarative_extensions import (
@@ -8,7 +9,9 @@ from sqlalchemy_declarative_extensions import (
     register_sqlalchemy_events,
     view,
 )
+from sqlalchemy_declarative_extensions.dialects.snowflake import View as SnowflakeView
 from sqlalchemy_declarative_extensions.sqlalchemy import declarative_base
+from sqlalchemy_declarative_extensions.view.compare import compare_views
 from tests import skip_sqlalchemy13
 
 _Base = declarative_base()
@@ -36,6 +39,7 @@ register_sqlalchemy_events(Base.metadata, schemas=True, views=True)
 pg = create_postgres_fixture(
     scope="function", engine_kwargs={"echo": True}, session=True
 )
+sqlite = create_sqlite_fixture(scope="function")
 
 
 @skip_sqlalchemy13
@@ -51,3 +55,12 @@ def test_ignore_globs(pg):
     pg.execute(text("SELECT * FROM bar.one")).all()
     pg.execute(text("SELECT * FROM foo.ignoreme")).all()
     pg.execute(text("SELECT * FROM ignoreme.wat")).all()
+
+
+@pytest.mark.parametrize("pattern", ["foo.bar", "FOO.BAR", "FOO.*"])
+def test_ignore_matches_normalized_name(sqlite, pattern):
+    # Snowflake views' names are upper-cased by normalization.
+    views = Views(ignore=[pattern]).are(SnowflakeView("bar", "select 1", schema="foo"))
+
+    with sqlite.connect() as conn:
+        assert compare_views(conn, views) == []
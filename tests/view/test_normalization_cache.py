@@ -0,0 +1,90 @@
+import os
+
+import pytest
+from pytest_mock_resources import create_postgres_fixture, create_sqlite_fixture
+from sqlalchemy import text
+
+from sqlalchemy_declarative_extensions import View, Views
+from sqlalchemy_declarative_extensions.view import DefinitionCache, base
+from sqlalchemy_declarative_extensions.view.compare import compare_views
+
+pg = create_postgres_fixture(scope="function", engine_kwargs={"echo": True})
+sqlite = create_sqlite_fixture(scope="function")
+
+
+def _fail(*_, **__):
+    raise AssertionError("Expected the definition to be cached")
+
+
+@pytest.mark.parametrize("engine_name", ["pg", "sqlite"])
+def test_cache_reused(engine_name, request, tmp_path, monkeypatch):
+    engine = request.getfixturevalue(engine_name)
+    views = Views(normalization_cache=tmp_path).are(
+        View("foo", "select id from bar where id > 10"),
+        View("baz", "select id from bar"),
+    )
+
+    with engine.connect() as conn:
+        conn.execute(text("CREATE TABLE bar (id integer)"))
+        conn.execute(text("CREATE VIEW foo AS SELECT id FROM bar WHERE id > 5"))
+
+        result = compare_views(conn, views)
+        assert len(list(tmp_path.glob("*/*"))) > 0
+
+        monkeypatch.setattr(base.View, "_render_definition", _fail)
+        monkeypatch.setattr(base, "_render_postgresql_definitions", _fail)
+
+        cached_result = compare_views(conn, views)
+        assert cached_result == result
+
+
+def test_cache_key_depends_on_mode(sqlite):
+    cache = DefinitionCache("unused")
+    dialect = sqlite.dialect
+    assert cache.key("select 1", dialect, "a") == cache.key("select 1", dialect, "a")
+    assert cache.key("select 1", dialect, "a") != cache.key("select 1", dialect, "b")
+    assert cache.key("select 1", dialect, "a") != cache.key("select 2", dialect, "a")
+
+
+def test_cache_key_depends_on_namespace(sqlite):
+    dialect = sqlite.dialect
+    key = DefinitionCache("unused").key("select 1", dialect, "a")
+    assert DefinitionCache("unused", namespace="1").key("select 1", dialect, "a") != key
+    assert DefinitionCache("unused", namespace="1").key(
+        "select 1", dialect, "a"
+    ) != DefinitionCache("unused", namespace="2").key("select 1", dialect, "a")
+
+
+def test_cache_clear(tmp_path):
+    cache = DefinitionCache(tmp_path)
+    cache.set("aaa", "12345")
+    cache.set("bbb", "12345")
+
+    cache.clear()
+    assert cache.get("aaa") is None
+    assert cache.get("bbb") is None
+
+
+def test_cache_eviction(tmp_path):
+    cache = DefinitionCache(tmp_path, max_size=10)
+    cache.set("aaa", "12345")
+    cache.set("bbb", "12345")
+    cache.set("ccc", "12345")
+    for index, key in enumerate(["aaa", "bbb", "ccc"]):
+        os.utime(cache._entry_path(key), (index, index))
+
+    # Mark the first entry as the most recently used.
+    assert cache.get("aaa") == "12345"
+    cache.evict()
+
+    assert cache.get("aaa") == "12345"
+    assert cache.get("bbb") is None
+    assert cache.get("ccc") == "12345"
+
+
+def test_coerce_from_unknown(tmp_path):
+    assert DefinitionCache.coerce_from_unknown(None) is None
+    assert DefinitionCache.coerce_from_unknown(tmp_path) == DefinitionCache(tmp_path)
+
+    cache = DefinitionCache(tmp_path, max_size=5)
+    assert DefinitionCache.coerce_from_unknown(cache) is cache
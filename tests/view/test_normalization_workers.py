@@ -0,0 +1,34 @@
+from pytest_mock_resources import create_sqlite_fixture
+from sqlalchemy import text
+
+from sqlalchemy_declarative_extensions import View, Views
+from sqlalchemy_declarative_extensions.view.base import (
+    PARALLEL_NORMALIZATION_THRESHOLD,
+    render_definitions,
+)
+from sqlalchemy_declarative_extensions.view.compare import compare_views
+
+sqlite = create_sqlite_fixture(scope="function")
+
+views = [
+    View(f"foo{i}", f"select id, {i} as num from bar where id > {i} or id = 1")
+    for i in range(PARALLEL_NORMALIZATION_THRESHOLD + 1)
+]
+
+
+def test_workers_match_in_process(sqlite):
+    with sqlite.connect() as conn:
+        expected = render_definitions(conn, views, using_connection=False)
+        result = render_definitions(conn, views, using_connection=False, workers=2)
+        assert result == expected
+
+
+def test_compare_views_workers(sqlite):
+    with sqlite.connect() as conn:
+        conn.execute(text("CREATE TABLE bar (id integer)"))
+        conn.execute(text("CREATE VIEW foo3 AS SELECT id FROM bar"))
+
+        expected = compare_views(conn, Views().are(*views))
+        result = compare_views(conn, Views(normalization_workers=2).are(*views))
+        assert result == expected
+        assert compare_views(conn, Views().are(*views), workers=2) == expected
@@ -0,0 +1,42 @@
+from pytest_mock_resources import create_postgres_fixture, create_sqlite_fixture
+from sqlalchemy import text
+
+from sqlalchemy_declarative_extensions.dialects.postgresql import View
+from sqlalchemy_declarative_extensions.view.base import render_definitions
+
+pg = create_postgres_fixture(scope="function", engine_kwargs={"echo": True})
+sqlite = create_sqlite_fixture(scope="function")
+
+views = [
+    View("one", "SELECT id FROM foo WHERE id < 10"),
+    View("two", "select id::text, 'a' as col1 from foo"),
+    View("three", " SELECT foo.id\n   FROM foo\n  WHERE (foo.id = 1);"),
+    View("four", "SELECT 1 as a, 2 as b"),
+]
+
+
+def test_render_definitions_matches_render_definition_pg(pg):
+    with pg.connect() as conn:
+        conn.execute(text("CREATE TABLE foo (id integer)"))
+
+        expected = [v.render_definition(conn) for v in views]
+        result = render_definitions(conn, views)
+        assert result == expected
+
+        # The temporary views should not have leaked out of the savepoint.
+        view_count = conn.execute(
+            text("SELECT count(*) FROM pg_views WHERE schemaname = 'public'")
+        ).scalar()
+        assert view_count == 0
+
+
+def test_render_definitions_empty_pg(pg):
+    with pg.connect() as conn:
+        assert render_definitions(conn, []) == []
+
+
+def test_render_definitions_without_connection(sqlite):
+    with sqlite.connect() as conn:
+        expected = [v.render_definition(conn) for v in views]
+        result = render_definitions(conn, views)
+        assert result == expected